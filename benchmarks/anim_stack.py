@@ -0,0 +1,96 @@
+from janim.imports import FOREVER, RIGHT, DataUpdater, Dot, Group, Timeline
+
+ANIMS = 10000
+
+
+class AppendOverlappingAnims:
+    """
+    向同一个物件添加大量相互重叠的动画，每个动画的时长都覆盖了此后的约 100 个动画的开始时间
+
+    ``time_build`` 主要是 :meth:`~.AnimStack.append` 的开销，``time_get`` 是构建后逐帧查询区段的开销
+    """
+
+    timeout = 300
+
+    def setup(self):
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                dot = Dot().show()
+                self.prepare(
+                    *[
+                        DataUpdater(dot, lambda data, p: None, at=i * 0.01, become_at_end=False)
+                        for i in range(ANIMS)
+                    ],
+                    DataUpdater(dot, lambda data, p: None, duration=FOREVER, become_at_end=False),
+                )
+                self.forward(ANIMS * 0.01 + 1)
+                self.dot = dot
+
+        self.timeline_cls = MyTimeline
+        self.built = MyTimeline().build(quiet=True)
+
+    def time_build(self):
+        self.timeline_cls().build(quiet=True)
+
+    def time_get(self):
+        timeline = self.built.timeline
+        stack = timeline.item_appearances[timeline.dot].stack
+        for i in range(round(self.built.duration * 60)):
+            stack.get(i / 60)
+
+
+class ComputeAlternatingTimes:
+    """
+    在多个时间点之间来回查询大量物件的结果，类似于在界面中反复拖动进度条
+
+    主要是 :meth:`~.AnimStack.compute` 中多时间点缓存的效果
+    """
+
+    params = [100, 1000]
+    param_names = ['items']
+    timeout = 300
+
+    def setup(self, items: int):
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                self.dots = Group(*[Dot() for _ in range(items)]).show()
+                self.play(self.dots.anim.points.shift(RIGHT))
+
+        self.built = MyTimeline().build(quiet=True)
+
+    def time_compute(self, items: int):
+        timeline = self.built.timeline
+        stacks = [timeline.item_appearances[dot].stack for dot in timeline.dots]
+        for _ in range(10):
+            for t in (0.2, 0.5, 0.8):
+                for stack in stacks:
+                    stack.compute(t, True)
+
+
+class ComputeSequentialTimes:
+    """
+    按时间顺序逐帧查询大量物件的结果，类似于导出视频
+
+    主要是 :meth:`~.AnimStack.compute` 中缓存本身的开销
+    """
+
+    params = [100, 2000]
+    param_names = ['items']
+    timeout = 300
+
+    def setup(self, items: int):
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                self.dots = Group(*[Dot() for _ in range(items)]).show()
+                self.play(self.dots.anim.points.shift(RIGHT))
+
+        self.built = MyTimeline().build(quiet=True)
+
+    def time_compute(self, items: int):
+        timeline = self.built.timeline
+        stacks = [timeline.item_appearances[dot].stack for dot in timeline.dots]
+        for stack in stacks:
+            stack.clear_cache()
+        for i in range(60):
+            for stack in stacks:
+                stack.compute(i / 60, True)
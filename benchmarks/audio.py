@@ -0,0 +1,50 @@
+import numpy as np
+
+from janim.imports import Audio, Timeline
+
+CLIPS = 5000
+FRAMERATE = 44100
+
+
+class MixAudio:
+    """
+    提取由大量短音频组成的时间轴的全部音频，与 :class:`~.AudioWriter` 一样逐秒提取
+
+    后一半的音频放在子 Timeline 中，并且有一段贯穿全程的背景音频
+    """
+
+    timeout = 300
+
+    def setup(self):
+        rng = np.random.default_rng(0)
+        samples = rng.integers(-1000, 1000, (FRAMERATE // 20, 2), dtype=np.int16)
+
+        def clip() -> Audio:
+            audio = Audio()
+            audio.set_samples(samples)
+            return audio
+
+        class SubTimeline(Timeline):
+            def construct(self) -> None:
+                for _ in range(CLIPS // 2):
+                    self.play_audio(clip())
+                    self.forward(0.1)
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                background = Audio()
+                background.set_samples(np.zeros((FRAMERATE * CLIPS // 10, 2), dtype=np.int16))
+                self.play_audio(background)
+
+                for _ in range(CLIPS // 2):
+                    self.play_audio(clip())
+                    self.forward(0.1)
+
+                sub = SubTimeline().build(quiet=True).to_item().show()
+                self.forward(sub.duration)
+
+        self.built = MyTimeline().build(quiet=True)
+
+    def time_mix(self):
+        for t in range(int(self.built.duration) + 1):
+            self.built.get_audio_samples_between(FRAMERATE, t, t + 1)
@@ -0,0 +1,83 @@
+import numpy as np
+
+import janim.render.collection as collection
+from janim.camera.camera import Camera
+from janim.imports import Group, InstancedVItem, Timeline
+from janim.items.geometry.arc import Dot
+from janim.render.base import RenderData, Renderer, create_context_430_or_330
+from janim.render.collection import RenderCollection
+from janim.utils.data import ContextSetter
+
+DOTS = 50000
+
+
+class SortRenders:
+    """
+    对 50k 个点按照绘制顺序排序，即 :meth:`~.RenderCollection.sort_indices` 的开销
+    """
+
+    params = [False, True]
+    param_names = ['distance_sort']
+    timeout = 300
+
+    def setup(self, distance_sort: bool):
+        rng = np.random.default_rng(0)
+        dots = [Dot(point) for point in rng.uniform(-4, 4, (DOTS, 3))]
+        if distance_sort:
+            for dot in dots:
+                dot.apply_distance_sort()
+        self.renders = [(dot, None) for dot in dots]
+
+        self.render_data = RenderData(
+            ctx=None,
+            camera_info=Camera().points.info,
+            light_source_location=np.zeros(3),
+            anti_alias_radius=0,
+        )
+
+    def time_sort(self, distance_sort: bool):
+        with ContextSetter(Renderer.data_ctx, self.render_data):
+            for _ in range(10):
+                RenderCollection.sort_indices(self.renders)
+
+
+class RenderManyVItems:
+    """
+    渲染大量小的 :class:`~.VItem`（类似于有很多字符的文字），
+    主要是 :class:`~.VItemBatchRenderer` 合并绘制的效果
+
+    - ``batch``: 默认情况，连续的物件会被合并绘制
+    - ``single``: 禁用合并，每个物件单独绘制
+    - ``instanced``: 使用 :class:`~.InstancedVItem` 绘制相同的点
+    """
+
+    params = [[1000, 5000], ['batch', 'single', 'instanced']]
+    param_names = ['items', 'mode']
+    timeout = 300
+
+    def setup(self, items: int, mode: str):
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                group = Group(*[Dot(radius=0.02) for _ in range(items)])
+                group.points.arrange_in_grid()
+                if mode == 'instanced':
+                    positions = [dot.points.box.center for dot in group]
+                    InstancedVItem(Dot(radius=0.02), *positions).show()
+                else:
+                    group.show()
+                self.forward(1)
+
+        self.built = MyTimeline().build(quiet=True)
+        self.ctx = create_context_430_or_330(standalone=True)
+        self.min_batch_size = collection.MIN_BATCH_SIZE
+        if mode == 'single':
+            collection.MIN_BATCH_SIZE = items + 1
+        # 预先渲染一次，排除着色器编译等开销
+        self.built.capture(0.5, ctx=self.ctx)
+
+    def teardown(self, items: int, mode: str):
+        collection.MIN_BATCH_SIZE = self.min_batch_size
+
+    def time_capture(self, items: int, mode: str):
+        for i in range(10):
+            self.built.capture(i / 10, ctx=self.ctx)
@@ -0,0 +1,28 @@
+from janim.imports import RIGHT, Dot, Group, Timeline
+
+FORWARDS = 200
+
+
+class ForwardManyItems:
+    """
+    在显示了大量物件的时间轴中反复 ``forward``，每次只更改其中的少数物件
+
+    用于衡量 :meth:`~.Timeline.detect_changes_of_all` 的开销随物件数量的变化
+    """
+
+    params = [1000, 5000, 20000]
+    param_names = ['items']
+    timeout = 300
+
+    def setup(self, items: int):
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                dots = Group(*[Dot() for _ in range(items)]).show()
+                for i in range(FORWARDS):
+                    dots[i % items].points.shift(RIGHT * 0.01)
+                    self.forward(0.1)
+
+        self.timeline_cls = MyTimeline
+
+    def time_build(self, items: int):
+        self.timeline_cls().build(quiet=True)
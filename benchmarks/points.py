@@ -0,0 +1,28 @@
+from janim.imports import DEGREES, RIGHT, Dot, Group
+
+
+class TransformGroup:
+    """
+    对含有大量子物件的 :class:`~.Group` 进行整体变换
+
+    用于衡量 :meth:`~.Cmpt_Points.apply_points_fn` 的开销随子物件数量的变化
+    """
+
+    params = [1000, 10000, 100000]
+    param_names = ['children']
+    timeout = 300
+
+    def setup(self, children: int):
+        self.group = Group(*[Dot(RIGHT * i * 0.01) for i in range(children)])
+
+    def time_shift(self, children: int):
+        self.group.points.shift(RIGHT)
+
+    def time_rotate(self, children: int):
+        self.group.points.rotate(30 * DEGREES)
+
+    def time_scale(self, children: int):
+        self.group.points.scale(1.5)
+
+    def time_apply_matrix(self, children: int):
+        self.group.points.apply_matrix([[1, 0.5, 0], [0, 1, 0], [0, 0, 1]])
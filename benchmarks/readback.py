@@ -0,0 +1,105 @@
+import tracemalloc
+
+import av
+import OpenGL.GL as gl
+
+from janim.render.base import create_context_430_or_330
+from janim.render.encoder import FrameRing
+from janim.render.framebuffer import FrameBuffer
+
+FRAMES = 10
+
+
+class Readback:
+    """
+    对比 PBO 读取后交给 PyAV 的两种方式
+
+    - ``bytes``: 先用 ``string_at`` 拷贝为 ``bytes``，再由 ``VideoFrame.from_bytes`` 翻转拷贝
+    - ``ring``: 从映射的内存翻转拷贝到预分配的缓冲中，再由 ``VideoFrame.from_numpy_buffer`` 直接包装
+    - ``gpu_yuv``: 先在 GPU 上转换为 yuv420p 再读取，拷贝到预分配的缓冲中，
+      并省去 CPU 上的 swscale 转换
+
+    ``track_python_bytes_per_frame`` 记录每帧在 Python 堆上新分配的字节数
+    """
+
+    params = (['1920x1080', '3840x2160'], ['bytes', 'ring', 'gpu_yuv'])
+    param_names = ['resolution', 'mode']
+
+    def setup(self, resolution: str, mode: str):
+        self.pw, self.ph = map(int, resolution.split('x'))
+
+        self.ctx = create_context_430_or_330(standalone=True)
+        self.fbo = FrameBuffer(self.ctx, self.pw, self.ph, (0.2, 0.4, 0.6), False)
+        self.ring = FrameRing(self.pw, self.ph, 'yuv420p' if mode == 'gpu_yuv' else 'rgba')
+        self.byte_size = self.ring.byte_size
+
+        self.pbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbo)
+        gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, self.byte_size, None, gl.GL_STREAM_READ)
+
+        self.readback = {
+            'bytes': self.readback_bytes,
+            'ring': self.readback_ring,
+            'gpu_yuv': self.readback_gpu_yuv,
+        }[mode]
+
+    def teardown(self, resolution: str, mode: str):
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        gl.glDeleteBuffers(1, [self.pbo])
+        self.ctx.release()
+
+    def read_pixels(self):
+        gl.glReadPixels(0, 0, self.pw, self.ph, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+
+    def readback_bytes(self) -> av.VideoFrame:
+        with self.fbo.context():
+            self.fbo.clear()
+            self.read_pixels()
+        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
+        data = gl.ctypes.string_at(ptr, self.byte_size)
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        return av.VideoFrame.from_bytes(data, self.pw, self.ph, format='rgba', flip_vertical=True)
+
+    def readback_ring(self) -> av.VideoFrame:
+        with self.fbo.context():
+            self.fbo.clear()
+            self.read_pixels()
+        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
+        idx = self.ring.acquire()
+        self.ring.write_flipped(idx, ptr)
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        frame = av.VideoFrame.from_numpy_buffer(self.ring.buffers[idx], format='rgba')
+        self.ring.release(idx)
+        return frame
+
+    def readback_gpu_yuv(self) -> av.VideoFrame:
+        with self.fbo.context():
+            self.fbo.clear()
+            with self.fbo.yuv420p_context():
+                gl.glReadPixels(
+                    0, 0, self.pw // 4, self.ph * 3 // 2, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0
+                )
+        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
+        idx = self.ring.acquire()
+        self.ring.write(idx, ptr)
+        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        frame = av.VideoFrame.from_numpy_buffer(self.ring.buffers[idx], format='yuv420p')
+        self.ring.release(idx)
+        return frame
+
+    def time_readback(self, resolution: str, mode: str):
+        for _ in range(FRAMES):
+            self.readback()
+
+    def track_python_bytes_per_frame(self, resolution: str, mode: str):
+        self.readback()  # 预热，排除首次调用产生的缓存
+
+        tracemalloc.start()
+        for _ in range(FRAMES):
+            # 保持对 frame 的引用直到下一次循环，使得 peak 能够反映单帧分配的数据量
+            frame = self.readback()  # noqa: F841
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    track_python_bytes_per_frame.unit = 'bytes'
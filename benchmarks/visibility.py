@@ -0,0 +1,36 @@
+import random
+
+from janim.anims.animation import TimeIntervals, TimeRange
+
+DURATION = 60
+
+
+class VisibleItemIntervals:
+    """
+    大量短暂显示的元素（类似于粒子效果）中，查询每一帧可见的元素
+
+    ``time_sequential`` 是导出视频时逐帧查询的情况，``time_random`` 是在预览界面中随机跳转的情况
+    """
+
+    params = [10000, 100000]
+    param_names = ['items']
+    timeout = 300
+
+    def setup(self, items: int):
+        rng = random.Random(0)
+        ranges = []
+        for _ in range(items):
+            at = rng.uniform(0, DURATION)
+            ranges.append(TimeRange(at, at + rng.uniform(0.1, 1)))
+        self.intervals = TimeIntervals(ranges, lambda x: x)
+        self.times = [i / 60 for i in range(DURATION * 60)]
+        self.random_times = self.times.copy()
+        rng.shuffle(self.random_times)
+
+    def time_sequential(self, items: int):
+        for t in self.times:
+            self.intervals.get(t)
+
+    def time_random(self, items: int):
+        for t in self.random_times[:600]:
+            self.intervals.get(t)
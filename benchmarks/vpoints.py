@@ -0,0 +1,23 @@
+import numpy as np
+
+from janim.components.vpoints import Cmpt_VPoints
+
+
+class InsertCurves:
+    """
+    在含有 1000 段曲线的路径中插入大量曲线，
+    即 :meth:`~.Cmpt_VPoints.insert_n_curves_to_point_list` 的开销
+
+    在两个点数量相差很大的物件之间进行变换时（例如较长的 Typst 公式），对齐点数量时会进行这样的插入
+    """
+
+    params = [100, 1000, 10000]
+    param_names = ['inserts']
+    timeout = 300
+
+    def setup(self, inserts: int):
+        rng = np.random.default_rng(0)
+        self.points = rng.normal(size=(2001, 3)).astype(np.float32)
+
+    def time_insert(self, inserts: int):
+        Cmpt_VPoints.insert_n_curves_to_point_list(inserts, self.points)
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import weakref
 from bisect import bisect_left, bisect_right
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from typing import Generator
 
 from janim.anims.animation import ApplyAligner, ItemAnimation, TimeAligner
@@ -10,11 +11,176 @@ from janim.constants import FOREVER
 from janim.exception import ApplyAlignerBrokenError
 from janim.items.item import Item
 from janim.locale import get_translator
+from janim.utils.data import Array
 
 type ComputeAnimsGenerator = Generator[ApplyAligner, None, Item]
+# (as_time, get_at_left)
+type ComputeCacheKey = tuple[float, bool]
 
 _ = get_translator('janim.anims.anim_stack')
 
+# 每个 AnimStack 最多缓存多少个时间点的 compute 结果
+COMPUTE_CACHE_SIZE = 8
+# 所有 AnimStack 缓存的 compute 结果占用内存的上限（字节，估算值）
+COMPUTE_CACHE_BUDGET = 256 * 1024 * 1024
+
+
+class AnimNode:
+    """
+    :class:`AnimStack` 中某一区段的动画序列，以持久化链表的形式表示
+
+    每个节点记录序列的最后一个动画 ``anim``，以及除此之外的前面部分 ``prev``（``None`` 表示空序列）
+
+    节点创建后不再改变，因此多个区段，以及在其基础上添加了动画的序列，都可以共用同一部分节点
+    """
+
+    __slots__ = ('anim', 'prev', 'anims')
+
+    def __init__(self, anim: ItemAnimation, prev: AnimNode | None):
+        self.anim = anim
+        self.prev = prev
+        # 转换为列表的结果，在第一次调用 to_list 时产生
+        self.anims: list[ItemAnimation] | None = None
+
+    @staticmethod
+    def to_list(node: AnimNode | None) -> list[ItemAnimation]:
+        """
+        得到 ``node`` 所表示的动画序列，结果会被缓存，请不要修改
+        """
+        if node is None:
+            return []
+        if node.anims is None:
+            node.anims = node._collect()
+        return node.anims
+
+    def _collect(self) -> list[ItemAnimation]:
+        reversed_anims: list[ItemAnimation] = []
+        node = self
+        while node is not None and node.anims is None:
+            reversed_anims.append(node.anim)
+            node = node.prev
+
+        reversed_anims.reverse()
+        return reversed_anims if node is None else node.anims + reversed_anims
+
+    @staticmethod
+    def from_list(anims: list[ItemAnimation]) -> AnimNode | None:
+        node = None
+        for anim in anims:
+            node = AnimNode(anim, node)
+        return node
+
+    @staticmethod
+    def dump_graph(
+        nodes: list[AnimNode | None],
+    ) -> tuple[list[tuple[ItemAnimation, int]], list[int]]:
+        """
+        将多个序列共用的节点展开为 ``(anim, prev 的下标)`` 的列表，每个节点只出现一次，
+        并且总是排在以它为 ``prev`` 的节点之前；下标为 ``-1`` 表示 ``None``
+
+        返回该列表以及 ``nodes`` 中各个元素对应的下标，可以使用 :meth:`load_graph` 还原
+        """
+        pairs: list[tuple[ItemAnimation, int]] = []
+        indices: dict[int, int] = {}
+
+        def index_of(node: AnimNode | None) -> int:
+            # 找到尚未记录的部分，从前往后记录
+            chain: list[AnimNode] = []
+            while node is not None and id(node) not in indices:
+                chain.append(node)
+                node = node.prev
+
+            idx = -1 if node is None else indices[id(node)]
+            for node in reversed(chain):
+                pairs.append((node.anim, idx))
+                idx = indices[id(node)] = len(pairs) - 1
+            return idx
+
+        return pairs, [index_of(node) for node in nodes]
+
+    @staticmethod
+    def load_graph(
+        pairs: list[tuple[ItemAnimation, int]], indices: list[int]
+    ) -> list[AnimNode | None]:
+        """
+        :meth:`dump_graph` 的逆操作，共用的节点在还原后仍然是共用的
+        """
+        nodes: list[AnimNode] = []
+        for anim, prev in pairs:
+            nodes.append(AnimNode(anim, None if prev == -1 else nodes[prev]))
+        return [None if idx == -1 else nodes[idx] for idx in indices]
+
+    def __reduce__(self):
+        # 链表可能很长，直接 pickle 会超出递归深度，所以转换为列表
+        # 在 AnimStack 中的节点由 AnimStack.__getstate__ 统一处理，不会经过这里
+        return (AnimNode.from_list, (self._collect(),))
+
+
+class ComputeCache:
+    """
+    记录所有 :class:`AnimStack` 中 :meth:`~.AnimStack.compute` 结果缓存的使用顺序以及占用的内存
+
+    - 每个 :class:`AnimStack` 以 ``(as_time, get_at_left)`` 为键，
+      最多缓存 :data:`COMPUTE_CACHE_SIZE` 个结果
+    - 所有缓存的总大小超过 ``budget`` 时，按照最近使用的顺序淘汰
+    - ``hits`` 和 ``misses`` 分别记录命中与未命中缓存的次数
+
+    大小是根据物件组件中 :class:`~.Array` 的数据估算的；
+    动画可能会反复使用同一个物件并原地修改其数据，所以每个物件只在第一次被缓存时估算一次
+    """
+
+    # 除了组件数据以外，每个缓存的物件额外估算的大小
+    ENTRY_OVERHEAD = 1024
+
+    def __init__(self, budget: int = COMPUTE_CACHE_BUDGET):
+        self.budget = budget
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        # 使用弱引用，避免缓存使得已经不再使用的 AnimStack 无法被回收
+        self.order: OrderedDict[tuple[weakref.ref[AnimStack], ComputeCacheKey], int] = (
+            OrderedDict()
+        )
+        self.sizes: weakref.WeakKeyDictionary[Item, int] = weakref.WeakKeyDictionary()
+
+    def touch(self, stack: AnimStack, key: ComputeCacheKey) -> None:
+        order_key = (weakref.ref(stack), key)
+        if order_key in self.order:
+            self.order.move_to_end(order_key)
+
+    def add(self, stack: AnimStack, key: ComputeCacheKey, data: Item) -> None:
+        nbytes = self.sizes.get(data)
+        if nbytes is None:
+            nbytes = self.sizes[data] = self.estimate_nbytes(data)
+        self.order[weakref.ref(stack), key] = nbytes
+        self.nbytes += nbytes
+
+        while self.nbytes > self.budget and len(self.order) > 1:
+            (ref, old_key), old_nbytes = self.order.popitem(last=False)
+            self.nbytes -= old_nbytes
+            old_stack = ref()
+            if old_stack is not None:
+                old_stack.cache.pop(old_key, None)
+
+    def discard(self, stack: AnimStack, key: ComputeCacheKey) -> None:
+        self.nbytes -= self.order.pop((weakref.ref(stack), key), 0)
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def estimate_nbytes(data: Item) -> int:
+        nbytes = ComputeCache.ENTRY_OVERHEAD
+        for cmpt in data.components.values():
+            for value in cmpt.__dict__.values():
+                if isinstance(value, Array):
+                    nbytes += value.data.nbytes
+        return nbytes
+
+
+compute_cache = ComputeCache()
+
 
 class AnimStack:
     """
@@ -31,11 +197,13 @@ class AnimStack:
 
         # times 和 stacks 的元素是一一对应的
         # times 中的元素表示 stacks 中对应位置动画序列的开始时间（以下一个时间点为结束时间）
+        # stacks 中的元素是动画序列的最后一个节点，None 表示空序列，另见 get_by_index
         self.times: list[float] = [0]
-        self.stacks: list[list[ItemAnimation]] = [[]]
+        self.stacks: list[AnimNode | None] = [None]
 
-        # 用于缓存结果，具体处理另见 compute 方法
-        self.clear_cache()
+        # 用于缓存结果，具体处理另见 compute 和 store_cache 方法
+        self.latest: tuple[ComputeCacheKey, Item] | None = None
+        self.cache: OrderedDict[ComputeCacheKey, Item] = OrderedDict()
 
     def detect_change(self, item: Item, at: float, *, force: bool = False) -> None:
         """
@@ -69,44 +237,34 @@ class AnimStack:
         # 下面这些代码主要是为了对区段进行优化处理，提前计算出特定区段中存在哪些动画对象
         # 这样可以避免在 compute 以及渲染时重复判断哪些动画对象是否作用，提高效率
 
+        # 各个区段的动画序列是持久化的链表（见 AnimNode），在切分区段时新区段直接共用原有的序列，
+        # 向区段添加动画时也只是在原有序列的末尾接上新的节点，因此不会复制整个序列
+
         #
-        t_cnt = len(self.times)
+        times = self.times
+        stacks = self.stacks
         at = anim.t_range.at
         end = anim.t_range.end
-        at_idx = None
-        end_idx = t_cnt if end is FOREVER else None
 
         # 避免缓存导致的问题
-        if self.cache_time is not None:
+        if self.latest is not None or self.cache:
             self.clear_cache()
 
-        # 在大多数情况中，anim 会被添加到末尾的区段
-        # 所以这里从末尾开始遍历，而不是 bisect 二分查找
-        for i, t in enumerate(reversed(self.times)):
-            if end_idx is None:
-                if t <= end:
-                    # t_cnt - 1 - i 即 t 的下标
-                    end_idx = t_cnt - 1 - i
-            if end_idx is not None:
-                if t <= at:
-                    at_idx = t_cnt - 1 - i
-                    break
-
-        assert at_idx is not None
-        assert end_idx is not None
+        at_idx = bisect_right(times, at) - 1
+        end_idx = len(times) if end is FOREVER else bisect_right(times, end, at_idx) - 1
 
         # 必要时在 at 处切一刀
-        if self.times[at_idx] != at:
+        if times[at_idx] != at:
             at_idx += 1
-            self.times.insert(at_idx, at)
-            self.stacks.insert(at_idx, self.stacks[at_idx - 1].copy())
+            times.insert(at_idx, at)
+            stacks.insert(at_idx, stacks[at_idx - 1])
             end_idx += 1
 
         # 必要时在 end 处切一刀
-        if end_idx != len(self.times) and self.times[end_idx] != end:
+        if end_idx != len(times) and times[end_idx] != end:
             end_idx += 1
-            self.times.insert(end_idx, end)
-            self.stacks.insert(end_idx, self.stacks[end_idx - 1].copy())
+            times.insert(end_idx, end)
+            stacks.insert(end_idx, stacks[end_idx - 1])
 
         # 如果 _cover_previous_anims=True，则替换覆盖
         # 否则，分别 append 到范围内的 stack 中
@@ -114,23 +272,34 @@ class AnimStack:
         if anim._cover_previous_anims:
             if at_idx + 1 != end_idx:
                 # 删掉多余的区段
-                del self.times[at_idx + 1 : end_idx]
-                del self.stacks[at_idx + 1 : end_idx]
-            stack = self.stacks[at_idx]
-            stack.clear()
-            stack.append(anim)
+                del times[at_idx + 1 : end_idx]
+                del stacks[at_idx + 1 : end_idx]
+            stacks[at_idx] = AnimNode(anim, None)
         else:
-            for idx in range(at_idx, end_idx):
-                self.stacks[idx].append(anim)
+            # 相邻的区段共用同一个序列时，添加后仍然共用同一个序列
+            prev_old = stacks[at_idx]
+            prev_new = stacks[at_idx] = AnimNode(anim, prev_old)
+            for idx in range(at_idx + 1, end_idx):
+                old = stacks[idx]
+                if old is not prev_old:
+                    prev_old = old
+                    prev_new = AnimNode(anim, old)
+                stacks[idx] = prev_new
 
     def get_at_left(self, as_time: float) -> list[ItemAnimation]:
         idx = bisect_left(self.times, as_time) - 1
-        return self.stacks[max(0, idx)]
+        return AnimNode.to_list(self.stacks[max(0, idx)])
 
     def get(self, as_time: float) -> list[ItemAnimation]:
         idx = bisect_right(self.times, as_time) - 1
         assert idx >= 0
-        return self.stacks[idx]
+        return AnimNode.to_list(self.stacks[idx])
+
+    def get_by_index(self, idx: int) -> list[ItemAnimation]:
+        """
+        得到第 ``idx`` 个区段（从 ``self.times[idx]`` 开始）中的动画序列
+        """
+        return AnimNode.to_list(self.stacks[idx])
 
     def compute(self, as_time: float, readonly: bool, *, get_at_left: bool = False) -> Item:
         """
@@ -150,15 +319,44 @@ class AnimStack:
 
         - 例如用于绘制时的调用时 ``readonly=True``，因为绘制时不会对物件数据产生影响
         """
-        if as_time != self.cache_time:
+        key = (as_time, get_at_left)
+        latest = self.latest
+        if latest is not None and latest[0] == key:
+            compute_cache.hits += 1
+            data = latest[1]
+        elif (data := self.cache.get(key)) is not None:
+            compute_cache.hits += 1
+            self.cache.move_to_end(key)
+            compute_cache.touch(self, key)
+        else:
+            compute_cache.misses += 1
+            results = self.compute_with_aligned_stacks(as_time, get_at_left)
+            for stack, result in results.items():
+                stack.store_cache(key, result)
+            data = results[self]
+
+        return data if readonly else data.store()
+
+    def compute_with_aligned_stacks(
+        self, as_time: float, get_at_left: bool
+    ) -> dict[AnimStack, Item]:
+        """
+        计算 ``as_time`` 时的物件，不使用缓存
+
+        由于 :class:`~.ApplyAligner` 的存在，可能会一并计算其它的 :class:`AnimStack`，
+        因此返回的是所有计算了的 :class:`AnimStack` 及其结果
+        """
+        results: dict[AnimStack, Item] = {}
+        # 动画返回的物件可能会在计算时被重复使用，所以出错时清除所涉及的缓存，避免缓存了被改动的数据
+        involved: list[AnimStack] = [self]
+        try:
             anims = (self.get_at_left if get_at_left else self.get)(as_time)
             generator = self.compute_anims(as_time, anims)
 
             try:
                 aligner = next(generator)
             except StopIteration as e:
-                self.cache_time = as_time
-                self.cache_data = e.value
+                results[self] = e.value
             else:
                 type Stacks = list[AnimStack]
                 type Computing = dict[AnimStack, tuple[ComputeAnimsGenerator, ApplyAligner]]
@@ -187,6 +385,7 @@ class AnimStack:
                             )
                         else:
                             computing[stack] = (generator, aligner)
+                            involved.append(stack)
                             if id(aligner.stacks) not in stacks_map:
                                 append_stacks(aligner.stacks)
 
@@ -217,8 +416,7 @@ class AnimStack:
                             computing[stack] = (generator, aligner)
                         except StopIteration as e:
                             drop.append(stack)
-                            stack.cache_time = as_time
-                            stack.cache_data = e.value
+                            results[stack] = e.value
                         else:
                             if id(aligner.stacks) not in stacks_map:
                                 append_stacks(aligner.stacks)
@@ -228,8 +426,12 @@ class AnimStack:
                         for stack, tup in computing.items()
                         if stack not in drop  #
                     }
+        except BaseException:
+            for stack in involved:
+                stack.clear_cache()
+            raise
 
-        return self.cache_data if readonly else self.cache_data.store()
+        return results
 
     def compute_anims(self, as_time: float, anims: list[ItemAnimation]) -> ComputeAnimsGenerator:
         if not anims:
@@ -249,6 +451,60 @@ class AnimStack:
 
         return data
 
+    def store_cache(self, key: ComputeCacheKey, data: Item) -> None:
+        """
+        缓存 :meth:`compute` 的结果
+
+        - 最近一次的结果总是记录在 ``self.latest`` 中
+        - 按时间顺序依次查询时（例如导出视频），之前的结果不会再被用到，
+          因此只记录在 ``self.latest`` 中，省去维护 ``self.cache`` 以及 :data:`compute_cache` 的开销
+        - 一旦出现往回的查询（例如在预览界面中来回拖动），之后的结果都会放入 ``self.cache``，
+          超出 :data:`COMPUTE_CACHE_SIZE` 时淘汰最早使用的
+
+        动画可能会在不同时间返回同一个物件并原地修改其数据（例如 :class:`~.Display`），
+        因此会移除其它与 ``data`` 是同一个对象的缓存，避免它们的结果被改动
+        """
+        # 没有动画时结果就是物件本身，不需要缓存
+        if data is self.item:
+            return
+
+        latest = self.latest
+        self.latest = (key, data)
+        if not self.cache:
+            if latest is None or key[0] > latest[0][0]:
+                return
+            # 开始往回查询，之前的结果也放入 cache
+            if latest[1] is not data:
+                self._add_cache(*latest)
+        self._add_cache(key, data)
+
+    def _add_cache(self, key: ComputeCacheKey, data: Item) -> None:
+        for old_key in [k for k, v in self.cache.items() if v is data or k == key]:
+            del self.cache[old_key]
+            compute_cache.discard(self, old_key)
+        self.cache[key] = data
+        self.cache.move_to_end(key)
+        compute_cache.add(self, key, data)
+
+        while len(self.cache) > COMPUTE_CACHE_SIZE:
+            old_key, _ = self.cache.popitem(last=False)
+            compute_cache.discard(self, old_key)
+
     def clear_cache(self) -> None:
-        self.cache_time: float | None = None
-        self.cache_data: Item | None = None
+        self.latest = None
+        for key in self.cache:
+            compute_cache.discard(self, key)
+        self.cache.clear()
+
+    def __getstate__(self) -> dict:
+        # 缓存没有记录在 compute_cache 中，因此不保留
+        state = self.__dict__.copy()
+        state['latest'] = None
+        state['cache'] = OrderedDict()
+        # 各个区段共用节点，统一展开，避免每个区段都将整个序列 pickle 一遍
+        state['stacks'] = AnimNode.dump_graph(self.stacks)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.stacks = AnimNode.load_graph(*state['stacks'])
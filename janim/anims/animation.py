@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import math
-from bisect import bisect_left
+from bisect import bisect_left, bisect_right, insort
 from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Callable, Iterable, Self, overload
@@ -156,6 +156,9 @@ class Animation:
 class ItemAnimation(Animation):
     auto_detect = True
 
+    # apply 的结果是否与 global_t 无关，例如 Display；另见 BuiltTimeline.static_fingerprint
+    time_invariant = False
+
     def __init__(
         self,
         item: Item,
@@ -390,3 +393,180 @@ class TimeSegments[T]:
     def get(self, t: float) -> list[T]:
         idx = math.floor(t / self.step)
         return self.segments[idx] if idx < len(self.segments) else []
+
+    def get_between(self, begin: float, end: float) -> list[T]:
+        """
+        得到所在区段与 ``[begin, end]`` 有交集的元素，不重复
+
+        注：返回的元素只是可能与 ``[begin, end]`` 有交集，需要自行判断
+        """
+        left = max(0, math.floor(begin / self.step))
+        right = min(len(self.segments), math.floor(end / self.step) + 1)
+        if right - left == 1:
+            return self.segments[left]
+        values = {id(val): val for segment in self.segments[left:right] for val in segment}
+        return list(values.values())
+
+
+class _IntervalNode:
+    """
+    :class:`TimeIntervals` 中区间树的节点，记录了包含 ``center`` 的区段
+    """
+
+    __slots__ = ('center', 'by_at', 'by_end', 'left', 'right')
+
+    def __init__(
+        self,
+        center: float,
+        by_at: list[tuple[float, int]],
+        by_end: list[tuple[float, int]],
+        left: _IntervalNode | None,
+        right: _IntervalNode | None,
+    ):
+        self.center = center
+        # 按照开始时间从小到大排列的 (at, order)
+        self.by_at = by_at
+        # 按照结束时间从大到小排列的 (end, order)
+        self.by_end = by_end
+        # 结束时间不超过 center 的区段
+        self.left = left
+        # 开始时间大于 center 的区段
+        self.right = right
+
+
+class TimeIntervals[T]:
+    """
+    与 :class:`TimeSegments` 类似，但是 :meth:`get` 只返回区段包含 ``t`` 的元素，不需要再自行判断
+
+    - 区段是左闭右开的，即 ``[at, end)``，``end`` 为 ``FOREVER`` 时表示一直持续
+    - 返回的元素保持传入时的顺序，并且不重复
+
+    查询的方式有两种：
+
+    - 按照时间顺序依次查询时（例如导出视频时逐帧查询），
+      在上一次查询结果的基础上添加开始的区段、移除结束的区段，
+      开销只与两次查询之间发生变化的区段数量有关
+    - 其它情况（例如在预览界面中跳转）使用中心区间树查询，
+      复杂度为 ``O(log n + k)``，``k`` 是结果的数量
+
+    注：:meth:`get` 返回的列表可能会在之后的查询中被复用，不应修改
+    """
+
+    def __init__(
+        self,
+        iterable: Iterable[T],
+        key: Callable[[T], TimeRange | Iterable[TimeRange]],
+    ):
+        self.values: list[T] = []
+        intervals: list[tuple[float, float, int]] = []
+
+        for val in iterable:
+            order = len(self.values)
+            self.values.append(val)
+            ret = key(val)
+            for t_range in [ret] if isinstance(ret, TimeRange) else ret:
+                end = math.inf if t_range.end is FOREVER else t_range.end
+                if t_range.at < end:
+                    intervals.append((t_range.at, end, order))
+
+        self.root = self._build_tree(intervals)
+
+        # 用于按时间顺序查询
+        self.starts = sorted(intervals, key=lambda x: x[0])
+        self.ends = sorted(intervals, key=lambda x: x[1])
+        self.start_times = [interval[0] for interval in self.starts]
+        self.end_times = [interval[1] for interval in self.ends]
+
+        self._time: float | None = None
+        self._start_idx = 0
+        self._end_idx = 0
+        # 当前包含 self._time 的区段所对应的 order，从小到大排列，可能会有重复
+        self._active: list[int] = []
+        self._result: list[T] | None = None
+
+    @staticmethod
+    def _build_tree(intervals: list[tuple[float, float, int]]) -> _IntervalNode | None:
+        if not intervals:
+            return None
+
+        # 以开始时间的中位数作为 center，使得左右两侧的区段都不超过一半
+        center = sorted(interval[0] for interval in intervals)[len(intervals) // 2]
+
+        left: list[tuple[float, float, int]] = []
+        right: list[tuple[float, float, int]] = []
+        middle: list[tuple[float, float, int]] = []
+        for interval in intervals:
+            if interval[1] <= center:
+                left.append(interval)
+            elif interval[0] > center:
+                right.append(interval)
+            else:
+                middle.append(interval)
+
+        return _IntervalNode(
+            center,
+            sorted((at, order) for at, _, order in middle),
+            sorted(((end, order) for _, end, order in middle), reverse=True),
+            TimeIntervals._build_tree(left),
+            TimeIntervals._build_tree(right),
+        )
+
+    def query(self, t: float) -> list[int]:
+        """
+        使用区间树得到区段包含 ``t`` 的元素的 order，即元素在 :attr:`values` 中的下标，未排序
+        """
+        orders: list[int] = []
+        node = self.root
+        while node is not None:
+            if t < node.center:
+                # 这些区段的 end 都大于 center，因此只需判断 at
+                for at, order in node.by_at:
+                    if at > t:
+                        break
+                    orders.append(order)
+                node = node.left
+            else:
+                # 这些区段的 at 都不超过 center，因此只需判断 end
+                for end, order in node.by_end:
+                    if end <= t:
+                        break
+                    orders.append(order)
+                node = node.right
+        return orders
+
+    def get(self, t: float) -> list[T]:
+        if self._time is not None and self._time <= t:
+            start_idx = bisect_right(self.start_times, t, lo=self._start_idx)
+            end_idx = bisect_right(self.end_times, t, lo=self._end_idx)
+            changes = start_idx - self._start_idx + end_idx - self._end_idx
+            # 变化较多时（例如向后跳转了较长的时间），直接重新查询更快
+            if changes <= max(16, len(self._active)):
+                if changes != 0:
+                    self._advance(start_idx, end_idx)
+                self._time = t
+                return self._get_result()
+
+        self._time = t
+        self._start_idx = bisect_right(self.start_times, t)
+        self._end_idx = bisect_right(self.end_times, t)
+        self._active = sorted(self.query(t))
+        self._result = None
+        return self._get_result()
+
+    def _advance(self, start_idx: int, end_idx: int) -> None:
+        active = self._active
+        for i in range(self._start_idx, start_idx):
+            insort(active, self.starts[i][2])
+        # 结束时间不超过 t 的区段，开始时间一定小于 t，所以此时已经在 active 中了
+        for i in range(self._end_idx, end_idx):
+            order = self.ends[i][2]
+            del active[bisect_left(active, order)]
+        self._start_idx = start_idx
+        self._end_idx = end_idx
+        self._result = None
+
+    def _get_result(self) -> list[T]:
+        if self._result is None:
+            values = self.values
+            self._result = [values[order] for order in dict.fromkeys(self._active)]
+        return self._result
@@ -12,6 +12,7 @@ class Display(ItemAnimation):
     """
 
     auto_detect = False
+    time_invariant = True
 
     def __init__(self, item: Item, data: Item, **kwargs):
         super().__init__(item, **kwargs)
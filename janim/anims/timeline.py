@@ -23,7 +23,13 @@ import numpy as np
 from PIL import Image
 
 from janim.anims.anim_stack import AnimStack
-from janim.anims.animation import Animation, TimeAligner, TimeRange, TimeSegments
+from janim.anims.animation import (
+    Animation,
+    TimeAligner,
+    TimeIntervals,
+    TimeRange,
+    TimeSegments,
+)
 from janim.anims.composition import AnimGroup
 from janim.anims.updater import updater_params_ctx
 from janim.camera.camera import Camera
@@ -718,13 +724,36 @@ class Timeline(metaclass=ABCMeta):
             self.renderer.render(data)
 
     class ItemAppearancesDict(defaultdict[Item, ItemAppearance]):
+        """
+        除了物件与 :class:`ItemAppearance` 的对应关系，
+        还记录了 :meth:`Timeline.detect_changes_of_all` 需要检查的物件
+
+        - ``self.changed`` 是自上次检查以来被标记为发生变化的物件，
+          另见 :meth:`~.Item.mark_changed`；新添加的物件也会被记录在其中，
+          以便产生最初的 :class:`~.Display`
+        - ``self.untracked`` 是含有 ``tracks_changes=False`` 组件的物件，无法得知它们何时变化，
+          所以每次都需要检查
+
+        这两者都使用 ``dict`` 而不是 ``set``，以保持检查的顺序与物件被标记的顺序一致
+        """
+
         def __init__(self, time_aligner: TimeAligner):
             super().__init__(lambda key: Timeline.ItemAppearance(key, time_aligner))
+            self.time_aligner = time_aligner
+            self.changed: dict[Item, None] = {}
+            self.untracked: dict[Item, None] = {}
 
         def __missing__(self, key: Item) -> Timeline.ItemAppearance:
             self[key] = value = self.default_factory(key)
+            self.changed[key] = None
+            if not all(cmpt.tracks_changes for cmpt in key.components.values()):
+                self.untracked[key] = None
             return value
 
+        def __reduce__(self):
+            # default_factory 是 lambda，无法直接 pickle，所以通过 time_aligner 重新创建
+            return (self.__class__, (self.time_aligner,), self.__dict__, None, iter(self.items()))
+
     # region ItemAppearance.stack
 
     def track(self, item: Item) -> None:
@@ -740,12 +769,29 @@ class Timeline(metaclass=ABCMeta):
         for subitem in item.walk_self_and_descendants(root_only):
             self.item_appearances[subitem]
 
+    def mark_changed(self, item: Item) -> None:
+        """
+        另见 :meth:`~.Item.mark_changed`
+        """
+        apprs = self.item_appearances
+        if item in apprs:
+            apprs.changed[item] = None
+
     def detect_changes_of_all(self) -> None:
         """
         检查物件的变化并将变化记录为 :class:`~.Display`
+
+        只会检查被标记为发生变化的物件，以及无法跟踪变化的物件，详见 :class:`ItemAppearancesDict`
         """
-        for item, appr in self.item_appearances.items():
-            appr.stack.detect_change(item, self.current_time)
+        apprs = self.item_appearances
+        changed = apprs.changed
+        apprs.changed = {}
+
+        for item in apprs.untracked:
+            apprs[item].stack.detect_change(item, self.current_time)
+        for item in changed:
+            if item not in apprs.untracked:
+                apprs[item].stack.detect_change(item, self.current_time)
 
     def detect_changes(self, items: Iterable[Item]) -> None:
         """
@@ -1022,16 +1068,39 @@ class ListedTimelines(Timeline):
 
         class Sections(ListedTimelines):
             includes = [Section1, Section2]
+
+    可以设置 ``build_jobs`` 大于 1，在多个子进程中同时构建各个部分，适用于部分较多且构建较慢的情况：
+
+    .. code-block:: python
+
+        class Sections(ListedTimelines):
+            includes = [Section1, Section2]
+            build_jobs = 4
+
+    详见 :func:`~.build_timelines_in_parallel`
     """
 
     includes: list[type[Timeline]] = []
+    build_jobs: int = 1
 
     def construct(self):
         """"""
-        for cls in self.includes:
-            tl = cls().build().to_item().show()
+        for built in self.build_includes():
+            tl = built.to_item().show()
             self.forward(tl.duration)
 
+    def build_includes(self) -> Iterable[BuiltTimeline]:
+        """
+        按顺序构建 ``includes`` 中的各个时间轴
+        """
+        if self.build_jobs > 1 and len(self.includes) > 1:
+            from janim.render.parallel import build_timelines_in_parallel
+
+            yield from build_timelines_in_parallel(self.includes, jobs=self.build_jobs)
+        else:
+            for cls in self.includes:
+                yield cls().build()
+
 
 class AboveTimelines(ListedTimelines):
     """
@@ -1099,20 +1168,22 @@ class BuiltTimeline:
         self.timeline = timeline
         self.duration = timeline.time_aligner.align_t(timeline.current_time)
 
-        self.visible_item_segments = TimeSegments(
+        self.visible_item_intervals = TimeIntervals(
             ((item, appr) for item, appr in timeline.item_appearances.items()),
             lambda x: (
-                TimeRange(*range) if len(range) == 2 else TimeRange(*range, self.duration + 1)
+                TimeRange(*range) if len(range) == 2 else TimeRange(*range, FOREVER)
                 for range in it.batched(x[1].visibility, 2)
             ),
         )
-        self.visible_render_group_segments = TimeSegments(
+        self.visible_render_group_intervals = TimeIntervals(
             self.timeline.extra_render_groups,
-            lambda x: (
-                x.t_range
-                if x.t_range.end is not FOREVER
-                else TimeRange(x.t_range.at, self.duration + 1)
-            ),
+            lambda x: x.t_range,
+        )
+        # 包括所有子 Timeline 的音频，按照全局时间索引，使得提取一段音频时只需要遍历附近的音频
+        self.audio_info_segments = TimeSegments(
+            self._iter_audio_infos(),
+            lambda x: x.range,
+            step=1,
         )
 
         self._time: float = 0
@@ -1147,45 +1218,73 @@ class BuiltTimeline:
         channels = self.cfg.audio_channels
 
         output_sample_count = math.floor(end * framerate) - math.floor(begin * framerate)
-        result = np.zeros((output_sample_count, channels), dtype=np.int16)
+        # 使用 int32 累加，最后再截断到 int16 的范围，避免多个音频叠加时溢出
+        result = np.zeros((output_sample_count, channels), dtype=np.int32)
+
+        for info in self.audio_info_segments.get_between(begin, end):
+            if info.range.at < end and info.range.end > begin:
+                self._mix_audio_info(result, info, begin, end)
+
+        return np.clip(result, -32768, 32767).astype(np.int16)
 
-        # 合并自身的 audio
+    def _iter_audio_infos(self, offset: float = 0) -> Iterable[Timeline.PlayAudioInfo]:
+        """
+        遍历自身以及所有子 Timeline 的音频，时间范围都被换算到当前 Timeline 中
+        """
         for info in self.timeline.audio_infos:
-            if end < info.range.at or begin > info.range.end:
+            if offset == 0:
+                yield info
                 continue
+            t_range = info.range.copy()
+            t_range.shift(offset)
+            yield Timeline.PlayAudioInfo(info.audio, t_range, info.clip_range)
 
-            audio = info.audio
+        for item in self.timeline.subtimeline_items:
+            yield from item._built._iter_audio_infos(offset + item.at)
 
-            frame_begin = int((begin - info.range.at + info.clip_range.at) * audio.framerate)
-            frame_end = int((end - info.range.at + info.clip_range.at) * audio.framerate)
+    @staticmethod
+    def _mix_audio_info(
+        result: np.ndarray,
+        info: Timeline.PlayAudioInfo,
+        begin: float,
+        end: float,
+    ) -> None:
+        """
+        将 ``info`` 在 ``[begin, end)`` 中的部分叠加到 ``result`` 中
 
-            clip_begin = max(0, int(audio.framerate * info.clip_range.at))
-            clip_end = min(audio.sample_count(), int(audio.framerate * info.clip_range.end))
+        ``[begin, end)`` 先按照音频自身的采样率对应到其中的 ``[frame_begin, frame_end)``，
+        再以 :func:`~.resize_preserving_order` 的方式缩放到 ``result`` 的长度；
+        超出裁剪区段的部分视为空白，所以这里只需要叠加有数据的那一段
+        """
+        audio = info.audio
+        output_sample_count = len(result)
 
-            left_blank = max(0, clip_begin - frame_begin)
-            right_blank = max(0, frame_end - clip_end)
+        frame_begin = int((begin - info.range.at + info.clip_range.at) * audio.framerate)
+        frame_end = int((end - info.range.at + info.clip_range.at) * audio.framerate)
+        length = frame_end - frame_begin
 
-            data = audio._samples.data[max(clip_begin, frame_begin) : min(clip_end, frame_end)]
+        clip_begin = max(0, int(audio.framerate * info.clip_range.at))
+        clip_end = min(audio.sample_count(), int(audio.framerate * info.clip_range.end))
 
-            if left_blank != 0 or right_blank != 0:
-                # channels = data.shape[1]
-                data = np.concatenate(
-                    [
-                        np.zeros((left_blank, channels), dtype=np.int16),
-                        data,
-                        np.zeros((right_blank, channels), dtype=np.int16),
-                    ]
-                )
+        # 有数据的部分在 [frame_begin, frame_end) 中的位置
+        data_begin = max(clip_begin, frame_begin) - frame_begin
+        data_end = min(clip_end, frame_end) - frame_begin
+        if data_begin >= data_end:
+            return
 
-            result += resize_preserving_order(data, output_sample_count)
+        samples = audio._samples.data
 
-        # 合并子 Timeline 的 audio
-        for item in self.timeline.subtimeline_items:
-            built = item._built
-            data = built.get_audio_samples_between(framerate, begin - item.at, end - item.at)
-            result += resize_preserving_order(data, output_sample_count)
+        if length == output_sample_count:
+            data = samples[frame_begin + data_begin : frame_begin + data_end]
+            result[data_begin:data_end] += data
+            return
 
-        return result
+        # 输出的第 i 个采样对应第 i * length // output_sample_count 个，
+        # 这里求出对应到 [data_begin, data_end) 的 i 的范围
+        out_begin = -(-data_begin * output_sample_count // length)
+        out_end = min(output_sample_count, -(-data_end * output_sample_count // length))
+        indices = np.arange(out_begin, out_end) * length // output_sample_count
+        result[out_begin:out_end] += samples[frame_begin + indices]
 
     def current_camera_info(self, *, as_time: float | None = None) -> CameraInfo:
         """
@@ -1208,20 +1307,13 @@ class BuiltTimeline:
         渲染所有可见物件
         """
         timeline = self.timeline
-        global_t = timeline.time_aligner.align_t_for_render(global_t)
-        # 使得最后一帧采用略提早一点点的时间渲染，使得一些结束在结尾的动画不突变
-        if global_t == self.duration:
-            global_t -= 1e-4
+        global_t = self._align_t_for_render(global_t)
         self._time = global_t
 
         try:
             # 有必要在计算 camera 和 light_source 之前设置这些 context
             # 因为用户有可能给 camera 或 light_source 使用 updater，updater 需要这些信息
-            with (
-                ContextSetter(Animation.global_t_ctx, global_t),
-                ContextSetter(Timeline.ctx_var, self.timeline),
-                self.timeline.with_config(),
-            ):
+            with self._compute_context(global_t):
                 # 计算 camera 和 light_source
                 if camera is None:
                     camera = timeline.compute_item(timeline.camera, global_t, True)
@@ -1255,6 +1347,89 @@ class BuiltTimeline:
 
         return True
 
+    @contextmanager
+    def _compute_context(self, global_t: float):
+        with (
+            ContextSetter(Animation.global_t_ctx, global_t),
+            ContextSetter(Timeline.ctx_var, self.timeline),
+            self.timeline.with_config(),
+        ):
+            yield
+
+    def _align_t_for_render(self, global_t: float) -> float:
+        global_t = self.timeline.time_aligner.align_t_for_render(global_t)
+        # 使得最后一帧采用略提早一点点的时间渲染，使得一些结束在结尾的动画不突变
+        if global_t == self.duration:
+            global_t -= 1e-4
+        return global_t
+
+    def static_fingerprint(self, global_t: float) -> tuple | None:
+        """
+        得到 ``global_t`` 时刻画面的指纹，用于判断两帧画面是否相同
+
+        如果两个时刻的指纹相同且都不是 ``None``，那么这两个时刻 :meth:`render_all` 的结果一定相同；
+        指纹由可见物件（以及摄像机和光源）在该时刻所作用的动画组成，
+        当画面可能随时间变化时返回 ``None``，包括：
+
+        - 有物件正在被与时间有关的动画作用，也就是除了 :class:`~.Display` 以外的动画
+        - 有物件的渲染器与时间有关，例如视频、:class:`TimelineItem`
+        - 有额外渲染，因为无法得知其结果是否与时间有关
+        """
+        timeline = self.timeline
+        global_t = self._align_t_for_render(global_t)
+
+        if self.visible_render_group_intervals.get(global_t):
+            return None
+
+        fingerprint: list[int] = []
+
+        def add_stack(stack: AnimStack) -> bool:
+            anims = stack.get(global_t)
+            if not all(anim.time_invariant for anim in anims):
+                return False
+            fingerprint.append(id(stack))
+            fingerprint.extend(map(id, anims))
+            return True
+
+        apprs = timeline.item_appearances
+        if not add_stack(apprs[timeline.camera].stack):
+            return None
+        if not add_stack(apprs[timeline.light_source].stack):
+            return None
+
+        for item, appr in self.visible_item_intervals.get(global_t):
+            if not item.renderer_cls.time_invariant or not add_stack(appr.stack):
+                return None
+
+        return tuple(fingerprint)
+
+    def compute_frame_items(self, global_t: float) -> list[Item] | None:
+        """
+        得到 ``global_t`` 时刻决定画面内容的物件数据，依次是摄像机、光源以及所有可见物件
+
+        画面只取决于这些数据，所以可以用于判断不同的时刻（甚至不同次运行之间）的画面是否相同，
+        另见 :mod:`~.segment_cache`；
+        与 :meth:`static_fingerprint` 类似，当画面还与其它因素有关时返回 ``None``，
+        即有物件的渲染器与时间有关，或者有额外渲染
+        """
+        timeline = self.timeline
+        global_t = self._align_t_for_render(global_t)
+
+        if self.visible_render_group_intervals.get(global_t):
+            return None
+
+        with self._compute_context(global_t):
+            items = [
+                timeline.compute_item(timeline.camera, global_t, True),
+                timeline.compute_item(timeline.light_source, global_t, True),
+            ]
+            for item, appr in self.visible_item_intervals.get(global_t):
+                if not item.renderer_cls.time_invariant:
+                    return None
+                items.append(appr.stack.compute(global_t, True))
+
+        return items
+
     def _uniforms_context(self, data: RenderData):
         camera_info = data.camera_info
         return uniforms(
@@ -1277,17 +1452,13 @@ class BuiltTimeline:
     def _get_render_collection(self, global_t: float) -> RenderCollection:
         # 提取所有当前可见的 apprs
         apprs: list[tuple[Timeline.ItemAppearance, Item]] = []
-        for _, appr in self.visible_item_segments.get(global_t):
-            if not appr.is_visible_at(global_t):
-                continue
+        for _, appr in self.visible_item_intervals.get(global_t):
             data = appr.stack.compute(global_t, True)
             apprs.append((appr, data))
 
         # 提取所有当前可见的额外渲染
         extras: list[tuple[Timeline.ExtraRenderGroup, RenderGroupReturn]] = []
-        for rg in self.visible_render_group_segments.get(global_t):
-            if not rg.t_range.contains(global_t):
-                continue
+        for rg in self.visible_render_group_intervals.get(global_t):
             extra_items = rg.func()
             extras.append((rg, extra_items))
 
@@ -1438,6 +1609,8 @@ class TimelineItem(Item):
     """
 
     class TIRenderer(Renderer):
+        time_invariant = False
+
         def render(self, item: TimelineItem):
             t = Animation.global_t_ctx.get() - item.at
 
@@ -1539,6 +1712,8 @@ class TimelinePlaybackControlItem(PlaybackControl, Item):
     """
 
     class TPCIRenderer(Renderer):
+        time_invariant = False
+
         def render(self, item: TimelinePlaybackControlItem):
             t = Animation.global_t_ctx.get()
             t = item.compute_time(t, item.duration)
@@ -502,6 +502,9 @@ class MethodTransform(Transform):
         ] = []
 
     def __getattr__(self, name: str):
+        # pickle 等会查找特殊方法，并且在恢复时 __dict__ 还未设置，这些都不应当被记录
+        if name.startswith('__') or 'delayed_actions' not in self.__dict__:
+            raise AttributeError(name)
         self.delayed_actions.append((MethodTransform._ActionType.GetAttr, name))
         return self
 
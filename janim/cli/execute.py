@@ -1,13 +1,18 @@
-from functools import lru_cache
+from __future__ import annotations
+
 import inspect
 import os
 import sys
 import time
 import types
-from typing import Iterable, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 from janim.anims.timeline import BuiltTimeline, Timeline
 from janim.cli.options import (
+    FarmOptions,
     FormatOptions,
     HardwareOptions,
     LiveOptions,
@@ -24,10 +29,16 @@ from janim.cli.utils.extract_timeline import (
 from janim.cli.utils.get_module import get_module
 from janim.locale import get_translator
 from janim.logger import log
-from janim.utils.config import cli_config, default_config
+from janim.utils.config import cli_config, default_config, override_cli_config
 from janim.utils.file_ops import get_janim_dir, open_file
 from janim.utils.typst_compile import set_use_external_typst
 
+if TYPE_CHECKING:
+    import multiprocessing as mp
+
+    from janim.render.farm import FarmServeConfig
+    from janim.render.parallel import TimelineSource
+
 _ = get_translator('janim.cli.execute')
 
 
@@ -44,7 +55,12 @@ def run(
     modify_cli_config(shared_options.configs)
 
     timelines = extract_timelines_from_module(module, timeline_names, shared_options.all)
-    run_timelines(timelines, shared_options.hide_subtitles, live_options)
+    run_timelines(
+        timelines,
+        shared_options.hide_subtitles,
+        live_options,
+        build_cache=shared_options.build_cache,
+    )
 
 
 def examples(timeline_names: list[str]) -> None:
@@ -64,7 +80,11 @@ def examples(timeline_names: list[str]) -> None:
 
 
 def run_timelines(
-    timelines: list[type[Timeline]], hide_subtitles: bool, live_options: LiveOptions
+    timelines: list[type[Timeline]],
+    hide_subtitles: bool,
+    live_options: LiveOptions,
+    *,
+    build_cache: bool = False,
 ) -> None:
     if not timelines:
         return
@@ -89,7 +109,9 @@ def run_timelines(
 
     for timeline in timelines:
         built_timelines.append(
-            timeline().build(hide_subtitles=hide_subtitles, show_debug_notice=True)
+            build_timeline(
+                timeline, hide_subtitles, show_debug_notice=True, build_cache=build_cache
+            )
         )
 
     log.info('======')
@@ -130,6 +152,7 @@ def write(
     output_options: OutputOptions,
     range_options: RangeOptions,
     hardware_options: HardwareOptions,
+    farm_options: FarmOptions | None = None,
 ) -> None:
     module = get_module(file)
     if module is None:
@@ -141,108 +164,350 @@ def write(
     if not timelines:
         return
 
-    from janim.render.writer import AudioWriter, SRTWriter, VideoWriter, merge_video_and_audio
+    if format_options.proxy_fps is not None and format_options.proxy is None:
+        log.warning(_("'--proxy_fps' is ignored because '--proxy' is not set"))
+
+    farm = None
+    if farm_options is not None:
+        from janim.render.farm import FarmServeConfig
+
+        farm = FarmServeConfig(
+            farm_options.host,
+            farm_options.port,
+            farm_options.chunk_duration,
+        )
+
+    write_options = WriteOptions(
+        format_options,
+        output_options.resolve(),
+        range_options,
+        hardware_options,
+        farm,
+        multiple=len(timelines) > 1,
+    )
+
+    if hardware_options.jobs > 1 and len(timelines) > 1:
+        if farm is not None:
+            log.warning(_('Render farm writes timelines one by one, ignoring the jobs option'))
+        elif write_in_jobs(
+            timelines,
+            shared_options.hide_subtitles,
+            open,
+            write_options,
+            build_cache=shared_options.build_cache,
+        ):
+            return
+
+    session: AbstractContextManager = nullcontext()
+    if farm is not None:
+        from janim.render.farm import farm_session
+
+        # 各个时间轴共用同一个服务，使得 worker 在时间轴之间保持连接
+        session = farm_session()
+
+    # 逐个构建并输出，使得同时只有一个 BuiltTimeline 在内存中
+    with session:
+        for i, timeline in enumerate(timelines):
+            log.info('======')
+            built = build_timeline(
+                timeline, shared_options.hide_subtitles, build_cache=shared_options.build_cache
+            )
+            write_built(built, open and i == len(timelines) - 1, write_options)
 
     log.info('======')
 
-    builts = [
-        timeline().build(hide_subtitles=shared_options.hide_subtitles)  #
-        for timeline in timelines
-    ]
 
-    resolved_output_options = output_options.resolve()
+def build_timeline(
+    timeline: type[Timeline],
+    hide_subtitles: bool,
+    *,
+    show_debug_notice: bool = False,
+    build_cache: bool = False,
+) -> BuiltTimeline:
+    """
+    构建时间轴，``build_cache=True`` 时优先使用缓存的构建结果，另见 :mod:`~.build_cache`
+    """
+    if not build_cache:
+        return timeline().build(hide_subtitles=hide_subtitles, show_debug_notice=show_debug_notice)
 
-    is_gif = format_options.format == 'gif'
+    from janim.utils.build_cache import build_with_cache
+
+    return build_with_cache(
+        timeline, hide_subtitles=hide_subtitles, show_debug_notice=show_debug_notice
+    )
+
+
+@dataclass
+class WriteOptions:
+    """
+    :func:`write_built` 所需的选项，可以传递给 :func:`write_in_jobs` 的子进程
+    """
+
+    format_options: FormatOptions
+    resolved_output_options: tuple[bool, bool, bool, bool]
+    range_options: RangeOptions
+    hardware_options: HardwareOptions
+    farm: FarmServeConfig | None
+    multiple: bool
+
+
+def write_built(built: BuiltTimeline, open_result: bool, options: WriteOptions) -> None:
+    """
+    将构建好的时间轴按照 ``options`` 输出为视频、音频以及字幕文件
+
+    指定了 ``--proxy`` 时，在输出期间降低分辨率（以及帧率），另见 :meth:`~.ConfigGetter.proxy_size`
+    """
+    format_options = options.format_options
+    if format_options.proxy is None:
+        _write_built(built, open_result, options)
+        return
+
+    overrides = built.cfg.proxy_size(format_options.proxy)
+    if format_options.proxy_fps is not None:
+        overrides['fps'] = format_options.proxy_fps
+    with override_cli_config(**overrides):
+        _write_built(built, open_result, options)
+
+
+def _write_built(built: BuiltTimeline, open_result: bool, options: WriteOptions) -> None:
+    from janim.render.writer import AudioWriter, SRTWriter, VideoWriter, merge_video_and_audio
+
+    format_options = options.format_options
+    range_options = options.range_options
+    hardware_options = options.hardware_options
+
+    name = built.timeline.__class__.__name__
+    relative_path = os.path.dirname(inspect.getfile(built.timeline.__class__))
+
+    output_dir = os.path.normpath(built.cfg.formated_output_dir(relative_path))
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir, exist_ok=True)
 
-    prev_is_skipped = False
+    has_audio = built.timeline.has_audio_for_all()
 
-    for built in builts:
-        name = built.timeline.__class__.__name__
-        relative_path = os.path.dirname(inspect.getfile(built.timeline.__class__))
+    is_gif = format_options.format == 'gif'
+    is_image_sequence = format_options.format.endswith('-seq')
 
-        output_dir = os.path.normpath(built.cfg.formated_output_dir(relative_path))
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+    # 将 resolved_output_options 解包出来，并根据当前 built 的实际状况调整选项
+    video_with_audio, video, audio, srt = options.resolved_output_options
 
-        open_result = open and built is builts[-1]
+    # 如果其实没办法做到 video_with_audio，那么把 video_with_audio 用 video 和 audio 替代
+    fallback = not has_audio or is_gif or is_image_sequence
+    if video_with_audio and fallback:
+        video_with_audio = False
+        video = True
+        audio = True
 
-        has_audio = built.timeline.has_audio_for_all()
+    writes_video = video_with_audio or video
+    writes_audio = (video_with_audio or audio) and has_audio
+    writes_srt = srt and built.timeline.has_subtitle()
 
-        # 将 resolved_output_options 解包出来，并根据当前 built 的实际状况调整选项
-        video_with_audio, video, audio, srt = resolved_output_options
+    if not writes_video and not writes_audio and not writes_srt:
+        log.info(_('Skipping "{name}": no part to output').format(name=name))
+        return
 
-        # 如果其实没办法做到 video_with_audio，那么把 video_with_audio 用 video 和 audio 替代
-        fallback = not has_audio or is_gif
-        if video_with_audio and fallback:
+    if writes_video:
+        log.info(f'fps={built.cfg.fps}')
+        log.info(f'resolution="{built.cfg.pixel_width}x{built.cfg.pixel_height}"')
+        log.info(f'format="{format_options.format}"')
+    if writes_audio:
+        if not video_with_audio:
+            log.info(f'audio_format="{format_options.audio_format}"')
+        log.info(f'audio_framerate="{built.cfg.audio_framerate}"')
+    log.info(f'output_dir="{output_dir}"')
+
+    if writes_video:
+        perf = hardware_options.perf_report or hardware_options.perf
+        if hardware_options.perf_report and options.multiple:
+            # 避免多个时间轴的统计结果写入同一个文件
+            stem, ext = os.path.splitext(hardware_options.perf_report)
+            perf = f'{stem}_{name}{ext}'
+
+        video_writer = VideoWriter(built)
+        video_writer.write_all(
+            os.path.join(output_dir, f'{name}.{format_options.format}'),
+            range_options.in_point,
+            range_options.out_point,
+            use_pbo=not hardware_options.disable_pbo,
+            hwaccel=hardware_options.hwaccel,
+            gpu_yuv=hardware_options.gpu_yuv,
+            reuse_frames=not hardware_options.disable_frame_reuse,
+            segment_cache=hardware_options.segment_cache,
+            workers=hardware_options.workers,
+            farm=options.farm,
+            with_audio=video_with_audio,
+            perf=perf,
+            _keep_temp=video_with_audio,
+        )
+        # 音频已经在输出视频时一并写入
+        if video_writer.audio_embedded:
             video_with_audio = False
-            video = True
-            audio = True
+            writes_audio = audio and has_audio
+        if open_result and not video_with_audio:
+            open_file(video_writer.final_file_path)
+
+    if writes_audio:
+        audio_writer = AudioWriter(built)
+        audio_writer.write_all(
+            os.path.join(output_dir, f'{name}.{format_options.audio_format}'),
+            range_options.in_point,
+            range_options.out_point,
+            _keep_temp=video_with_audio,
+        )
+        if open_result and not video_with_audio and not writes_video:
+            open_file(audio_writer.final_file_path)
+
+    if video_with_audio:
+        merge_video_and_audio(
+            video_writer.temp_file_path,
+            audio_writer.temp_file_path,
+            video_writer.final_file_path,
+        )
+        if open_result:
+            open_file(video_writer.final_file_path)
 
-        writes_video = video_with_audio or video
-        writes_audio = (video_with_audio or audio) and has_audio
-        writes_srt = srt and built.timeline.has_subtitle()
+    if writes_srt:
+        file_path = os.path.join(output_dir, f'{name}.srt')
+        SRTWriter.writes(built, file_path)
+        log.info(_('Generated SRT file "{file_path}"').format(file_path=file_path))
 
-        skip = not writes_video and not writes_audio and not writes_srt
 
-        # 这个判断使得连续跳过多个时，不输出额外的分割线
-        if not (prev_is_skipped and skip):
-            log.info('======')
+def write_in_jobs(
+    timelines: list[type[Timeline]],
+    hide_subtitles: bool,
+    open: bool,
+    options: WriteOptions,
+    *,
+    build_cache: bool = False,
+) -> bool:
+    """
+    每个时间轴在单独的进程中构建并输出，同时最多运行 ``hardware_options.jobs`` 个进程，
+    使得同时在内存中的 :class:`~.BuiltTimeline` 不超过这个数量
 
-        prev_is_skipped = skip
-
-        if skip:
-            log.info(_('Skipping "{name}": no part to output').format(name=name))
-            continue
-
-        if writes_video:
-            log.info(f'fps={built.cfg.fps}')
-            log.info(f'resolution="{built.cfg.pixel_width}x{built.cfg.pixel_height}"')
-            log.info(f'format="{format_options.format}"')
-        if writes_audio:
-            if not video_with_audio:
-                log.info(f'audio_format="{format_options.audio_format}"')
-            log.info(f'audio_framerate="{built.cfg.audio_framerate}"')
-        log.info(f'output_dir="{output_dir}"')
-
-        if writes_video:
-            video_writer = VideoWriter(built)
-            video_writer.write_all(
-                os.path.join(output_dir, f'{name}.{format_options.format}'),
-                range_options.in_point,
-                range_options.out_point,
-                use_pbo=not hardware_options.disable_pbo,
-                hwaccel=hardware_options.hwaccel,
-                _keep_temp=video_with_audio,
-            )
-            if open_result and not video_with_audio:
-                open_file(video_writer.final_file_path)
-
-        if writes_audio:
-            audio_writer = AudioWriter(built)
-            audio_writer.write_all(
-                os.path.join(output_dir, f'{name}.{format_options.audio_format}'),
-                range_options.in_point,
-                range_options.out_point,
-                _keep_temp=video_with_audio,
-            )
-            if open_result and not video_with_audio and not writes_video:
-                open_file(audio_writer.final_file_path)
-
-        if video_with_audio:
-            merge_video_and_audio(
-                video_writer.temp_file_path,
-                audio_writer.temp_file_path,
-                video_writer.final_file_path,
-            )
-            if open_result:
-                open_file(video_writer.final_file_path)
+    子进程的日志会转发到当前进程中输出，子进程自身不显示进度条，而是在当前进程中显示已完成的时间轴数量
+
+    如果有时间轴无法在子进程中重新得到（另见 :meth:`~.TimelineSource.from_class`），
+    则不进行输出并返回 ``False``
+    """
+    import multiprocessing as mp
+    from dataclasses import replace
+    from logging.handlers import QueueListener
+    from multiprocessing.connection import wait
+
+    from tqdm import tqdm as ProgressDisplay
+
+    from janim.exception import RenderWorkerError
+    from janim.render.parallel import TimelineSource
+
+    sources = [TimelineSource.from_class(timeline, hide_subtitles) for timeline in timelines]
+    if any(source is None for source in sources):
+        log.warning(
+            _('Some timelines cannot be rebuilt in worker processes, writing them one by one')
+        )
+        return False
+    sources = [replace(source, build_cache=build_cache) for source in sources]
+
+    jobs = options.hardware_options.jobs
+    if options.hardware_options.workers > 1:
+        log.warning(
+            _(
+                'Both jobs and workers are set, '
+                'up to {count} processes may render at the same time'
+            ).format(count=jobs * options.hardware_options.workers)
+        )
+
+    ctx = mp.get_context('spawn')
+    log_queue = ctx.Queue()
+    listener = QueueListener(log_queue, *log.handlers, respect_handler_level=True)
+    listener.start()
 
-        if writes_srt:
-            file_path = os.path.join(output_dir, f'{name}.srt')
-            SRTWriter.writes(built, file_path)
-            log.info(_('Generated SRT file "{file_path}"').format(file_path=file_path))
+    pending = list(enumerate(sources))
+    pending.reverse()
+    running: dict[int, tuple[str, mp.process.BaseProcess]] = {}
+    failed: list[str] = []
 
     log.info('======')
+    progress_display = ProgressDisplay(total=len(sources), leave=False, dynamic_ncols=True)
+    try:
+        with progress_display:
+            while pending or running:
+                while pending and len(running) < jobs:
+                    i, source = pending.pop()
+                    # 不使用 daemon，使得子进程还可以根据 workers 选项创建自己的子进程
+                    process = ctx.Process(
+                        target=_write_job,
+                        args=(source, open and i == len(sources) - 1, options, log_queue),
+                    )
+                    # 进度条由当前进程统一显示，子进程中的 tqdm 在导入时会读取该环境变量并禁用进度条
+                    with _environ(TQDM_DISABLE='1'):
+                        process.start()
+                    running[process.sentinel] = (source.name, process)
+
+                for sentinel in wait(list(running)):
+                    name, process = running.pop(sentinel)
+                    process.join()
+                    if process.exitcode != 0:
+                        failed.append(name)
+                    progress_display.update(1)
+    finally:
+        # 被中断（例如 KeyboardInterrupt）或出错时，结束仍在运行的子进程
+        for name, process in running.values():
+            process.terminate()
+        for name, process in running.values():
+            process.join()
+        listener.stop()
+
+    log.info('======')
+
+    if failed:
+        raise RenderWorkerError(
+            _('Failed to write {names}').format(names=', '.join(f'"{name}"' for name in failed))
+        )
+
+    return True
+
+
+@contextmanager
+def _environ(**env: str):
+    """
+    临时设置环境变量，期间启动的子进程会继承这些环境变量
+    """
+    prev = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for key, value in prev.items():
+            if value is None:
+                del os.environ[key]
+            else:
+                os.environ[key] = value
+
+
+def _write_job(
+    source: TimelineSource,
+    open_result: bool,
+    options: WriteOptions,
+    log_queue: mp.Queue,
+) -> None:
+    from logging.handlers import QueueHandler
+
+    for handler in list(log.handlers):
+        log.removeHandler(handler)
+    log.addHandler(QueueHandler(log_queue))
+
+    source.apply_environment()
+
+    log.info(_('Building "{name}"').format(name=source.name))
+    write_built(source.build(), open_result, options)
+
+
+def farm_work(host: str, port: int) -> None:
+    from janim.render.farm import run_worker
+
+    log.info('======')
+    run_worker(host, port)
+    log.info('======')
 
 
 def tool(tools: Iterable[str]) -> None:
@@ -34,6 +34,14 @@ class SharedOptions:
         bool,
         option(is_flag=True, help=_('Use external Typst executable for compiling Typst documents')),
     ]
+    build_cache: Annotated[
+        bool,
+        option(
+            '--build_cache',
+            is_flag=True,
+            help=_('Reuse the cached build result when the source code and assets are unchanged'),
+        ),
+    ]
 
 
 @dataclass
@@ -62,7 +70,9 @@ class FormatOptions:
         str,
         option(
             default='mp4',
-            type=click.Choice(['mp4', 'webm', 'mov', 'gif']),
+            type=click.Choice(
+                ['mp4', 'webm', 'mov', 'gif', 'png-seq', 'tiff-seq', 'npy-seq', 'rgba-seq']
+            ),
             help=_('Output video format (mp4 by default, webm/mov for transparent background)'),
         ),
     ]
@@ -73,6 +83,27 @@ class FormatOptions:
             help=_('Output audio format (valid only when outputting audio separately)'),
         ),
     ]
+    proxy: Annotated[
+        float | None,
+        option(
+            '--proxy',
+            metavar='SCALE',
+            type=click.FloatRange(min=0, max=1, min_open=True),
+            help=_(
+                'Write a draft at SCALE times the resolution, keeping the layout and '
+                'the anti-aliasing width in pixels unchanged'
+            ),
+        ),
+    ]
+    proxy_fps: Annotated[
+        int | None,
+        option(
+            '--proxy_fps',
+            metavar='FPS',
+            type=click.IntRange(min=1),
+            help=_('Frame rate of the draft written with --proxy'),
+        ),
+    ]
 
 
 @dataclass
@@ -173,3 +204,101 @@ class HardwareOptions:
             help=_('Use hardware acceleration for writing video'),
         ),
     ]
+    disable_frame_reuse: Annotated[
+        bool,
+        option(
+            '--disable_frame_reuse',
+            is_flag=True,
+            help=_('Always render every frame, even if it is identical to the previous one'),
+        ),
+    ]
+    segment_cache: Annotated[
+        bool,
+        option(
+            '--segment_cache',
+            is_flag=True,
+            help=_('Cache encoded segments and only re-render the segments that changed'),
+        ),
+    ]
+    gpu_yuv: Annotated[
+        bool,
+        option(
+            '--gpu_yuv',
+            is_flag=True,
+            help=_('Convert frames to YUV420 on the GPU before reading back (.mp4 only)'),
+        ),
+    ]
+    workers: Annotated[
+        int,
+        option(
+            '--workers',
+            default=1,
+            type=click.IntRange(min=1),
+            help=_(
+                'Number of worker processes that render contiguous chunks of frames in parallel'
+            ),
+        ),
+    ]
+    jobs: Annotated[
+        int,
+        option(
+            '--jobs',
+            default=1,
+            type=click.IntRange(min=1),
+            help=_(
+                'Number of timelines built and written at the same time, each in its own process'
+            ),
+        ),
+    ]
+    perf: Annotated[
+        bool,
+        option(
+            '--perf',
+            is_flag=True,
+            help=_('Print the time spent in each stage of writing video'),
+        ),
+    ]
+    perf_report: Annotated[
+        str | None,
+        option(
+            '--perf_report',
+            metavar='PATH',
+            help=_('Like --perf, and also save the statistics to a JSON file'),
+        ),
+    ]
+
+
+DEFAULT_FARM_HOST = '127.0.0.1'
+DEFAULT_FARM_PORT = 8765
+
+
+@dataclass
+class FarmOptions:
+    host: Annotated[
+        str,
+        option(
+            '--host',
+            default=DEFAULT_FARM_HOST,
+            show_default=True,
+            help=_('Address to listen on for render farm workers'),
+        ),
+    ]
+    port: Annotated[
+        int,
+        option(
+            '--port',
+            default=DEFAULT_FARM_PORT,
+            show_default=True,
+            help=_('Port to listen on for render farm workers'),
+        ),
+    ]
+    chunk_duration: Annotated[
+        float,
+        option(
+            '--chunk_duration',
+            default=5,
+            show_default=True,
+            type=click.FloatRange(min=0, min_open=True),
+            help=_('Duration in seconds of each chunk handed out to workers'),
+        ),
+    ]
@@ -3,6 +3,9 @@ import cloup
 from dataclass_click import dataclass_click
 
 from janim.cli.options import (
+    DEFAULT_FARM_HOST,
+    DEFAULT_FARM_PORT,
+    FarmOptions,
     FormatOptions,
     HardwareOptions,
     LiveOptions,
@@ -58,6 +61,36 @@ timeline_names_argument = click.argument(
 )
 
 
+def write_option_groups(f):
+    """
+    ``write`` 和 ``farm serve`` 共用的选项组
+    """
+    for decorator in reversed([
+        option_group(
+            _('Format Options'),
+            _('Options for specifying the format of the output files'),
+            dataclass_click(FormatOptions, kw_name='format_options'),
+        ),
+        option_group(
+            _('Output Options'),
+            _('Options for specifying the parts to be written'),
+            dataclass_click(OutputOptions, kw_name='output_options'),
+        ),
+        option_group(
+            _('Range Options'),
+            _('Options for specifying in/out point'),
+            dataclass_click(RangeOptions, kw_name='range_options'),
+        ),
+        option_group(
+            _('Hardware Options'),
+            _('Hardware options for writing the output files'),
+            dataclass_click(HardwareOptions, kw_name='hardware_options'),
+        ),
+    ]):
+        f = decorator(f)
+    return f
+
+
 @cli.command(
     'run',
     help=_(
@@ -100,30 +133,71 @@ def run(**kwargs):
     is_flag=True,
     help=_('Open the video after writing'),
 )  # fmt: skip
-@option_group(
-    _('Format Options'),
-    _('Options for specifying the format of the output files'),
-    dataclass_click(FormatOptions, kw_name='format_options'),
-)
-@option_group(
-    _('Output Options'),
-    _('Options for specifying the parts to be written'),
-    dataclass_click(OutputOptions, kw_name='output_options'),
+@write_option_groups
+def write(**kwargs):
+    from janim.cli.execute import write  # 目的是 lazy import 减轻 CLI help overhead
+
+    write(**kwargs)
+
+
+@cli.group(
+    'farm',
+    help=_('Distribute the rendering of a video across multiple machines'),
+    section=DEFAULT_SECTION,
 )
-@option_group(
-    _('Range Options'),
-    _('Options for specifying in/out point'),
-    dataclass_click(RangeOptions, kw_name='range_options'),
+@help_option
+def farm():
+    pass
+
+
+@farm.command(
+    'serve',
+    help=_(
+        'Build timeline classes and hand out frame ranges to workers, '
+        'then stitch the rendered chunks\n'
+        '\n'
+        "<FILE>      Python source file to load. Use '-' to read from stdin\n"
+        '\n'
+        '<TIMELINE>  Timeline class names to export'
+    ),
 )
+@help_option
+@file_argument
+@timeline_names_argument
+@dataclass_click(SharedOptions, kw_name='shared_options')
+@write_option_groups
 @option_group(
-    _('Hardware Options'),
-    _('Hardware options for writing the output files'),
-    dataclass_click(HardwareOptions, kw_name='hardware_options'),
+    _('Farm Options'),
+    _('Options for the render farm coordinator'),
+    dataclass_click(FarmOptions, kw_name='farm_options'),
 )
-def write(**kwargs):
+def farm_serve(**kwargs):
     from janim.cli.execute import write  # 目的是 lazy import 减轻 CLI help overhead
 
-    write(**kwargs)
+    write(open=False, **kwargs)
+
+
+@farm.command(
+    'work',
+    help=_('Connect to a render farm coordinator and render the chunks it hands out'),
+)
+@help_option
+@click.option(
+    '--host',
+    default=DEFAULT_FARM_HOST,
+    show_default=True,
+    help=_('Address of the coordinator'),
+)
+@click.option(
+    '--port',
+    default=DEFAULT_FARM_PORT,
+    show_default=True,
+    help=_('Port of the coordinator'),
+)
+def farm_work(host: str, port: int):
+    from janim.cli.execute import farm_work  # 目的是 lazy import 减轻 CLI help overhead
+
+    farm_work(host, port)
 
 
 @cli.command(
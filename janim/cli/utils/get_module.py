@@ -54,9 +54,12 @@ def get_module_from_stdin():
     return module
 
 
-def get_module_from_file(file_name: str):
+def get_module_from_file(file_name: str, module_name: str | None = None):
     """
     将给定的 ``file_name`` 读取为 module
+
+    ``module_name`` 默认由文件路径得到；在子进程中重新加载时，可以指定为与主进程相同的名称，
+    以便通过 ``pickle`` 在进程之间传递其中定义的类的实例
     """
     if not os.path.exists(file_name):
         log.error(_('"{file_name}" doesn\'t exist').format(file_name=file_name))
@@ -69,7 +72,8 @@ def get_module_from_file(file_name: str):
     # 兼容相对于源代码文件的导入
     sys.path.insert(0, os.path.abspath(os.path.dirname(file_name)))
 
-    module_name = file_name.replace(os.sep, '.').replace('.py', '')
+    if module_name is None:
+        module_name = file_name.replace(os.sep, '.').replace('.py', '')
     loader = importlib.machinery.SourceFileLoader(module_name, file_name)
     module = loader.load_module()
     return module
@@ -34,6 +34,9 @@ class _CmptMeta(type):
                             'the "{key}" method, but "{name}" does not'
                         ).format(key=key, name=name)
                     )
+        # 重新实现了 not_changed 的子类，可能会对比其它的数据，所以需要显式声明 tracks_changes
+        if 'not_changed' in attrdict and 'tracks_changes' not in attrdict:
+            attrdict['tracks_changes'] = False
         return super().__new__(cls, name, bases, attrdict)
 
 
@@ -76,6 +79,10 @@ class Component[ItemT](refresh.Refreshable, metaclass=_CmptMeta):
         at_item: Item
         key: str
 
+    # 为 True 时表示该组件在每次更改会影响 not_changed 结果的数据时，都会调用 mark_changed
+    # 所有组件都满足这一点的物件，在 Timeline.detect_changes_of_all 中只有被标记时才会检查变化
+    tracks_changes = False
+
     def __init__(self) -> None:
         super().__init__()
         self.bind: Component.BindInfo | None = None
@@ -98,6 +105,13 @@ class Component[ItemT](refresh.Refreshable, metaclass=_CmptMeta):
         if self.bind is not None:
             self.bind.at_item.broadcast_refresh_of_component(self, name, recurse_up, recurse_down)
 
+    def mark_changed(self) -> None:
+        """
+        将所在的物件标记为发生了变化，详见 :meth:`~.Item.mark_changed`
+        """
+        if self.bind is not None:
+            self.bind.at_item.mark_changed()
+
     def __copy__(self) -> Self:
         """
         手动实现 ``__copy__``，这样性能比 copy.copy 高
@@ -215,6 +229,9 @@ class CmptInfo[T]:
 
 
 class _CmptGroup(Component):
+    # not_changed 只是对比各个组件，而这些组件本身也在物件的 components 中
+    tracks_changes = True
+
     def __init__(self, cmpt_info_list: list[CmptInfo], **kwargs):
         super().__init__(**kwargs)
         self.cmpt_info_list = cmpt_info_list
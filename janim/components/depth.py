@@ -42,6 +42,8 @@ class Cmpt_Depth[ItemT](Component[ItemT]):
 
     _counter: defaultdict[float, int] = defaultdict(int)
 
+    tracks_changes = True
+
     def __init__(self, value: float, order: int | None = None):
         super().__init__()
 
@@ -60,6 +62,7 @@ class Cmpt_Depth[ItemT](Component[ItemT]):
     def become(self, other: Cmpt_Depth) -> Self:
         self._depth = other._depth
         self._order = other._order
+        self.mark_changed()
         return self
 
     def not_changed(self, other: Cmpt_Depth) -> bool:
@@ -88,6 +91,7 @@ class Cmpt_Depth[ItemT](Component[ItemT]):
             order = self._order
         self._depth = interpolate(self._depth, value, p.alpha)
         self._order = interpolate(self._order, order, p.alpha)
+        self.mark_changed()
 
     @register_updater(_set_updater)
     def set(self, value: float, order: int | None = None, *, root_only: bool = False) -> Self:
@@ -101,12 +105,14 @@ class Cmpt_Depth[ItemT](Component[ItemT]):
             for cmpt in self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only):
                 cmpt._depth = value
                 cmpt._order = order
+                cmpt.mark_changed()
                 order -= 1
             self._counter[value] = order
         else:
             for cmpt in self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only):
                 cmpt._depth = value
                 cmpt._order = order
+                cmpt.mark_changed()
 
         return self
 
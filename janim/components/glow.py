@@ -20,6 +20,8 @@ class Cmpt_Glow[ItemT](Cmpt_Rgba[ItemT]):
 
     DEFAULT_RGBA_ARRAY = Array.create([1, 1, 0, 0])
 
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._size: float = 0.2
@@ -32,6 +34,7 @@ class Cmpt_Glow[ItemT](Cmpt_Rgba[ItemT]):
     def become(self, other: Cmpt_Glow) -> Self:
         super().become(other)
         self._size = other._size
+        self.mark_changed()
         return self
 
     def not_changed(self, other: Cmpt_Glow) -> bool:
@@ -44,12 +47,14 @@ class Cmpt_Glow[ItemT](Cmpt_Rgba[ItemT]):
 
         if cmpt1._size != cmpt2._size or cmpt1._size != self._size:
             self._size = interpolate(cmpt1._size, cmpt2._size, alpha)
+            self.mark_changed()
 
     def _set_updater(self, p, color=None, alpha=None, size=None, *, root_only=False):
         super()._set_updater(p, color, alpha, root_only=root_only)
         if size is not None:
             for cmpt in self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only):
                 cmpt._size = interpolate(cmpt._size, size, p.alpha)
+                cmpt.mark_changed()
 
     @register_updater(_set_updater)
     def set(
@@ -78,6 +83,7 @@ class Cmpt_Glow[ItemT](Cmpt_Rgba[ItemT]):
         if size is not None:
             for cmpt in self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only):
                 cmpt._size = size
+                cmpt.mark_changed()
 
         return self
 
@@ -18,6 +18,8 @@ from janim.utils.signal import Signal
 class Cmpt_Mark[ItemT](Component[ItemT]):
     names: list[str] = []
 
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -31,6 +33,7 @@ class Cmpt_Mark[ItemT](Component[ItemT]):
     def become(self, other: Cmpt_Mark) -> Self:
         if not self._points.is_share(other._points.copy()):
             self._points = other._points.copy()
+            self.mark_changed()
         return self
 
     def not_changed(self, other: Cmpt_Mark) -> bool:
@@ -60,6 +63,7 @@ class Cmpt_Mark[ItemT](Component[ItemT]):
         if not cmpt1._points.is_share(cmpt2._points) or not cmpt1._points.is_share(self._points):
             if cmpt1._points.is_share(cmpt2._points):
                 self._points = cmpt1._points.copy()
+                self.mark_changed()
             else:
                 self.set_points(path_func(cmpt1.get_points(), cmpt2.get_points(), alpha))
 
@@ -88,6 +92,7 @@ class Cmpt_Mark[ItemT](Component[ItemT]):
         assert points.shape[1] == 3
 
         self._points.data = points
+        self.mark_changed()
         return self
 
     @register_updater(
@@ -57,6 +57,8 @@ class Cmpt_Points[ItemT](Component[ItemT]):
     resize_func = staticmethod(resize_and_repeatedly_extend)
     """"""
 
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -77,6 +79,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
     def become(self, other: Cmpt_Points) -> Self:
         if not self._points.is_share(other._points):
             self._points = other._points.copy()
+            self.mark_changed()
             Cmpt_Points.set.emit(self)
         return self
 
@@ -103,6 +106,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
         if not cmpt1._points.is_share(cmpt2._points) or not cmpt1._points.is_share(self._points):
             if cmpt1._points.is_share(cmpt2._points):
                 self._points = cmpt1._points.copy()
+                self.mark_changed()
             else:
                 self.set(path_func(cmpt1.get(), cmpt2.get(), alpha))
 
@@ -140,6 +144,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
         cnt_changed = len(points) != self._points.len()
 
         self._points.data = points
+        self.mark_changed()
 
         if cnt_changed:
             Cmpt_Points.set.emit(self, key='count')
@@ -414,11 +419,15 @@ class Cmpt_Points[ItemT](Component[ItemT]):
         about_point: Vect | None = None,
         about_edge: Vect | None = ORIGIN,
         root_only: bool = False,
+        pointwise: bool = False,
     ) -> Self:
         """
         将所有点作为单独的一个参数传入 ``func``，并将 ``func`` 返回的结果作为新的点坐标数据
 
         视 ``about_point`` 为原点，若其为 ``None``，则将物件在 ``about_edge`` 方向上的边界作为 ``about_point``
+
+        如果 ``func`` 对每个点的变换互不相关（例如矩阵变换、平移），可以传入 ``pointwise=True``，
+        这样会将自己以及后代物件的点拼接在一起，只调用一次 ``func``，在后代物件很多时更快
         """
         if about_point is None and about_edge is not None:
             if root_only:
@@ -426,7 +435,12 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             else:
                 about_point = self.box.get(about_edge)
 
-        for cmpt in self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only):
+        cmpts = list(self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only))
+        if pointwise and len(cmpts) > 1:
+            self._apply_points_fn_pointwise(cmpts, func, about_point)
+            return self
+
+        for cmpt in cmpts:
             if cmpt.has():
                 if about_point is None:
                     cmpt.set(func(cmpt.get()))
@@ -437,6 +451,42 @@ class Cmpt_Points[ItemT](Component[ItemT]):
 
         return self
 
+    @staticmethod
+    def _apply_points_fn_pointwise(
+        cmpts: list[Cmpt_Points], func: PointsFn, about_point: Vect | None
+    ) -> None:
+        """
+        :meth:`apply_points_fn` 在 ``pointwise=True`` 时的处理
+
+        先计算出所有物件的新坐标再依次设置，因此信号都是在计算完成后才发出的
+        """
+        has_points = [cmpt for cmpt in cmpts if cmpt.has()]
+        if has_points:
+            datas = [cmpt._points._data for cmpt in has_points]
+            points = np.concatenate(datas)
+            if about_point is None:
+                points = func(points)
+            else:
+                points = func(points - about_point) + about_point
+
+            points = np.asarray(points)
+            assert points.shape == (sum(len(data) for data in datas), 3)
+            points.setflags(write=False)
+
+            splits = np.cumsum([len(data) for data in datas[:-1]])
+            for cmpt, data, part in zip(has_points, datas, np.split(points, splits)):
+                if part.dtype != data.dtype:
+                    part = part.astype(data.dtype)
+                    part.setflags(write=False)
+                # 使用 Array 赋值，直接引用拆分得到的只读数组，而不再拷贝
+                cmpt._points.data = Array(_data=part)
+
+        for cmpt in cmpts:
+            if cmpt.has():
+                cmpt.mark_changed()
+                Cmpt_Points.set.emit(cmpt)
+            Cmpt_Points.apply_points_fn.emit(cmpt, func, about_point)
+
     def apply_point_fn(
         self,
         func: PointFn,
@@ -455,6 +505,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             about_point=about_point,
             about_edge=about_edge,
             root_only=root_only,
+            pointwise=True,
         )
         return self
 
@@ -491,6 +542,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             about_point=about_point,
             about_edge=about_edge,
             root_only=root_only,
+            pointwise=True,
         )
 
         return self
@@ -543,6 +595,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             about_point=about_point,
             about_edge=about_edge,
             root_only=root_only,
+            pointwise=True,
         )
         return self
 
@@ -601,6 +654,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             about_point=about_point,
             about_edge=about_edge,
             root_only=root_only,
+            pointwise=True,
         )
         return self
 
@@ -632,6 +686,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             about_point=about_point,
             about_edge=about_edge,
             root_only=root_only,
+            pointwise=True,
         )
         return self
 
@@ -857,7 +912,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             points += start
             return points
 
-        self.apply_points_fn(func, about_edge=None)
+        self.apply_points_fn(func, about_edge=None, pointwise=True)
         return self
 
     @property
@@ -988,6 +1043,7 @@ class Cmpt_Points[ItemT](Component[ItemT]):
             lambda points: points + vector,
             about_edge=None,
             root_only=root_only,
+            pointwise=True,
         )
         return self
 
@@ -23,6 +23,8 @@ class Cmpt_Radius[ItemT](Component[ItemT]):
     半径组件，被用于 :class:`DotCloud` 的点半径，以及 :class:`VItem` 的轮廓线粗细
     """
 
+    tracks_changes = True
+
     def __init__(self, default_radius: float, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.default_radius = default_radius
@@ -37,6 +39,7 @@ class Cmpt_Radius[ItemT](Component[ItemT]):
     def become(self, other: Cmpt_Radius) -> Self:
         if not self._radii.is_share(other._radii):
             self._radii = other._radii.copy()
+            self.mark_changed()
         return self
 
     def not_changed(self, other: Cmpt_Radius) -> bool:
@@ -62,6 +65,7 @@ class Cmpt_Radius[ItemT](Component[ItemT]):
         if not cmpt1._radii.is_share(cmpt2._radii) or not cmpt1._radii.is_share(self._radii):
             if cmpt1._radii.is_share(cmpt2._radii):
                 self._radii = cmpt1._radii.copy()
+                self.mark_changed()
             else:
                 self.set(interpolate(cmpt1.get(), cmpt2.get(), alpha), root_only=True)
 
@@ -101,10 +105,12 @@ class Cmpt_Radius[ItemT](Component[ItemT]):
         if isinstance(radius, numbers.Real):
             radius = [radius]
         self._radii.data = radius
+        self.mark_changed()
 
         if not root_only:
             for cmpt in self.walk_same_cmpt_of_descendants_without_mock():
                 cmpt._radii.data = self._radii.copy()
+                cmpt.mark_changed()
 
         return self
 
@@ -130,10 +136,12 @@ class Cmpt_Radius[ItemT](Component[ItemT]):
         缩放半径数据
         """
         self._radii.data = self._radii.data * factor
+        self.mark_changed()
 
         if not root_only:
             for cmpt in self.walk_same_cmpt_of_descendants_without_mock():
                 cmpt._radii.data = cmpt._radii.data * factor
+                cmpt.mark_changed()
 
         return self
 
@@ -19,6 +19,8 @@ class Cmpt_Rgba[ItemT](Component[ItemT]):
 
     DEFAULT_RGBA_ARRAY = Array.create([1, 1, 1, 0])
 
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._rgba = self.DEFAULT_RGBA_ARRAY.copy()
@@ -32,6 +34,7 @@ class Cmpt_Rgba[ItemT](Component[ItemT]):
     def become(self, other: Cmpt_Rgba) -> Self:
         if not self._rgba.is_share(other._rgba):
             self._rgba = other._rgba.copy()
+            self.mark_changed()
         return self
 
     def not_changed(self, other: Cmpt_Rgba) -> bool:
@@ -49,11 +52,13 @@ class Cmpt_Rgba[ItemT](Component[ItemT]):
         if not cmpt1._rgba.is_share(cmpt2._rgba) or not cmpt1._rgba.is_share(self._rgba):
             if cmpt1._rgba.is_share(cmpt2._rgba):
                 self._rgba = cmpt1._rgba.copy()
+                self.mark_changed()
             else:
                 self.set_rgba(interpolate(cmpt1.get(), cmpt2.get(), alpha))
 
     def set_rgba(self, rgba: Rgba) -> Self:
         self._rgba.data = rgba
+        self.mark_changed()
         return self
 
     @staticmethod
@@ -21,6 +21,8 @@ class Cmpt_Rgbas[ItemT](Component[ItemT]):
     颜色组件
     """
 
+    tracks_changes = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -34,6 +36,7 @@ class Cmpt_Rgbas[ItemT](Component[ItemT]):
     def become(self, other: Cmpt_Rgbas) -> Self:
         if not self._rgbas.is_share(other._rgbas):
             self._rgbas = other._rgbas.copy()
+            self.mark_changed()
         return self
 
     def not_changed(self, other: Cmpt_Rgbas) -> bool:
@@ -59,6 +62,7 @@ class Cmpt_Rgbas[ItemT](Component[ItemT]):
         if not cmpt1._rgbas.is_share(cmpt2._rgbas) or not cmpt1._rgbas.is_share(self._rgbas):
             if cmpt1._rgbas.is_share(cmpt2._rgbas):
                 self._rgbas = cmpt1._rgbas.copy()
+                self.mark_changed()
             else:
                 self.set_rgbas(interpolate(cmpt1.get(), cmpt2.get(), alpha))
 
@@ -135,6 +139,7 @@ class Cmpt_Rgbas[ItemT](Component[ItemT]):
         直接设置 rgba 数据
         """
         self._rgbas.data = rgbas
+        self.mark_changed()
         return self
 
     def _set_updater(self, p, color=None, alpha=None, *, root_only=False) -> None:
@@ -12,6 +12,8 @@ class Cmpt_Float[ItemT](Component[ItemT]):
     对 ``float`` 的 :class:`~.Component` 封装
     """
 
+    tracks_changes = True
+
     def __init__(self, default_value, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._value = default_value
@@ -21,6 +23,7 @@ class Cmpt_Float[ItemT](Component[ItemT]):
 
     def become(self, other: Cmpt_Float) -> Self:
         self._value = other._value
+        self.mark_changed()
 
     def not_changed(self, other: Cmpt_Float) -> Self:
         return self._value == other._value
@@ -36,9 +39,11 @@ class Cmpt_Float[ItemT](Component[ItemT]):
     ) -> None:
         if cmpt1._value != cmpt2._value or cmpt1._value != self._value:
             self._value = interpolate(cmpt1._value, cmpt2._value, alpha)
+            self.mark_changed()
 
     def set(self, value: float) -> Self:
         self._value = value
+        self.mark_changed()
         return self
 
     def get(self) -> float:
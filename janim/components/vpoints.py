@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import math
 import numbers
 from enum import Enum
@@ -22,6 +23,7 @@ from janim.utils.bezier import (
     integer_interpolate,
     inverse_interpolate,
     partial_quadratic_bezier_points,
+    partial_quadratic_bezier_points_batch,
     smooth_quadratic_path,
 )
 from janim.utils.data import AlignedData
@@ -67,12 +69,14 @@ class Cmpt_VPoints[ItemT](Cmpt_Points[ItemT], impl=True):
         about_point: Vect | None = None,
         about_edge: Vect | None = ORIGIN,
         root_only: bool = False,
+        pointwise: bool = False,
     ) -> Self:
         super().apply_points_fn(
             func,
             about_point=about_point,
             about_edge=about_edge,
             root_only=root_only,
+            pointwise=pointwise,
         )
         for cmpt in self.walk_same_cmpt_of_self_and_descendants_without_mock(root_only):
             if not isinstance(cmpt, Cmpt_VPoints) or not cmpt.make_smooth_after_applying_functions:
@@ -233,31 +237,69 @@ class Cmpt_VPoints[ItemT](Cmpt_Points[ItemT], impl=True):
 
     @staticmethod
     def insert_n_curves_to_point_list(n: int, points: VectArray) -> np.ndarray:
+        points = np.asarray(points)
         if len(points) == 1:
             return np.repeat(points, 2 * n + 1, 0)
 
-        bezier_tuples = list(Cmpt_VPoints.get_bezier_tuples_from_points(points))
+        n_curves = max(0, len(points) - 1) // 2
+        tuples = np.stack(
+            [
+                points[0 : 2 * n_curves : 2],
+                points[1 : 2 * n_curves : 2],
+                points[2 : 2 * n_curves + 1 : 2],
+            ],
+            axis=1,
+        )
         norms = [
             0 if np.isnan(tup[1][0]) else get_norm(tup[2] - tup[0])  #
-            for tup in bezier_tuples
+            for tup in tuples
         ]
         # Calculate insertions per curve (ipc)
-        ipc = np.zeros(len(bezier_tuples), dtype=int)
+        ipc = Cmpt_VPoints.distribute_insertions(n, norms)
+
+        # What was once a single quadratic curve will now be broken into n_inserts + 1
+        # smaller quadratic curves, all of which are computed at once
+        counts = ipc + 1
+        starts = np.cumsum(counts) - counts
+        a = np.empty(counts.sum())
+        b = np.empty(counts.sum())
+        for count in np.unique(counts):
+            indices = np.flatnonzero(counts == count)
+            alphas = np.linspace(0, 1, count + 1)
+            positions = starts[indices, None] + np.arange(count)
+            a[positions] = alphas[:-1]
+            b[positions] = alphas[1:]
+
+        parts = partial_quadratic_bezier_points_batch(np.repeat(tuples, counts, axis=0), a, b)
+        return np.vstack([points[:1], parts[:, 1:].reshape(-1, points.shape[1])])
+
+    @staticmethod
+    def distribute_insertions(n: int, norms: list[float]) -> np.ndarray:
+        """
+        将 ``n`` 次插入分配到长度为 ``norms`` 的各段曲线上，返回每段曲线分配到的插入次数
+
+        每次都分配给当前被分割后长度最长的曲线，长度相同时优先分配给靠前的曲线；
+        使用堆来找到最长的曲线，而不是每次都对所有曲线求 ``argmax``
+        """
+        ipc = [0] * len(norms)
+        if n <= 0 or not norms:
+            return np.array(ipc, dtype=int)
+
+        nan_indices = np.flatnonzero(np.isnan(np.array(norms, dtype=np.float64)))
+        if len(nan_indices) != 0:
+            # 与 np.argmax 相同，将 NaN 视为最大值，并且 NaN 在分割后仍然是 NaN
+            ipc[nan_indices[0]] = n
+            return np.array(ipc, dtype=int)
+
+        heap = [(-float(norm), i) for i, norm in enumerate(norms)]
+        heapq.heapify(heap)
         for _ in range(n):
-            index = np.argmax(norms)
+            neg_norm, index = heap[0]
             ipc[index] += 1
-            norms[index] *= ipc[index] / (ipc[index] + 1)
-
-        new_points = [points[0]]
-        for tup, n_inserts in zip(bezier_tuples, ipc):
-            # What was once a single quadratic curve defined
-            # by "tup" will now be broken into n_inserts + 1
-            # smaller quadratic curves
-            alphas = np.linspace(0, 1, n_inserts + 2)
-            for a1, a2 in zip(alphas, alphas[1:]):
-                new_points.extend(partial_quadratic_bezier_points(tup, a1, a2)[1:])
-
-        return np.vstack(new_points)
+            # 与逐次更新 norms[index] *= ipc[index] / (ipc[index] + 1) 得到的值完全相同
+            heapq.heapreplace(heap, (neg_norm * (ipc[index] / (ipc[index] + 1)), index))
+
+        return np.array(ipc, dtype=int)
 
     @mockable
     def insert_n_curves(self, n: int, root_only=False) -> Self:
@@ -105,3 +105,5 @@ class ShaderInjectionNotFoundError(JAnimException): ...
 class GuiCommandError(JAnimException): ...
 
 class MediaError(JAnimException): ...
+
+class RenderWorkerError(JAnimException): ...
@@ -256,6 +256,10 @@ class AnimViewer(QMainWindow):
         self.action_frame_skip.setShortcut('Ctrl+P')
         self.action_frame_skip.setAutoRepeat(False)
 
+        self.action_render_ahead = menu_view.addAction(_('Render ahead(&A)'))
+        self.action_render_ahead.setCheckable(True)
+        self.action_render_ahead.setAutoRepeat(False)
+
         menu_tools = menu_bar.addMenu(_('Tools(&T)'))
 
         self.action_select = menu_tools.addAction(_('Subitem selector(&I)'))
@@ -393,8 +397,12 @@ class AnimViewer(QMainWindow):
         )
         settings.beginGroup(self.code_file_path)
         frame_skip = settings.value('frame_skip', False, type=bool)
+        render_ahead = settings.value('render_ahead', True, type=bool)
         settings.endGroup()
 
+        self.action_render_ahead.setChecked(render_ahead)
+        self.glw.frame_cache.set_enabled(render_ahead)
+
         self.action_frame_skip.setChecked(frame_skip)
         if frame_skip:
             # 在渲染后才真正启用 frame_skip，避免启动时跳过太多帧
@@ -411,6 +419,7 @@ class AnimViewer(QMainWindow):
         )
         settings.beginGroup(self.code_file_path)
         settings.setValue('frame_skip', self.action_frame_skip.isChecked())
+        settings.setValue('render_ahead', self.action_render_ahead.isChecked())
         settings.endGroup()
 
     # endregion
@@ -451,6 +460,7 @@ class AnimViewer(QMainWindow):
         self.action_clear_font_cache.triggered.connect(self.on_clear_font_cache_triggered)
         self.action_stay_on_top.toggled.connect(self.on_stay_on_top_toggled)
         self.action_frame_skip.toggled.connect(self.on_frame_skip_toggled)
+        self.action_render_ahead.toggled.connect(self.on_render_ahead_toggled)
         self.action_select.triggered.connect(self.on_select_triggered)
         self.action_copy_time.triggered.connect(self.on_copy_time_triggered)
 
@@ -459,6 +469,7 @@ class AnimViewer(QMainWindow):
         self.timeline_view.space_pressed.connect(lambda: self.switch_play_state())
 
         self.play_timer.timeout.connect(self.on_play_timer_timeout)
+        self.play_timer.active_changed.connect(self.glw.frame_cache.set_paused)
         self.glw.rendered.connect(self.on_glw_rendered)
         self.glw.error_occurred.connect(self.on_error_occurred)
         self.name_edit.editingFinished.connect(self.on_name_edit_finished)
@@ -477,6 +488,11 @@ class AnimViewer(QMainWindow):
         self.play_timer.set_skip_enabled(flag)
         self.update_fps_label('-')
 
+    def on_render_ahead_toggled(self, flag: bool) -> None:
+        self.glw.frame_cache.set_enabled(flag)
+        if flag:
+            self.glw.frame_cache.set_playhead(self.timeline_view.progress())
+
     def on_rebuild_triggered(self) -> None:
         module = inspect.getmodule(self.built.timeline)
         new_timeline_name = self.name_edit.text().strip()
@@ -633,6 +649,7 @@ class AnimViewer(QMainWindow):
                 self.send_janim_cmd(Cmd.Lineno, line)
 
         self.glw.set_time(time)
+        self.glw.frame_cache.set_playhead(value)
         self.time_label.setText(f'{time:.1f}/{self.built.duration:.1f} s')
 
     def on_glw_rendered(self) -> None:
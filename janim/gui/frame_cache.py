@@ -0,0 +1,263 @@
+"""
+GUI 预览时预先渲染后续帧的缓存
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import moderngl as mgl
+from PySide6.QtCore import QObject, QTimer
+
+from janim.anims.timeline import BuiltTimeline
+from janim.render.framebuffer import qt_framebuffer_patch
+
+if TYPE_CHECKING:
+    from janim.gui.glwidget import GLWidget
+
+# 缓存占用显存的上限（字节）
+FRAME_CACHE_BUDGET = 512 * 1024 * 1024
+# 在播放位置之后预先渲染多少秒
+RENDER_AHEAD_SECONDS = 2.0
+
+
+class FrameCache(QObject):
+    """
+    按预览帧（即 ``progress``）缓存 :class:`~.GLWidget` 的画面，缓存的帧以纹理的形式保存在显存中
+
+    - 在 :class:`~.GLWidget` 中实时渲染的帧会被复制一份存入缓存，使得来回拖动进度条时可以直接显示
+    - 空闲时在播放位置之后预先渲染 :data:`RENDER_AHEAD_SECONDS` 秒的帧，
+      使得播放到画面复杂的片段时，可以显示已经渲染好的帧
+
+    缓存按照最近使用的顺序淘汰，总大小不超过 ``budget``；窗口尺寸改变或重新构建后清空缓存
+
+    由于 :class:`~.BuiltTimeline` 以及各个物件的渲染器都与 :class:`~.GLWidget` 的 GL 上下文绑定，
+    并且不是线程安全的，所以预先渲染是在 GUI 线程中，利用事件循环的空闲时间逐帧进行的，
+    每次只渲染一帧，不会阻塞界面的响应；播放时会暂停预先渲染（见 :meth:`set_paused`），
+    以免与播放争抢时间
+    """
+
+    def __init__(self, glw: GLWidget, budget: int = FRAME_CACHE_BUDGET):
+        super().__init__(glw)
+        self.glw = glw
+        self.budget = budget
+        self.enabled = True
+        self.paused = False
+
+        self.built: BuiltTimeline | None = None
+        self.frames: OrderedDict[int, mgl.Framebuffer] = OrderedDict()
+        self.size: tuple[int, int] | None = None
+        # 预先渲染时使用的 framebuffer，带有深度缓冲
+        self.target: mgl.Framebuffer | None = None
+
+        self.playhead = 0
+        # 预先渲染时出错的帧，不再重复尝试
+        self.failed: set[int] = set()
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setInterval(0)
+        self.idle_timer.timeout.connect(self.render_ahead)
+
+    @property
+    def frame_bytes(self) -> int:
+        if self.size is None:
+            return 0
+        w, h = self.size
+        return w * h * 4
+
+    @property
+    def capacity(self) -> int:
+        """
+        在 ``budget`` 的限制下最多可以缓存的帧数
+        """
+        frame_bytes = self.frame_bytes
+        return self.budget // frame_bytes if frame_bytes else 0
+
+    def set_built(self, built: BuiltTimeline) -> None:
+        self.clear()
+        self.failed.clear()
+        self.built = built
+
+    def set_enabled(self, enabled: bool) -> None:
+        self.enabled = enabled
+        if not enabled:
+            self.clear()
+
+    def set_paused(self, paused: bool) -> None:
+        """
+        暂停或继续预先渲染；播放时暂停，使得空闲时间留给播放，停止播放后再继续
+        """
+        self.paused = paused
+        if paused:
+            self.idle_timer.stop()
+        else:
+            self.set_playhead(self.playhead)
+
+    def clear(self) -> None:
+        self.idle_timer.stop()
+        if not self.frames and self.target is None:
+            return
+
+        self.glw.makeCurrent()
+        for fbo in self.frames.values():
+            self._release(fbo)
+        self.frames.clear()
+        if self.target is not None:
+            self._release(self.target)
+            self.target = None
+
+    def to_progress(self, global_t: float) -> int | None:
+        """
+        得到 ``global_t`` 对应的预览帧，不是恰好位于某一帧时返回 ``None``
+        """
+        assert self.built is not None
+        progress = global_t * self.built.cfg.preview_fps
+        rounded = round(progress)
+        if abs(progress - rounded) > 1e-6:
+            return None
+        return rounded
+
+    def usable(self) -> bool:
+        """
+        是否可以使用缓存
+
+        当 GUI 临时更改了渲染方式（例如注入了摄像机，或者正在统计渲染耗时）时，不使用缓存
+        """
+        return (
+            self.enabled
+            and self.built is not None
+            and self.glw.inject_camera is None
+            and self.glw.profiler is None
+        )
+
+    def show(self, global_t: float) -> bool:
+        """
+        如果 ``global_t`` 的画面已经缓存，则将其绘制到 :class:`~.GLWidget` 上，并返回 ``True``
+        """
+        progress = self.to_progress(global_t)
+        if progress is None or not self._check_size():
+            return False
+
+        fbo = self.frames.get(progress)
+        if fbo is None:
+            return False
+        self.frames.move_to_end(progress)
+
+        ctx = self.glw.ctx
+        with qt_framebuffer_patch(ctx):
+            ctx.copy_framebuffer(self._qt_framebuffer(), fbo)
+        return True
+
+    def store(self, global_t: float) -> None:
+        """
+        将 :class:`~.GLWidget` 中刚刚渲染的 ``global_t`` 的画面存入缓存
+        """
+        progress = self.to_progress(global_t)
+        if progress is None or not self._check_size() or progress in self.frames:
+            return
+
+        fbo = self._allocate(progress)
+        if fbo is None:
+            return
+        ctx = self.glw.ctx
+        with qt_framebuffer_patch(ctx):
+            ctx.copy_framebuffer(fbo, self._qt_framebuffer())
+
+    def set_playhead(self, progress: int) -> None:
+        """
+        设置播放位置，并在空闲时预先渲染其后的帧
+        """
+        self.playhead = progress
+        if not self.paused and self.usable() and self.glw.isVisible():
+            self.idle_timer.start()
+
+    def render_ahead(self) -> None:
+        """
+        渲染播放位置之后第一个没有缓存的帧，没有需要渲染的帧时停止
+        """
+        progress = self._next_missing()
+        if progress is None or self.paused or not self.usable() or not self.glw.isVisible():
+            self.idle_timer.stop()
+            return
+
+        assert self.built is not None
+        ctx = self.glw.ctx
+        global_t = progress / self.built.cfg.preview_fps
+
+        self.glw.makeCurrent()
+        fbo = self._allocate(progress)
+        if fbo is None:
+            self.idle_timer.stop()
+            return
+
+        if self.target is None:
+            with qt_framebuffer_patch(ctx):
+                self.target = ctx.framebuffer(
+                    color_attachments=ctx.texture(self.size, components=4),
+                    depth_attachment=ctx.depth_renderbuffer(self.size),
+                )
+
+        with qt_framebuffer_patch(ctx):
+            prev_fbo = ctx.fbo
+            self.target.use()
+            self.target.clear(*self.built.cfg.background_color.rgb, 1.0)
+            ret = self.built.render_all(ctx, global_t)
+            ctx.copy_framebuffer(fbo, self.target)
+            if prev_fbo is not None:
+                prev_fbo.use()
+
+        if not ret:
+            # 出错的帧交给 GLWidget 渲染，以便报告错误
+            self._release(self.frames.pop(progress))
+            self.failed.add(progress)
+            self.idle_timer.stop()
+
+    def _next_missing(self) -> int | None:
+        if self.built is None or not self._check_size():
+            return None
+
+        fps = self.built.cfg.preview_fps
+        # 为播放位置之前的帧保留一部分空间，以便来回拖动
+        count = min(round(RENDER_AHEAD_SECONDS * fps), self.capacity * 3 // 4)
+        last = min(self.playhead + count, round(self.built.duration * fps))
+
+        for progress in range(self.playhead + 1, last + 1):
+            if progress not in self.frames and progress not in self.failed:
+                return progress
+        return None
+
+    def _check_size(self) -> bool:
+        """
+        检查窗口尺寸是否改变，改变时清空缓存
+        """
+        ratio = self.glw.devicePixelRatio()
+        size = (int(self.glw.width() * ratio), int(self.glw.height() * ratio))
+        if size != self.size:
+            self.clear()
+            self.size = size
+        return self.capacity > 0
+
+    def _allocate(self, progress: int) -> mgl.Framebuffer | None:
+        while len(self.frames) >= self.capacity:
+            if not self.frames:
+                return None
+            _, fbo = self.frames.popitem(last=False)
+            self._release(fbo)
+
+        ctx = self.glw.ctx
+        with qt_framebuffer_patch(ctx):
+            fbo = ctx.framebuffer(color_attachments=ctx.texture(self.size, components=4))
+        self.frames[progress] = fbo
+        return fbo
+
+    def _qt_framebuffer(self) -> mgl.Framebuffer:
+        return self.glw.ctx.detect_framebuffer(self.glw.defaultFramebufferObject())
+
+    @staticmethod
+    def _release(fbo: mgl.Framebuffer) -> None:
+        for attachment in fbo.color_attachments:
+            attachment.release()
+        if fbo.depth_attachment is not None:
+            fbo.depth_attachment.release()
+        fbo.release()
@@ -8,6 +8,7 @@ from PySide6.QtWidgets import QWidget
 from janim.anims.timeline import BuiltTimeline
 from janim.camera.camera import Camera
 from janim.camera.camera_info import CameraInfo
+from janim.gui.frame_cache import FrameCache
 from janim.logger import log
 from janim.render.base import create_context
 from janim.render.framebuffer import register_qt_glwidget
@@ -26,12 +27,15 @@ class GLWidget(QOpenGLWidget):
     def __init__(self, parent: QWidget | None = None) -> None:
         super().__init__(parent)
         self.needs_update_clear_color = False
+        self.global_t: float = 0
         self.inject_camera: Camera | None = None
 
         self.profiler: RenderProfiler | None = None
+        self.frame_cache = FrameCache(self)
 
     def set_built(self, built: BuiltTimeline) -> None:
         self.built = built
+        self.frame_cache.set_built(built)
         self.update_clear_color()
         self.update()
 
@@ -69,7 +73,8 @@ class GLWidget(QOpenGLWidget):
         将窗口坐标转换为三维空间中的坐标
         """
         if info is None:
-            info = self.built.current_camera_info()
+            # 画面可能来自 frame_cache，此时上次 render_all 的时刻不一定是当前显示的时刻
+            info = self.built.current_camera_info(as_time=self.global_t)
 
         glx, gly = self.map_to_gl2d(position)
 
@@ -85,7 +90,7 @@ class GLWidget(QOpenGLWidget):
         将三维空间中的一列坐标转换为窗口中的一列坐标
         """
         if info is None:
-            info = self.built.current_camera_info()
+            info = self.built.current_camera_info(as_time=self.global_t)
 
         result = [self.map_from_gl2d(x, y) for x, y in info.map_points(points)]
         return result
@@ -115,9 +120,17 @@ class GLWidget(QOpenGLWidget):
             self.needs_update_clear_color = False
         self.qfuncs.glClear(0x00004000 | 0x00000100)  # GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT
 
+        usable = self.frame_cache.usable()
+        if usable and self.frame_cache.show(self.global_t):
+            self.rendered.emit()
+            return
+
         with self.profiler.record_frame() if self.profiler is not None else nullcontext():
             ret = self.built.render_all(self.ctx, self.global_t, camera=self.inject_camera)
 
+        if ret and usable:
+            self.frame_cache.store(self.global_t)
+
         self.rendered.emit()
         if not ret:
             self.error_occurred.emit()
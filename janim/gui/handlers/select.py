@@ -257,9 +257,7 @@ def select_next_item_at_position(
 
     found: list[ItemBox] = []
 
-    for item, appr in viewer.built.visible_item_segments.get(attrs.global_t):
-        if not appr.is_visible_at(attrs.global_t):
-            continue
+    for item, appr in viewer.built.visible_item_intervals.get(attrs.global_t):
         item_box = ItemBox(item, attrs)
         if not item_box.contains(glx, gly):
             continue
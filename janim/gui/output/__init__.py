@@ -16,7 +16,7 @@ from janim.gui.output.export_dialog import ExportDialog
 from janim.locale import get_translator
 from janim.logger import log
 from janim.render.writer import AudioWriter, VideoWriter, merge_video_and_audio
-from janim.utils.config import cli_config
+from janim.utils.config import cli_config, override_cli_config
 from janim.utils.file_ops import open_file
 
 if TYPE_CHECKING:
@@ -135,8 +135,16 @@ def on_export_clicked(self: AnimViewer) -> None:
     self.hide()
     QApplication.processEvents()
     ret = False
+    proxy_scale = dialog.proxy_scale()
+    if proxy_scale is not None:
+        size_context = override_cli_config(**self.built.cfg.proxy_size(proxy_scale))
+    elif dialog.has_size_set():
+        size_context = change_export_size(dialog.pixel_size())
+    else:
+        size_context = nullcontext()
+
     try:
-        with change_export_size(dialog.pixel_size()) if dialog.has_size_set() else nullcontext():
+        with size_context:
             built = self.built.timeline.__class__().build()
 
             if using_inout_point:
@@ -144,10 +152,17 @@ def on_export_clicked(self: AnimViewer) -> None:
             else:
                 inout_args = ()
 
-            if video_with_audio:
-                video_writer = VideoWriter(built, ctx=self.glw.ctx)
-                video_writer.write_all(file_path, *inout_args, hwaccel=hwaccel, _keep_temp=True)
-
+            video_writer = VideoWriter(built, ctx=self.glw.ctx)
+            video_writer.write_all(
+                file_path,
+                *inout_args,
+                hwaccel=hwaccel,
+                with_audio=video_with_audio,
+                _keep_temp=video_with_audio,
+            )
+
+            # 无法在输出视频时一并写入音频时，另外输出音频再合并
+            if video_with_audio and not video_writer.audio_embedded:
                 audio_file_path = os.path.splitext(file_path)[0] + '.mp3'
 
                 audio_writer = AudioWriter(built)
@@ -158,9 +173,6 @@ def on_export_clicked(self: AnimViewer) -> None:
                     audio_writer.temp_file_path,
                     video_writer.final_file_path,
                 )
-            else:
-                video_writer = VideoWriter(built, ctx=self.glw.ctx)
-                video_writer.write_all(file_path, *inout_args, hwaccel=hwaccel)
 
     except Exception as e:
         if not isinstance(e, ExitException):
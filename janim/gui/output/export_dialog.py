@@ -35,6 +35,13 @@ class ExportDialog(QDialog):
         self.ui.label_path.setText(_('Export Path:'))
         self.ui.label_fps.setText(_('FPS:'))
         self.ui.label_size.setText(_('Size:'))
+        self.ui.ckb_proxy.setText(_('Draft'))
+        self.ui.ckb_proxy.setToolTip(
+            _(
+                'Keep the anti-aliasing width in pixels when scaling down, '
+                'so that low resolution drafts stay smooth'
+            )
+        )
 
         self.ui.label_range.setText(_('Range:'))
         self.ui.rbtn_full.setText(_('Full'))
@@ -95,6 +102,7 @@ class ExportDialog(QDialog):
         output_format = settings.value('output_format', '.mp4')
         fps = settings.value('fps', self.built.cfg.fps, type=int)
         scale = settings.value('scale', 1.0, type=float)
+        proxy = settings.value('proxy', False, type=bool)
         using_inout_point = settings.value('using_inout_point', False, type=bool)
         hwaccel = settings.value('hwaccel', False, type=bool)
         open_after_export = settings.value('open', False, type=bool)
@@ -114,6 +122,7 @@ class ExportDialog(QDialog):
         self.ui.edit_path.setText(file_path)
         self.ui.spb_fps.setValue(fps)
         self.load_size_combobox(self.ui.cbb_size, scale)
+        self.ui.ckb_proxy.setChecked(proxy)
 
         if using_inout_point and self.ui.rbtn_inout.isEnabled():
             self.ui.rbtn_inout.setChecked(True)
@@ -133,6 +142,7 @@ class ExportDialog(QDialog):
         settings.setValue('output_format', path.suffix)
         settings.setValue('fps', self.ui.spb_fps.value())
         settings.setValue('scale', self.ui.cbb_size.currentData()[0])
+        settings.setValue('proxy', self.ui.ckb_proxy.isChecked())
         settings.setValue('using_inout_point', self.ui.rbtn_inout.isChecked())
         settings.setValue('hwaccel', self.ui.ckb_hwaccel.isChecked())
         settings.setValue('open', self.ui.ckb_open.isChecked())
@@ -152,6 +162,15 @@ class ExportDialog(QDialog):
         _, w, h = self.ui.cbb_size.currentData()
         return w, h
 
+    def proxy_scale(self) -> float | None:
+        """
+        勾选了草稿并且缩小了尺寸时，返回缩放比例，另见 :meth:`~.ConfigGetter.proxy_size`
+        """
+        factor, _, _ = self.ui.cbb_size.currentData()
+        if not self.ui.ckb_proxy.isChecked() or factor >= 1:
+            return None
+        return factor
+
     def using_inout_point(self) -> bool:
         return self.ui.rbtn_inout.isChecked()
 
@@ -99,6 +99,11 @@ class Ui_ExportDialog(object):
 
         self.hlayou_size.addWidget(self.cbb_size)
 
+        self.ckb_proxy = QCheckBox(ExportDialog)
+        self.ckb_proxy.setObjectName(u"ckb_proxy")
+
+        self.hlayou_size.addWidget(self.ckb_proxy)
+
         self.spacer_size = QSpacerItem(40, 20, QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Minimum)
 
         self.hlayou_size.addItem(self.spacer_size)
@@ -208,6 +213,7 @@ class Ui_ExportDialog(object):
         self.btn_browse.setText(QCoreApplication.translate("ExportDialog", u"...", None))
         self.label_fps.setText(QCoreApplication.translate("ExportDialog", u"_", None))
         self.label_size.setText(QCoreApplication.translate("ExportDialog", u"_", None))
+        self.ckb_proxy.setText(QCoreApplication.translate("ExportDialog", u"_", None))
         self.label_range.setText(QCoreApplication.translate("ExportDialog", u"_", None))
         self.rbtn_full.setText(QCoreApplication.translate("ExportDialog", u"_", None))
         self.rbtn_inout.setText(QCoreApplication.translate("ExportDialog", u"_", None))
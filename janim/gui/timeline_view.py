@@ -381,10 +381,10 @@ class TimelineView(QWidget):
                         TimeRange(t1, t2),
                         brush=get_color(anim),
                     )
-                    for (t1, t2), anims in zip(
-                        it.pairwise([*stack.times, built.duration + 1]), stack.stacks
+                    for idx, (t1, t2) in enumerate(
+                        it.pairwise([*stack.times, built.duration + 1])
                     )
-                    for anim in anims
+                    for anim in stack.get_by_index(idx)
                 ],
                 collapse=False,
                 header=False,
@@ -4,6 +4,9 @@ from PySide6.QtCore import QObject, Qt, QTimer, Signal
 
 
 class PreciseTimer(QTimer):
+    # 开始或停止计时时触发，参数为是否正在计时
+    active_changed = Signal(bool)
+
     def __init__(self, duration: float | None = None, parent: QObject | None = None):
         super().__init__(parent)
 
@@ -26,6 +29,18 @@ class PreciseTimer(QTimer):
         self.skip_count = 0
         return count
 
+    def start(self, *args) -> None:
+        active = self.isActive()
+        super().start(*args)
+        if not active:
+            self.active_changed.emit(True)
+
+    def stop(self) -> None:
+        active = self.isActive()
+        super().stop()
+        if active:
+            self.active_changed.emit(False)
+
     def start_precise_timer(self, *, _caused_by_too_slow: bool = False) -> None:
         assert self.duration is not None
         self.scheduled = 0
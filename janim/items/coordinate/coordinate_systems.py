@@ -339,14 +339,7 @@ class Axes(CoordinateSystem, MarkedItem, NamedGroupMixin, metaclass=_ItemMeta_AB
         )
 
         if bind:
-            Cmpt_Points.apply_points_fn.connect(
-                self.points,
-                lambda func, about_point: graph.points.apply_points_fn(
-                    func,
-                    about_point=about_point,
-                    about_edge=None,
-                ),
-            )
+            Cmpt_Points.apply_points_fn.connect(self.points, graph._on_axes_transformed)
 
         return graph
 
@@ -379,14 +372,7 @@ class Axes(CoordinateSystem, MarkedItem, NamedGroupMixin, metaclass=_ItemMeta_AB
         )
 
         if bind:
-            Cmpt_Points.apply_points_fn.connect(
-                self.points,
-                lambda func, about_point: graph.points.apply_points_fn(
-                    func,
-                    about_point=about_point,
-                    about_edge=None,
-                ),
-            )
+            Cmpt_Points.apply_points_fn.connect(self.points, graph._on_axes_transformed)
 
         return graph
 
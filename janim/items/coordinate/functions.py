@@ -51,6 +51,10 @@ class ParametricCurve(VItem):
     def get_point_from_function(self, t: float) -> np.ndarray:
         return np.array(self.t_func(t))
 
+    def _on_axes_transformed(self, func, about_point) -> None:
+        # 另见 CoordinateSystem.get_graph 的 bind 参数
+        self.points.apply_points_fn(func, about_point=about_point, about_edge=None)
+
 
 class FunctionGraph(ParametricCurve):
     def __init__(
@@ -639,6 +639,21 @@ class Item(Relation['Item'], metaclass=_ItemMeta):
                 return False
         return True
 
+    def mark_changed(self) -> None:
+        """
+        将物件标记为发生了变化，
+        使得当前时间轴在下次 :meth:`~.Timeline.detect_changes_of_all` 时检查该物件
+
+        子物件列表以及 ``tracks_changes=True`` 的组件发生变化时会自动调用；
+        其它组件（例如 :class:`~.Cmpt_Data`）所在的物件在每次 ``forward`` 时都会被检查，
+        所以一般不需要手动调用
+        """
+        from janim.anims.timeline import Timeline
+
+        timeline = Timeline.get_context(raise_exc=False)
+        if timeline is not None:
+            timeline.mark_changed(self)
+
     def current(self, *, as_time: float | None = None, root_only=False) -> Self:
         """
         由当前时间点获得当前物件（考虑动画作用后的结果）
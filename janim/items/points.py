@@ -126,7 +126,10 @@ class DotCloud(Points):
 
     def init_connect(self) -> None:
         super().init_connect()
-        Cmpt_Points.reverse.connect(self.points, lambda: self.radius.reverse())
+        Cmpt_Points.reverse.connect(self.points, self._reverse_radius_slot)
+
+    def _reverse_radius_slot(self) -> None:
+        self.radius.reverse()
 
     def apply_style(
         self,
@@ -93,6 +93,12 @@ class Relation[GRelT: 'Relation'](refresh.Refreshable):
         信号，在 ``self.children`` 改变时触发
         """
         Relation._children_changed.emit(self)
+        self.mark_changed()
+
+    def mark_changed(self) -> None:
+        """
+        标记该对象的数据发生了变化，由子类实现，另见 :meth:`~.Item.mark_changed`
+        """
 
     def add(
         self,
@@ -83,6 +83,7 @@ class TypstDoc(SVGItem):
                     for suborder, sub in enumerate(item_to_replace.walk_self_and_descendants()):
                         sub.depth._depth = placeholder.depth._depth
                         sub.depth._order = placeholder.depth._order + 1e-4 * suborder
+                        sub.depth.mark_changed()
 
                     self.groups[label] = [item_to_replace]
 
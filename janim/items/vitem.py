@@ -16,10 +16,16 @@ from janim.items.group import Group
 from janim.items.item import Item, mockable
 from janim.items.points import Points
 from janim.locale import get_translator
+from janim.render.renderer.r_instanced_vitem import InstancedVItemRenderer
 from janim.render.renderer.r_vitem import VItemRenderer
 from janim.typing import Alpha, AlphaArray, ColorArray, JAnimColor, Vect
 from janim.utils.bezier import bezier, inverse_interpolate, partial_quadratic_bezier_points
 from janim.utils.data import AlignedData
+from janim.utils.iterables import (
+    resize_preserving_order,
+    resize_preserving_order_indice_groups,
+    resize_with_interpolation,
+)
 from janim.utils.simple_functions import clip
 from janim.utils.space_ops import get_norm
 
@@ -51,12 +57,11 @@ class VItem(Points):
 
     def init_connect(self) -> None:
         super().init_connect()
+        Cmpt_Points.reverse.connect(self.points, self._reverse_styles_slot)
 
-        def reverse():
-            for cmpt in (self.radius, self.stroke, self.fill):
-                cmpt.reverse()
-
-        Cmpt_Points.reverse.connect(self.points, reverse)
+    def _reverse_styles_slot(self) -> None:
+        for cmpt in (self.radius, self.stroke, self.fill):
+            cmpt.reverse()
 
     def apply_style(
         self,
@@ -520,3 +525,93 @@ class DashedVItemByRatio(VItem, Group[VItem]):
         return DashedVItem.get_dashed_list_by_starts_and_ends(
             points, dash_starts, dash_ends, equal_lengths
         )
+
+
+class InstancedVItem(Points):
+    """
+    在多个位置绘制同一个 :class:`~.VItem` 形状的物件，
+    例如排列成网格的大量 :class:`~.Dot` 或 :class:`~.Square`
+
+    - ``points`` 中的每个点是一个实例的位置，形状的中心会被放在这个位置上
+    - ``color`` 是每个实例的颜色，会与形状本身的描边和填充颜色相乘；
+      默认为白色，也就是保持形状原本的颜色
+
+    与分别创建相同的物件相比，形状的数据只需写入一次，每个实例只需额外的位置和颜色
+
+    形状在创建时被复制，之后不会再变化；对该物件的变换只作用于各个实例的位置，而不会旋转或缩放形状本身
+
+    .. code-block:: python
+
+        dots = InstancedVItem(
+            Dot(radius=0.05),
+            *[[x, y, 0] for x in range(-6, 7) for y in range(-3, 4)],
+            color=[RED, GREEN, BLUE],
+        )
+    """
+
+    color = CmptInfo(Cmpt_Rgbas[Self])
+
+    renderer_cls = InstancedVItemRenderer
+
+    def __init__(self, shape: VItem, *points: Vect, **kwargs):
+        self.shape = shape.copy(root_only=True)
+        self.shape.points.shift(-self.shape.points.self_box.center)
+
+        super().__init__(*points, **kwargs)
+
+        self.points.resize_func = resize_preserving_order
+
+    def apply_style(
+        self,
+        color: JAnimColor | ColorArray | None = None,
+        alpha: Alpha | AlphaArray | None = None,
+        **kwargs,
+    ) -> Self:
+        self.color.set(color, alpha, root_only=True)
+        return super().apply_style(**kwargs)
+
+    def to_items(self) -> Group[VItem]:
+        """
+        将每个实例转换为单独的 :class:`~.VItem`
+        """
+        shape = self.shape
+        stroke = shape.stroke.get()
+        fill = shape.fill.get()
+
+        colors = resize_with_interpolation(self.color.get(), self.points.count())
+        items: list[VItem] = []
+        for point, color in zip(self.points.get(), colors):
+            item = shape.copy(root_only=True)
+            item.points.shift(point)
+            item.stroke.set_rgbas(stroke * color)
+            item.fill.set_rgbas(fill * color)
+            item._fix_in_frame = self._fix_in_frame
+            item._depth_test = self._depth_test
+            items.append(item)
+
+        return Group.from_iterable(items)
+
+    @classmethod
+    def align_for_interpolate(
+        cls,
+        item1: InstancedVItem,
+        item2: InstancedVItem,
+    ) -> AlignedData[InstancedVItem]:
+        len1 = len(item1.points.get())
+        len2 = len(item2.points.get())
+
+        aligned = super().align_for_interpolate(item1, item2)
+
+        for data in (aligned.data1, aligned.data2):
+            data.color.resize(data.points.count())
+
+        if len1 != len2:
+            indice_groups = resize_preserving_order_indice_groups(min(len1, len2), max(len1, len2))
+
+            cmpt_to_fade = aligned.data1.color if len1 < len2 else aligned.data2.color
+            rgbas = cmpt_to_fade.get().copy()
+            for group in indice_groups:
+                rgbas[group, 3] = apart_alpha(rgbas[group[0], 3], len(group))
+            cmpt_to_fade.set_rgbas(rgbas)
+
+        return aligned
@@ -4,7 +4,7 @@ from collections import defaultdict
 from contextlib import contextmanager
 from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Hashable
 
 import moderngl as mgl
 import numpy as np
@@ -45,6 +45,14 @@ class Renderer:
 
     data_ctx: ContextVar[RenderData] = ContextVar('Renderer.data_ctx')
 
+    # 渲染结果是否只取决于物件数据，而与当前时刻无关；
+    # 对于例如视频这种会根据 Animation.global_t_ctx 渲染不同内容的，需要置为 False，
+    # 另见 BuiltTimeline.static_fingerprint
+    time_invariant = True
+
+    # 可以将连续的多个物件合并为一次绘制的渲染器，另见 BatchRenderer
+    batch_cls: type[BatchRenderer] | None = None
+
     def render(self, item) -> None: ...
 
     @staticmethod
@@ -118,6 +126,34 @@ class Renderer:
             yield
 
 
+class BatchRenderer:
+    """将连续的多个物件合并为一次绘制的渲染器的基类
+
+    通过 :attr:`Renderer.batch_cls` 指定；在 :class:`~.RenderCollection` 中，
+    排序后相邻的、``renderer_cls.batch_cls`` 相同并且 :meth:`get_key` 相同的物件会被合并，
+    交给 :meth:`render` 一并绘制，
+    其余的物件仍然由各自的 :class:`Renderer` 逐个绘制
+
+    合并绘制的结果（包括混合的先后顺序）应当与逐个绘制相同
+    """
+
+    @staticmethod
+    def is_supported(ctx: mgl.Context) -> bool:
+        """
+        在 ``ctx`` 中是否可以合并绘制
+        """
+        return True
+
+    @staticmethod
+    def get_key(item) -> Hashable | None:
+        """
+        返回 ``None`` 表示该物件不能合并绘制；只有返回值相同的物件才能合并在一起
+        """
+        return None
+
+    def render(self, items: list) -> None: ...
+
+
 @dataclass(kw_only=True)
 class RenderData:
     """在渲染过程中需要配置的属性
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 import itertools as it
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Iterable
+from typing import TYPE_CHECKING, Hashable, Iterable
 
+import moderngl as mgl
 import numpy as np
 
 from janim.items.item import Item
-from janim.render.base import Renderer
+from janim.render.base import BatchRenderer, Renderer
 from janim.utils.space_ops import normalize
 
 if TYPE_CHECKING:
     from janim.anims.timeline import ItemWithRenderFunc, RenderGroupReturn, Timeline
 
+# 连续多少个可以合并的物件才进行合并绘制，数量太少时逐个绘制，以利用各个渲染器对数据的缓存
+MIN_BATCH_SIZE = 4
+
 
 @dataclass
 class RenderCollection:
@@ -94,27 +99,115 @@ class RenderCollection:
                 if not is_delegated
             ]
 
-        renders = it.chain(appr_renders, *extra_renders_list)
+        renders = list(it.chain(appr_renders, *extra_renders_list))
+
+        # 排序后进行渲染，其中 appr_renders 的部分可以合并绘制，另见 _render
+        indices = self.sort_indices(renders)
+        self._render(
+            [renders[i] for i in indices],
+            (indices < len(appr_renders)).tolist(),
+        )
+
+    @staticmethod
+    def sort_indices(renders: list[ItemWithRenderFunc]) -> np.ndarray:
+        """
+        得到 ``renders`` 按照绘制顺序排列后的下标
 
-        # 用于按照预期的顺序排序的 key 回调
+        - 先按照到摄像机的距离从远到近排列，没有 ``distance_sort_reference_point`` 的视为无穷远
+        - 距离相同时，按照深度从大到小排列，另见 :class:`~.Cmpt_Depth`
+        - 都相同时保持原有的顺序
+        """
         render_data = Renderer.data_ctx.get()
         info = render_data.camera_info
 
         camera_vec = normalize(-info.camera_axis)
         camera_loc = info.camera_location
 
-        def key(x: ItemWithRenderFunc):
-            ref = x[0].distance_sort_reference_point
-            if ref is None:
-                distance = np.inf
-            else:
-                distance = np.dot(camera_vec, ref - camera_loc)
-            return (distance, x[0].depth)
+        ref_indices: list[int] = []
+        refs: list[np.ndarray] = []
+        for i, (data, _) in enumerate(renders):
+            ref = data.distance_sort_reference_point
+            if ref is not None:
+                ref_indices.append(i)
+                refs.append(ref)
+
+        # 每一列依次是距离、depth 以及 order
+        keys = np.empty((len(renders), 3))
+        keys[:, 0] = np.inf
+        if refs:
+            keys[ref_indices, 0] = (np.array(refs) - camera_loc) @ camera_vec
+        if renders:
+            keys[:, 1:] = [data.depth.get_raw() for data, _ in renders]
+
+        # 取负后升序排列，即降序排列；
+        # 并且 np.lexsort 是稳定的，与 sorted(..., reverse=True) 的结果一致
+        return np.lexsort(-keys.T[::-1])
+
+    @staticmethod
+    def _get_batch_renderers(
+        ctx: mgl.Context,
+    ) -> defaultdict[type[BatchRenderer], list[BatchRenderer]]:
+        """
+        得到 ``ctx`` 中各种 :class:`~.BatchRenderer` 的实例
 
-        # 排序后进行渲染
-        self._render(sorted(renders, key=key, reverse=True))
+        同一帧中有多批物件时依次使用其中的各个实例，
+        使得在画面没有变化时，每个实例绘制的都与上一帧相同，可以复用写入的数据
+
+        这些实例存放在 ``ctx.extra`` 中，而不是以 ``ctx`` 为键的全局字典中，
+        使得 ``ctx`` 不再被使用时（例如输出视频结束后），其中的 buffer 等可以随 ``ctx`` 一并被回收
+        """
+        if ctx.extra is None:
+            ctx.extra = {}
+        pools = ctx.extra.get('janim_batch_renderers', None)
+        if pools is None:
+            pools = ctx.extra['janim_batch_renderers'] = defaultdict(list)
+        return pools
 
     @staticmethod
-    def _render(renders: Iterable[ItemWithRenderFunc]) -> None:
-        for data, render in renders:
-            render(data)
+    def _render(
+        renders: list[ItemWithRenderFunc], batchable: list[bool] | None = None
+    ) -> None:
+        """
+        依次渲染 ``renders``
+
+        ``batchable`` 中为 ``True`` 的物件会由对应的渲染器 :attr:`~.Renderer.batch_cls`
+        尝试合并绘制，
+        即连续的、:meth:`~.BatchRenderer.get_key` 相同的物件达到 :data:`MIN_BATCH_SIZE` 个时一并绘制
+        """
+        if batchable is None:
+            for data, render in renders:
+                render(data)
+            return
+
+        ctx = Renderer.data_ctx.get().ctx
+        pools = RenderCollection._get_batch_renderers(ctx)
+        used: defaultdict[type[BatchRenderer], int] = defaultdict(int)
+
+        def get_batch(i: int) -> tuple[type[BatchRenderer] | None, Hashable | None]:
+            if not batchable[i]:
+                return None, None
+            batch_cls = renders[i][0].renderer_cls.batch_cls
+            if batch_cls is None or not batch_cls.is_supported(ctx):
+                return None, None
+            return batch_cls, batch_cls.get_key(renders[i][0])
+
+        i = 0
+        while i < len(renders):
+            batch_cls, key = get_batch(i)
+            j = i + 1
+            if key is not None:
+                while j < len(renders) and get_batch(j) == (batch_cls, key):
+                    j += 1
+
+            if j - i < MIN_BATCH_SIZE:
+                for data, render in renders[i:j]:
+                    render(data)
+            else:
+                pool = pools[batch_cls]
+                idx = used[batch_cls]
+                used[batch_cls] += 1
+                if idx == len(pool):
+                    pool.append(batch_cls())
+                pool[idx].render([data for data, _ in renders[i:j]])
+
+            i = j
@@ -1,26 +1,138 @@
+import ctypes
 import os
+import shutil
 import subprocess as sp
 import sys
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
+from dataclasses import dataclass
+from fractions import Fraction
 from functools import lru_cache
 from glob import glob
 from queue import Queue
-from threading import Thread
+from threading import BoundedSemaphore, Condition, Lock, Thread
+from typing import Iterable
 
 import numpy as np
 
 from janim.exception import EXITCODE_FFMPEG_NOT_FOUND, ExitException
 from janim.locale import get_translator
 from janim.logger import log
+from janim.render.perf import ExportPerf
 
 _ = get_translator('janim.render.encoder')
 
+FRAME_RING_SIZE = 8
+
+
+class FrameRing:
+    """
+    预分配的一组帧缓冲，循环使用
+
+    写入方通过 :meth:`acquire` 取得空闲缓冲的下标并写入像素数据，
+    使用方用完后通过 :meth:`release` 归还；没有空闲缓冲时 :meth:`acquire` 会阻塞，从而起到限流的作用
+
+    缓冲带有引用计数，:meth:`acquire` 得到的缓冲计数为 1，可通过 :meth:`retain` 增加，
+    每次 :meth:`release` 减少 1，减少到 0 时才会真正归还；这使得同一个缓冲可以被多次提交给编码器
+
+    缓冲中的像素数据按照自上而下的顺序排列，``format`` 可以是：
+
+    - ``'rgba'``: 形状为 ``(ph, pw, 4)``
+    - ``'yuv420p'``: 形状为 ``(ph * 3 // 2, pw)``，依次是 Y、U、V 三个平面
+    """
+
+    def __init__(self, pw: int, ph: int, format: str = 'rgba', count: int = FRAME_RING_SIZE):
+        self.pw = pw
+        self.ph = ph
+        self.format = format
+
+        match format:
+            case 'rgba':
+                shape = (ph, pw, 4)
+            case 'yuv420p':
+                shape = (ph * 3 // 2, pw)
+            case _:
+                raise ValueError(f'Unsupported format: {format}')
+
+        self.buffers = [np.empty(shape, dtype=np.uint8) for _ in range(count)]
+        self.refcounts = [0] * count
+        self.lock = Lock()
+        self.free_queue: Queue[int] = Queue()
+        for idx in range(count):
+            self.free_queue.put(idx)
+
+    @property
+    def byte_size(self) -> int:
+        return self.buffers[0].nbytes
+
+    def acquire(self) -> int:
+        idx = self.free_queue.get()
+        self.refcounts[idx] = 1
+        return idx
+
+    def retain(self, idx: int) -> None:
+        with self.lock:
+            self.refcounts[idx] += 1
+
+    def write(self, idx: int, ptr: int) -> None:
+        """
+        将地址 ``ptr`` 处已经自上而下排列的像素数据写入下标为 ``idx`` 的缓冲
+        """
+        ctypes.memmove(self.buffers[idx].ctypes.data, ptr, self.byte_size)
+
+    def write_flipped(self, idx: int, ptr: int) -> None:
+        """
+        将地址 ``ptr`` 处自下而上排列的像素数据（例如映射后的 PBO）写入下标为 ``idx`` 的缓冲
+
+        通过负步长的视图在拷贝的同时完成上下翻转，整个过程只有这一次拷贝
+        """
+        size = self.pw * self.ph * 4
+        src = np.ctypeslib.as_array((ctypes.c_uint8 * size).from_address(ptr))
+        np.copyto(self.buffers[idx], src.reshape((self.ph, self.pw, 4))[::-1])
+
+    def release(self, idx: int) -> None:
+        with self.lock:
+            self.refcounts[idx] -= 1
+            if self.refcounts[idx] != 0:
+                return
+        self.free_queue.put(idx)
+
+
+@dataclass
+class AudioTrack:
+    """
+    与视频写入同一个文件的音频
+
+    ``chunks`` 依次产生每一段音频的起始时间（相对于视频的开头，单位为秒）
+    以及形状为 ``(n, channels)`` 的 ``int16`` 采样数据
+    """
+
+    framerate: int
+    channels: int
+    chunks: Iterable[tuple[float, np.ndarray]]
+
 
 class PyavVideoEncoder:
     """
     使用 PyAV 编码视频
 
     不考虑硬件加速检测
+
+    有两种传入帧数据的方式：
+
+    - :meth:`write` 传入自下而上排列的 ``bytes``，会在转换时进行翻转
+    - 通过 ``self.ring`` 取得缓冲并写入自上而下排列的像素数据，然后调用 :meth:`write_ring_buffer`，
+      缓冲会被直接包装为 ``av.VideoFrame``，省去中间的 ``bytes`` 对象以及再一次的翻转拷贝
+
+    对于 ``.mp4``，如果 :meth:`open` 时传入 ``gpu_yuv=True``，
+    则 ``self.ring`` 的格式是 ``yuv420p``，写入的数据应当是已经在 GPU 上转换好的
+    BT.709 limited range 数据，这样就不需要再经过 swscale 转换
+
+    对于 :attr:`AUDIO_EXTS` 中的格式，如果 :meth:`open` 时传入 ``audio``，
+    则会在另一个线程中同时编码音频，写入同一个文件中（由 FFmpeg 按照时间戳交错排列），
+    省去单独输出音频再合并的过程；
+    音频的编码进度最多领先视频 :attr:`AUDIO_LOOKAHEAD` 秒，避免交错时缓存过多的音频数据
     """
 
     CODEC_CONFIGS = {
@@ -46,14 +158,33 @@ class PyavVideoEncoder:
         },
     }
 
-    def open(self, file_path: str, pw: int, ph: int, fps: int) -> None:
+    # 可以直接接收 GPU 转换后的 yuv420p 数据的格式
+    GPU_YUV_EXTS = ('.mp4',)
+
+    # 可以同时写入音频的格式
+    AUDIO_EXTS = ('.mp4', '.mov', '.webm')
+    AUDIO_LOOKAHEAD = 1
+
+    def open(
+        self,
+        file_path: str,
+        pw: int,
+        ph: int,
+        fps: int,
+        *,
+        gpu_yuv: bool = False,
+        audio: AudioTrack | None = None,
+        perf: ExportPerf | None = None,
+    ) -> None:
         import av
         from av.codec.context import ThreadType
+        from av.video.reformatter import ColorRange, Colorspace
 
         self.file_path = file_path
         self.pw = pw
         self.ph = ph
         self.fps = fps
+        self.perf = perf or ExportPerf(enabled=False)
 
         ext = os.path.splitext(file_path)[1]
         config = self.CODEC_CONFIGS[ext]
@@ -84,17 +215,57 @@ class PyavVideoEncoder:
         self.stream.pix_fmt = config['pix_fmt']
         self.stream.thread_type = ThreadType.FRAME  # 可以提升处理速度
 
-        self.bytes_queue: Queue[bytes | None] = Queue(maxsize=3)
-        self.frame_queue: Queue[av.VideoFrame | None] = Queue(maxsize=3)
+        if gpu_yuv and ext in self.GPU_YUV_EXTS:
+            # 与 GPU 上转换时使用的色彩空间保持一致，并写入视频的元数据中
+            codec_context = self.stream.codec_context
+            codec_context.colorspace = Colorspace.ITU709
+            codec_context.color_range = ColorRange.MPEG
+            codec_context.color_primaries = 1  # AVCOL_PRI_BT709
+            codec_context.color_trc = 1  # AVCOL_TRC_BT709
+            self.ring = FrameRing(pw, ph, 'yuv420p')
+        else:
+            self.ring = FrameRing(pw, ph)
+
+        # bytes_queue 中的 int 表示 self.ring 中缓冲的下标
+        self.bytes_queue: Queue[bytes | int | None] = self.perf.queue(3, 'bytes_queue')
+        self.frame_queue: Queue[tuple[av.VideoFrame, int | None] | None] = self.perf.queue(
+            3, 'frame_queue'
+        )
+
+        # 音频和视频在不同的线程中写入 container
+        self.mux_lock = Lock()
+        # 已编码的视频时长，用于控制音频的编码进度
+        self.video_progress = Condition()
+        self.encoded_duration: float = 0
+
+        self.audio_stream: av.AudioStream | None = None
+        self.audio_error: BaseException | None = None
+        if audio is not None:
+            assert ext in self.AUDIO_EXTS
+            self.audio_stream = self.container.add_stream(
+                self.container.default_audio_codec,
+                # .webm 的 libopus 只支持 48000 等少数 sample-rate，传入其它的会报错
+                rate=48000 if ext == '.webm' else audio.framerate,
+                layout=f'{audio.channels}c',
+            )  # type: ignore
+            self.audio_thread = Thread(target=self.audio_thread_fn, args=(audio,), daemon=True)
 
         self.frame_thread = Thread(target=self.frame_thread_fn, daemon=True)
         self.frame_thread.start()
         self.encode_thread = Thread(target=self.encode_thread_fn, daemon=True)
         self.encode_thread.start()
+        if self.audio_stream is not None:
+            self.audio_thread.start()
 
     def write(self, data: bytes) -> None:
         self.bytes_queue.put(data)
 
+    def write_ring_buffer(self, idx: int) -> None:
+        """
+        提交 ``self.ring`` 中下标为 ``idx`` 的缓冲，编码完成后会自动归还
+        """
+        self.bytes_queue.put(idx)
+
     def frame_thread_fn(self) -> None:
         import av
 
@@ -104,31 +275,238 @@ class PyavVideoEncoder:
                 self.frame_queue.put(None)
                 return
 
-            frame = av.VideoFrame.from_bytes(
-                data,
-                self.pw,
-                self.ph,
-                format='rgba',
-                flip_vertical=True,
-            )
-            self.frame_queue.put(frame)
+            if isinstance(data, int):
+                # 直接包装缓冲，不产生拷贝；
+                # 在这里就转换为编码所需的像素格式，使得 swscale 的开销不占用编码线程
+                with self.perf.stage('convert'):
+                    frame = av.VideoFrame.from_numpy_buffer(
+                        self.ring.buffers[data], format=self.ring.format
+                    )
+                    frame = frame.reformat(format=self.stream.pix_fmt)
+                self.frame_queue.put((frame, data))
+                continue
+
+            with self.perf.stage('convert'):
+                frame = av.VideoFrame.from_bytes(
+                    data,
+                    self.pw,
+                    self.ph,
+                    format='rgba',
+                    flip_vertical=True,
+                )
+            self.frame_queue.put((frame, None))
 
     def encode_thread_fn(self) -> None:
         while True:
-            frame = self.frame_queue.get()
-            if frame is None:
-                for packet in self.stream.encode():
-                    self.container.mux(packet)
+            item = self.frame_queue.get()
+            if item is None:
+                self.mux(self.stream.encode())
+                self.update_encoded_duration(float('inf'))
                 return
 
-            for packet in self.stream.encode(frame):
-                self.container.mux(packet)
+            frame, ring_idx = item
+            with self.perf.stage('encode'):
+                self.mux(self.stream.encode(frame))
+
+            # 如果 reformat 没有产生新的帧（像素格式与缓冲一致），frame 仍然引用着缓冲
+            # 所以在编码之后才归还
+            if ring_idx is not None:
+                self.ring.release(ring_idx)
+
+            self.update_encoded_duration(self.encoded_duration + 1 / self.fps)
+
+    def audio_thread_fn(self, audio: AudioTrack) -> None:
+        import av
+
+        try:
+            layout = f'{audio.channels}c'
+            time_base = Fraction(1, audio.framerate)
+            pts = 0
+
+            for t, samples in audio.chunks:
+                with self.video_progress:
+                    self.video_progress.wait_for(
+                        lambda t=t: self.encoded_duration >= t - self.AUDIO_LOOKAHEAD
+                    )
+
+                frame = av.AudioFrame.from_ndarray(
+                    samples.reshape((1, -1)),  # packed e.g. [[L0,R0,L1,R1,...]]
+                    format='s16',
+                    layout=layout,
+                )
+                frame.sample_rate = audio.framerate
+                frame.time_base = time_base
+                frame.pts = pts
+                pts += len(samples)
+
+                self.mux(self.audio_stream.encode(frame))
+
+            self.mux(self.audio_stream.encode())
+        except BaseException as e:
+            self.audio_error = e
+
+    def update_encoded_duration(self, duration: float) -> None:
+        with self.video_progress:
+            self.encoded_duration = duration
+            self.video_progress.notify_all()
+
+    def mux(self, packets: list) -> None:
+        if not packets:
+            return
+        with self.mux_lock:
+            self.container.mux(packets)
 
     def finish(self) -> None:
         self.bytes_queue.put(None)
         self.frame_thread.join()
         self.encode_thread.join()
+        if self.audio_stream is not None:
+            self.audio_thread.join()
         self.container.close()
+        if self.audio_error is not None:
+            raise self.audio_error
+
+
+class ImageSequenceEncoder:
+    """
+    将每一帧分别保存为图片，输出到 ``file_path`` 文件夹中，
+    文件名依次为 ``000000.png``、``000001.png`` 等
+
+    ``ext`` 是 :attr:`FORMATS` 中的键，决定了图片的格式：
+
+    - ``.png-seq``、``.tiff-seq``: 使用 zlib 压缩的 PNG 和 TIFF
+    - ``.npy-seq``: 形状为 ``(ph, pw, 4)`` 的 numpy 数组
+    - ``.rgba-seq``: 自上而下排列的原始 RGBA 数据
+
+    压缩在线程池中并行进行（zlib 压缩时会释放 GIL），使得输出速度不受限于单个线程的压缩速度；
+    同时进行中的帧数有上限，达到上限时 :meth:`write` 会阻塞，与 ``bytes_queue`` 一样起到限流的作用
+
+    与上一帧相同的帧（即再次提交同一个缓冲）不会重新压缩，而是直接复制上一帧的文件
+    """
+
+    FORMATS = {
+        '.png-seq': '.png',
+        '.tiff-seq': '.tiff',
+        '.npy-seq': '.npy',
+        '.rgba-seq': '.rgba',
+    }
+
+    def __init__(self, ext: str):
+        self.image_ext = self.FORMATS[ext]
+
+    def open(
+        self,
+        file_path: str,
+        pw: int,
+        ph: int,
+        fps: int,
+        *,
+        gpu_yuv: bool = False,
+        audio: AudioTrack | None = None,
+        perf: ExportPerf | None = None,
+    ) -> None:
+        # 图片序列不包含音频
+        assert audio is None
+        self.file_path = file_path
+        self.pw = pw
+        self.ph = ph
+        self.fps = fps
+        self.perf = perf or ExportPerf(enabled=False)
+
+        # 清除之前输出的内容，避免残留多余的帧
+        if os.path.isdir(file_path):
+            shutil.rmtree(file_path)
+        os.makedirs(file_path)
+
+        self.workers = os.cpu_count() or 1
+        max_pending = self.workers * 2
+
+        self.ring = FrameRing(pw, ph, count=max_pending + 2)
+        self.pool = ThreadPoolExecutor(self.workers, thread_name_prefix='janim-image-sequence')
+        self.pending = BoundedSemaphore(max_pending)
+        self.futures: deque[Future] = deque()
+
+        self.index = 0
+        # 上一次提交的帧数据以及对应的任务，用于识别重复提交的帧
+        self.last_data: bytes | int | None = None
+        self.last_future: Future | None = None
+
+    def get_path(self, index: int) -> str:
+        return os.path.join(self.file_path, f'{index:06d}{self.image_ext}')
+
+    def write(self, data: bytes) -> None:
+        """
+        提交自下而上排列的 ``bytes``
+        """
+        if data is self.last_data:
+            self.submit(self.copy_fn, self.last_future)
+            return
+        array = np.frombuffer(data, dtype=np.uint8).reshape((self.ph, self.pw, 4))[::-1]
+        self.last_data = data
+        self.last_future = self.submit(self.save_fn, array, None)
+
+    def write_ring_buffer(self, idx: int) -> None:
+        """
+        提交 ``self.ring`` 中下标为 ``idx`` 的缓冲，保存完成后会自动归还
+        """
+        if idx == self.last_data:
+            self.ring.release(idx)
+            self.submit(self.copy_fn, self.last_future)
+            return
+        self.last_data = idx
+        self.last_future = self.submit(self.save_fn, self.ring.buffers[idx], idx)
+
+    def submit(self, fn, *args) -> Future:
+        # 清理已经完成的任务，如有异常则在这里抛出
+        while self.futures and self.futures[0].done():
+            self.futures.popleft().result()
+
+        self.pending.acquire()
+        future = self.pool.submit(fn, self.get_path(self.index), *args)
+        future.add_done_callback(lambda _: self.pending.release())
+        self.futures.append(future)
+        self.index += 1
+        return future
+
+    def save_fn(self, path: str, array: np.ndarray, ring_idx: int | None) -> str:
+        try:
+            with self.perf.stage('encode'):
+                match self.image_ext:
+                    case '.png':
+                        self.to_image(array).save(path, compress_level=6)
+                    case '.tiff':
+                        self.to_image(array).save(path, compression='tiff_adobe_deflate')
+                    case '.npy':
+                        np.save(path, array)
+                    case '.rgba':
+                        with open(path, 'wb') as f:
+                            f.write(np.ascontiguousarray(array).data)
+        finally:
+            if ring_idx is not None:
+                self.ring.release(ring_idx)
+        return path
+
+    @staticmethod
+    def copy_fn(path: str, src_future: Future) -> str:
+        # 线程池按提交顺序取出任务，所以 src_future 一定已经开始执行，在这里等待不会死锁
+        shutil.copyfile(src_future.result(), path)
+        return path
+
+    @staticmethod
+    def to_image(array: np.ndarray):
+        from PIL import Image
+
+        size = (array.shape[1], array.shape[0])
+        return Image.frombuffer('RGBA', size, np.ascontiguousarray(array), 'raw', 'RGBA', 0, 1)
+
+    def finish(self) -> None:
+        try:
+            for future in self.futures:
+                future.result()
+        finally:
+            self.pool.shutdown()
+            self.futures.clear()
+            self.last_data = self.last_future = None
 
 
 class FFmpegH264VideoEncoder:
@@ -138,7 +516,22 @@ class FFmpegH264VideoEncoder:
     考虑硬件加速检测
     """
 
-    def open(self, file_path: str, pw: int, ph: int, fps: int) -> None:
+    ring: FrameRing | None = None
+
+    def open(
+        self,
+        file_path: str,
+        pw: int,
+        ph: int,
+        fps: int,
+        *,
+        gpu_yuv: bool = False,
+        audio: AudioTrack | None = None,
+        perf: ExportPerf | None = None,
+    ) -> None:
+        # 不支持同时写入音频，另见 PyavVideoEncoder.AUDIO_EXTS
+        assert audio is None
+        self.perf = perf or ExportPerf(enabled=False)
         command = [
             'ffmpeg',
             '-y',  # overwrite output file if it exists
@@ -157,7 +550,8 @@ class FFmpegH264VideoEncoder:
             self.writing_process = sp.Popen(command, stdin=sp.PIPE)
 
     def write(self, data: bytes) -> None:
-        self.writing_process.stdin.write(data)
+        with self.perf.stage('encode'):
+            self.writing_process.stdin.write(data)
 
     def finish(self) -> None:
         self.writing_process.stdin.close()
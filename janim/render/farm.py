@@ -0,0 +1,618 @@
+"""
+将一次视频输出分发到多台机器上渲染
+
+- coordinator（``janim farm serve``）构建时间轴后，将帧范围划分为区段，等待 worker 连接并分配区段，
+  收集编码后的区段文件，最后无损拼接；之后的音频合并等步骤与 ``janim write`` 相同
+- worker（``janim farm work``）连接到 coordinator，不断领取区段，重新构建时间轴并渲染，
+  然后将编码后的文件发回
+
+双方通过 TCP 通信，每条消息是一行 JSON，区段文件的内容紧跟在 ``result`` 消息之后；
+当 worker 断开连接、报告错误或者超过 :data:`HEARTBEAT_TIMEOUT` 秒没有消息时，其区段会被重新分配，
+每个区段最多尝试 :data:`MAX_ATTEMPTS` 次
+
+在 :func:`farm_session` 中依次输出多个时间轴时，各个时间轴共用同一个服务，
+worker 会在时间轴之间保持连接
+
+注意：worker 会执行 coordinator 发来的代码，所以只应连接到信任的 coordinator
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import math
+import os
+import pickle
+import socket
+import socketserver
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING, Any, Generator, Iterable
+
+from tqdm import tqdm as ProgressDisplay
+
+from janim.exception import RenderWorkerError
+from janim.locale import get_translator
+from janim.logger import log
+from janim.render.parallel import TimelineSource, split_frame_range
+from janim.utils.file_ops import guarantee_existence
+
+if TYPE_CHECKING:
+    from janim.anims.timeline import BuiltTimeline
+    from janim.render.writer import VideoWriter
+
+_ = get_translator('janim.render.farm')
+
+MAX_ATTEMPTS = 3
+
+# worker 汇报渲染进度的间隔（帧数）
+PROGRESS_INTERVAL = 10
+
+# worker 在处理区段期间发送 heartbeat 消息的间隔（秒）
+HEARTBEAT_INTERVAL = 5.0
+# coordinator 在这段时间（秒）内没有收到 worker 的任何消息时，视为 worker 失去响应，将区段重新分配
+HEARTBEAT_TIMEOUT = 30.0
+
+
+@dataclass
+class FarmServeConfig:
+    host: str
+    port: int
+    chunk_duration: float
+
+
+@dataclass
+class FarmSettings:
+    """
+    由 coordinator 决定、发送给 worker 的渲染设置
+    """
+
+    ext: str
+    use_pbo: bool
+    hwaccel: bool
+    gpu_yuv: bool
+    reuse_frames: bool
+
+
+# region protocol
+
+
+def send_message(sock: socket.socket, msg: dict[str, Any], payload: bytes = b'') -> None:
+    sock.sendall(json.dumps(msg).encode() + b'\n' + payload)
+
+
+def recv_message(rfile: IO[bytes]) -> dict[str, Any]:
+    line = rfile.readline()
+    if not line:
+        raise ConnectionError('Connection closed')
+    return json.loads(line)
+
+
+def recv_payload(rfile: IO[bytes], size: int) -> bytes:
+    data = rfile.read(size)
+    if len(data) != size:
+        raise ConnectionError('Connection closed')
+    return data
+
+
+def encode_source(source: TimelineSource) -> dict[str, Any]:
+    """
+    将 ``source`` 以及其文件的内容编码为可以放在 JSON 中的数据，
+    使得 worker 不需要与 coordinator 共享文件系统
+    """
+    with open(source.file, 'rb') as f:
+        code = f.read()
+    return {
+        'source': base64.b64encode(pickle.dumps(source)).decode(),
+        'code': base64.b64encode(code).decode(),
+        'code_hash': hashlib.sha256(code).hexdigest(),
+    }
+
+
+def decode_source(data: dict[str, Any]) -> TimelineSource:
+    """
+    :func:`encode_source` 的逆过程
+
+    如果 worker 上存在同样内容的文件（例如在同一台机器上，或者共享了工作目录），则直接使用，
+    以便其中相对路径的导入和资源文件能够正常工作；否则将收到的代码写入临时目录中再使用
+    """
+    from janim.utils.config import Config
+
+    source: TimelineSource = pickle.loads(base64.b64decode(data['source']))
+    code_hash = data['code_hash']
+
+    if os.path.isfile(source.file):
+        with open(source.file, 'rb') as f:
+            if hashlib.sha256(f.read()).hexdigest() == code_hash:
+                return source
+
+    dir = guarantee_existence(os.path.join(Config.get.temp_dir, 'farm', code_hash))
+    file = os.path.join(dir, os.path.basename(source.file))
+    if not os.path.exists(file):
+        with open(file, 'wb') as f:
+            f.write(base64.b64decode(data['code']))
+    source.file = file
+    return source
+
+
+# endregion
+
+# region coordinator
+
+
+class FarmCoordinator:
+    """
+    分配区段并收集结果
+
+    - 通过 :meth:`take` 领取待渲染的区段，没有待渲染的区段时会等待，
+      直到所有区段都完成时返回 ``None``
+    - 通过 :meth:`finish` 或 :meth:`fail` 报告区段的结果，失败的区段会重新放回待渲染的队列中
+    """
+
+    def __init__(
+        self,
+        source: TimelineSource,
+        chunks: list[tuple[int, int]],
+        part_paths: list[str],
+        settings: FarmSettings,
+    ):
+        self.source_data = encode_source(source)
+        self.chunks = chunks
+        self.part_paths = part_paths
+        self.settings = settings
+
+        self.cond = threading.Condition()
+        self.pending: deque[int] = deque(range(len(chunks)))
+        self.attempts = [0] * len(chunks)
+        self.finished = [False] * len(chunks)
+        self.error: str | None = None
+
+        self.progress_display: ProgressDisplay | None = None
+
+    @property
+    def all_finished(self) -> bool:
+        return all(self.finished)
+
+    @property
+    def exhausted(self) -> bool:
+        """
+        是否不会再有区段可以领取，即所有区段都已完成，或者有区段多次失败
+        """
+        return self.all_finished or self.error is not None
+
+    def take(self) -> int | None:
+        with self.cond:
+            while not self.pending:
+                if self.exhausted:
+                    return None
+                self.cond.wait()
+            if self.error is not None:
+                return None
+            idx = self.pending.popleft()
+            self.attempts[idx] += 1
+            return idx
+
+    def finish(self, idx: int, data: bytes) -> None:
+        with open(self.part_paths[idx], 'wb') as f:
+            f.write(data)
+        with self.cond:
+            self.finished[idx] = True
+            self.cond.notify_all()
+
+    def fail(self, idx: int, reason: str) -> None:
+        start, end = self.chunks[idx]
+        log.warning(
+            _('Chunk {idx} (frames {start}-{end}) failed: {reason}').format(
+                idx=idx, start=start, end=end, reason=reason
+            )
+        )
+        with self.cond:
+            if self.attempts[idx] >= MAX_ATTEMPTS:
+                self.error = _('Chunk {idx} failed {count} times').format(
+                    idx=idx, count=self.attempts[idx]
+                )
+            else:
+                self.pending.append(idx)
+            self.cond.notify_all()
+
+    def update_progress(self, n: int) -> None:
+        if self.progress_display is not None:
+            self.progress_display.update(n)
+
+    def wait(self) -> None:
+        """
+        阻塞直到所有区段完成，若有区段多次失败则抛出 :class:`~.RenderWorkerError`
+        """
+        with self.cond:
+            while not self.all_finished and self.error is None:
+                self.cond.wait()
+            if self.error is not None:
+                raise RenderWorkerError(self.error)
+
+    def job_message(self, idx: int) -> dict[str, Any]:
+        start, end = self.chunks[idx]
+        return {
+            'type': 'job',
+            'chunk': idx,
+            'start_frame': start,
+            'end_frame': end,
+            'settings': self.settings.__dict__,
+            **self.source_data,
+        }
+
+
+class _FarmRequestHandler(socketserver.StreamRequestHandler):
+    server: _FarmServer
+
+    def handle(self) -> None:
+        self.request.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        peer = '{}:{}'.format(*self.client_address[:2])
+        log.info(_('Worker {peer} connected').format(peer=peer))
+
+        with self.server.track_handler():
+            self.serve(peer)
+
+        log.info(_('Worker {peer} disconnected').format(peer=peer))
+
+    def serve(self, peer: str) -> None:
+        coordinator: FarmCoordinator | None = None
+
+        while True:
+            try:
+                recv_message(self.rfile)  # request
+            except (OSError, ValueError):
+                return
+
+            # 当前的时间轴没有待渲染的区段时，等待下一个时间轴
+            idx = None
+            while idx is None:
+                coordinator = self.server.next_coordinator(coordinator)
+                if coordinator is None:
+                    break
+                idx = coordinator.take()
+
+            if idx is None:
+                try:
+                    send_message(self.request, {'type': 'done'})
+                except OSError:
+                    pass
+                return
+
+            try:
+                self.render_chunk(coordinator, idx)
+            except (OSError, ValueError) as e:
+                coordinator.fail(idx, _('worker {peer} disconnected ({e})').format(peer=peer, e=e))
+                return
+
+    def render_chunk(self, coordinator: FarmCoordinator, idx: int) -> None:
+        send_message(self.request, coordinator.job_message(idx))
+        reported = 0
+        # worker 在处理区段期间会定时发送 heartbeat，超时说明 worker 失去响应或者网络中断
+        self.request.settimeout(HEARTBEAT_TIMEOUT)
+        try:
+            while True:
+                msg = recv_message(self.rfile)
+                match msg['type']:
+                    case 'heartbeat':
+                        pass
+                    case 'progress':
+                        reported += msg['frames']
+                        coordinator.update_progress(msg['frames'])
+                    case 'result':
+                        data = recv_payload(self.rfile, msg['size'])
+                        coordinator.finish(idx, data)
+                        return
+                    case 'error':
+                        coordinator.update_progress(-reported)
+                        coordinator.fail(idx, msg['message'])
+                        return
+        except BaseException:
+            coordinator.update_progress(-reported)
+            raise
+        finally:
+            self.request.settimeout(None)
+
+
+class _FarmServer(socketserver.ThreadingTCPServer):
+    """
+    接受 worker 的连接，并将当前 :class:`FarmCoordinator` 的区段分配给它们
+
+    通过 :meth:`set_coordinator` 切换到下一个时间轴时，已连接的 worker 不需要重新连接；
+    :meth:`close` 后会告知所有 worker 已经完成
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], coordinator: FarmCoordinator | None = None):
+        super().__init__(address, _FarmRequestHandler)
+        self.cond = threading.Condition()
+        self.coordinator = coordinator
+        self.closed = False
+        self.handler_count = 0
+
+    def set_coordinator(self, coordinator: FarmCoordinator | None) -> None:
+        with self.cond:
+            self.coordinator = coordinator
+            self.cond.notify_all()
+
+    def next_coordinator(self, previous: FarmCoordinator | None) -> FarmCoordinator | None:
+        """
+        得到可以领取区段的 coordinator
+
+        ``previous`` 的区段已经分配完时等待下一个，已经 :meth:`close` 时返回 ``None``
+        """
+        if previous is not None and not previous.exhausted:
+            return previous
+        with self.cond:
+            while not self.closed and (
+                self.coordinator is None or self.coordinator is previous
+            ):
+                self.cond.wait()
+            return None if self.closed else self.coordinator
+
+    @contextmanager
+    def track_handler(self) -> Generator[None, None, None]:
+        with self.cond:
+            self.handler_count += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.handler_count -= 1
+                self.cond.notify_all()
+
+    def close(self, timeout: float = 5) -> None:
+        """
+        告知所有已连接的 worker 已经完成，并关闭服务
+        """
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+            # 等待各个连接发送完 done 消息
+            self.cond.wait_for(lambda: self.handler_count == 0, timeout)
+        self.shutdown()
+        self.server_close()
+
+
+# 在 farm_session 中，按照地址共用的服务
+_session_servers: dict[tuple[str, int], _FarmServer] | None = None
+
+
+@contextmanager
+def farm_session() -> Generator[None, None, None]:
+    """
+    在该范围内多次调用 :func:`write_video_with_farm` 时，相同地址的时间轴共用同一个服务，
+    使得 worker 在时间轴之间保持连接，直到退出该范围时才告知 worker 全部完成
+    """
+    global _session_servers
+
+    if _session_servers is not None:
+        yield
+        return
+
+    _session_servers = {}
+    try:
+        yield
+    finally:
+        servers, _session_servers = _session_servers, None
+        for server in servers.values():
+            server.close()
+
+
+def _start_server(address: tuple[str, int]) -> _FarmServer:
+    server = _FarmServer(address)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def write_video_with_farm(
+    writer: VideoWriter,
+    source: TimelineSource,
+    file_path: str,
+    start_frame: int,
+    end_frame: int,
+    *,
+    config: FarmServeConfig,
+    settings: FarmSettings,
+) -> None:
+    """
+    作为 coordinator 将 ``[start_frame, end_frame)`` 分发给 worker 渲染，并拼接为 ``file_path``
+    """
+    from janim.render.writer import concat_videos
+
+    stem, ext = os.path.splitext(file_path)
+    chunk_frames = max(1, round(config.chunk_duration * writer.built.cfg.fps))
+    count = math.ceil((end_frame - start_frame) / chunk_frames)
+    chunks = split_frame_range(start_frame, end_frame, count)
+    part_paths = [f'{stem}_part{i}{ext}' for i in range(len(chunks))]
+
+    coordinator = FarmCoordinator(source, chunks, part_paths, settings)
+
+    address = (config.host, config.port)
+    server = None if _session_servers is None else _session_servers.get(address)
+    if server is None:
+        server = _start_server(address)
+        if _session_servers is not None:
+            _session_servers[address] = server
+
+    host, port = server.server_address[:2]
+    log.info(
+        _('Waiting for workers on {host}:{port} ({count} chunks)').format(
+            host=host, port=port, count=len(chunks)
+        )
+    )
+
+    coordinator.progress_display = ProgressDisplay(
+        total=end_frame - start_frame,
+        leave=False,
+        dynamic_ncols=True,
+    )
+    server.set_coordinator(coordinator)
+    try:
+        with coordinator.progress_display:
+            coordinator.wait()
+    except RenderWorkerError:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        raise
+    finally:
+        server.set_coordinator(None)
+        if _session_servers is None:
+            server.close()
+
+    concat_videos(part_paths, file_path)
+
+
+# endregion
+
+# region worker
+
+
+def run_worker(host: str, port: int, *, connect_timeout: float = 30) -> None:
+    """
+    作为 worker 连接到 coordinator，不断领取区段并渲染，直到 coordinator 告知所有区段都已完成
+
+    ``connect_timeout`` 秒内会不断尝试连接，以便 worker 可以先于 coordinator 启动
+    """
+    deadline = time.time() + connect_timeout
+    while True:
+        try:
+            sock = socket.create_connection((host, port))
+            break
+        except OSError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.5)
+
+    log.info(_('Connected to coordinator {host}:{port}').format(host=host, port=port))
+
+    # 缓存构建好的时间轴，连续领取同一个时间轴的区段时不必重新构建
+    builts: dict[str, tuple[BuiltTimeline, VideoWriter]] = {}
+
+    with sock, sock.makefile('rb') as rfile:
+        conn = _WorkerConnection(sock)
+        while True:
+            conn.send({'type': 'request'})
+            try:
+                msg = recv_message(rfile)
+            except ConnectionError:
+                log.warning(_('Coordinator closed the connection'))
+                return
+            if msg['type'] == 'done':
+                break
+
+            chunk, start, end = msg['chunk'], msg['start_frame'], msg['end_frame']
+            log.info(
+                _('Rendering chunk {chunk} (frames {start}-{end})').format(
+                    chunk=chunk, start=start, end=end
+                )
+            )
+            try:
+                with conn.heartbeat():
+                    data = _render_job(conn, msg, builts)
+            except Exception:
+                traceback.print_exc()
+                conn.send({'type': 'error', 'message': traceback.format_exc(limit=3)})
+                continue
+
+            conn.send({'type': 'result', 'size': len(data)}, data)
+
+    log.info(_('All chunks finished, worker exiting'))
+
+
+class _WorkerConnection:
+    """
+    worker 到 coordinator 的连接，发送消息时加锁，使得 heartbeat 线程与渲染线程的消息不会交错
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.lock = threading.Lock()
+
+    def send(self, msg: dict[str, Any], payload: bytes = b'') -> None:
+        with self.lock:
+            send_message(self.sock, msg, payload)
+
+    @contextmanager
+    def heartbeat(self) -> Generator[None, None, None]:
+        """
+        在该范围内每隔 :data:`HEARTBEAT_INTERVAL` 秒发送 heartbeat 消息，
+        使得 coordinator 在构建时间轴等较长时间没有进度的情况下，也知道 worker 仍然在工作
+        """
+        stop = threading.Event()
+
+        def run() -> None:
+            while not stop.wait(HEARTBEAT_INTERVAL):
+                try:
+                    self.send({'type': 'heartbeat'})
+                except OSError:
+                    return
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+
+def _render_job(
+    conn: _WorkerConnection,
+    msg: dict[str, Any],
+    builts: dict[str, tuple[BuiltTimeline, VideoWriter]],
+) -> bytes:
+    from janim.render.writer import VideoWriter
+    from janim.utils.config import Config
+
+    settings = FarmSettings(**msg['settings'])
+    start, end = msg['start_frame'], msg['end_frame']
+
+    key = msg['source'] + msg['code_hash']
+    if key not in builts:
+        source = decode_source(msg)
+        source.apply_environment()
+        built = source.build()
+        builts.clear()
+        builts[key] = (built, VideoWriter(built))
+    built, writer = builts[key]
+
+    dir = guarantee_existence(os.path.join(Config.get.temp_dir, 'farm'))
+    file_path = os.path.join(dir, f'chunk_{os.getpid()}_{msg["chunk"]}{settings.ext}')
+
+    writer.open_video_pipe(file_path, settings.hwaccel, settings.gpu_yuv)
+    writer.write_frames(
+        _report_progress(range(start, end), conn),
+        start,
+        end,
+        use_pbo=settings.use_pbo,
+        reuse_frames=settings.reuse_frames,
+    )
+    writer.close_video_pipe(False)
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    os.remove(file_path)
+    return data
+
+
+def _report_progress(frames: Iterable[int], conn: _WorkerConnection) -> Iterable[int]:
+    count = 0
+    for frame in frames:
+        yield frame
+        count += 1
+        if count == PROGRESS_INTERVAL:
+            conn.send({'type': 'progress', 'frames': count})
+            count = 0
+    if count != 0:
+        conn.send({'type': 'progress', 'frames': count})
+
+
+# endregion
@@ -168,6 +168,144 @@ class FrameBuffer:
             )
         )
 
+    @contextmanager
+    def yuv420p_context(self):
+        """
+        通过 GPU pass 将当前 FBO 的内容转换为 BT.709 limited range 的平面 YUV420 (``yuv420p``)
+        数据，并在 with 期间绑定存放结果的 FBO，以便读取
+
+        结果 FBO 中每个 RGBA 像素存放连续的 4 个字节，尺寸是 ``(pw // 4, ph * 3 // 2)``，
+        以 RGBA 格式按行读取后依次是 Y、U、V 三个平面，
+        并且已经上下翻转为自上而下的顺序，可直接作为 ``av.VideoFrame`` 的 ``yuv420p`` 数据；
+        要求 ``pw`` 是 4 的倍数，``ph`` 是偶数
+
+        这里假设了调用该方法前活跃的就是 ``self._fbo``，所以在 with 结束后会重新让它 use
+        """
+        prog, vao = self._get_yuv420p_vao(self.ctx)
+        yuv_fbo = self._get_yuv420p_fbo(self.ctx, self._fbo.size)
+
+        self.use(0)
+        prog['tex'] = 0
+        yuv_fbo.use()
+        self.ctx.disable(mgl.BLEND)
+        vao.render(mgl.TRIANGLE_STRIP)
+        self.ctx.enable(mgl.BLEND)
+
+        try:
+            yield yuv_fbo
+        finally:
+            self._fbo.use()
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _get_yuv420p_vao(ctx: mgl.Context):
+        """获取 yuv420p 转换的 shader 程序和 VAO"""
+        prog = ctx.program(
+            R"""
+            #version 330 core
+
+            in vec2 in_coord;
+
+            void main()
+            {
+                gl_Position = vec4(in_coord * 2.0 - 1.0, 0.0, 1.0);
+            }
+            """,
+            R"""
+            #version 330 core
+
+            out vec4 out_color;
+
+            uniform sampler2D tex;
+
+            const vec3 LUMA = vec3(0.2126, 0.7152, 0.0722);  // BT.709
+
+            int w;
+            int h;
+
+            // 输出中的第 row 行对应图像自上而下的第 row 行，也就是纹理中的第 h - 1 - row 行
+            vec3 fetch(int x, int row)
+            {
+                return texelFetch(tex, ivec2(x, h - 1 - row), 0).rgb;
+            }
+
+            float luma(int x, int row)
+            {
+                return (16.0 + 219.0 * dot(LUMA, fetch(x, row))) / 255.0;
+            }
+
+            // idx 是在 U 或 V 平面中的下标，对 2x2 的像素块取平均
+            float chroma(int idx, bool is_v)
+            {
+                int cw = w / 2;
+                int x = idx % cw * 2;
+                int row = idx / cw * 2;
+                vec3 rgb = (
+                    fetch(x, row) + fetch(x + 1, row)
+                    + fetch(x, row + 1) + fetch(x + 1, row + 1)
+                ) * 0.25;
+                float y = dot(LUMA, rgb);
+                float c = is_v ? (rgb.r - y) / 1.5748 : (rgb.b - y) / 1.8556;
+                return (128.0 + 224.0 * c) / 255.0;
+            }
+
+            void main()
+            {
+                ivec2 size = textureSize(tex, 0);
+                w = size.x;
+                h = size.y;
+                ivec2 pos = ivec2(gl_FragCoord.xy);
+                int x = pos.x * 4;
+
+                // Y 平面，占据前 h 行
+                if (pos.y < h) {
+                    out_color = vec4(
+                        luma(x, pos.y), luma(x + 1, pos.y), luma(x + 2, pos.y), luma(x + 3, pos.y)
+                    );
+                    return;
+                }
+
+                // U、V 平面，每个平面 (w / 2) * (h / 2) 个值，按行连续存放在之后的 h / 2 行中
+                // 由于 w 是 4 的倍数，每个平面的字节数也是 4 的倍数，
+                // 所以同一个像素中的 4 个值总在同一个平面
+                int plane_size = w / 2 * (h / 2);
+                int idx = (pos.y - h) * w + x;
+                bool is_v = idx >= plane_size;
+                if (is_v) {
+                    idx -= plane_size;
+                }
+                out_color = vec4(
+                    chroma(idx, is_v),
+                    chroma(idx + 1, is_v),
+                    chroma(idx + 2, is_v),
+                    chroma(idx + 3, is_v)
+                );
+            }
+            """,
+        )
+
+        # 构建全屏四边形 VAO
+        vbo = ctx.buffer(
+            data=np.array(
+                [[0.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 1.0]], dtype=np.float32
+            ).tobytes()
+        )
+        vao = ctx.vertex_array(prog, [(vbo, '2f', 'in_coord')])
+
+        return prog, vao
+
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _get_yuv420p_fbo(ctx: mgl.Context, size: tuple[int, int]):
+        pw, ph = size
+        return ctx.framebuffer(
+            color_attachments=ctx.texture(
+                (pw // 4, ph * 3 // 2),
+                components=4,
+                samples=0,
+            )
+        )
+
     def read(self) -> bytes:
         return self._fbo.read(components=4)
 
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import pickle
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from queue import Empty
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+import attrs
+from tqdm import tqdm as ProgressDisplay
+
+from janim.exception import RenderWorkerError
+from janim.locale import get_lang, get_translator
+from janim.logger import log
+from janim.utils.config import Config, cli_config, config_ctx_var
+from janim.utils.data import ContextSetter
+from janim.utils.file_ops import STDIN_FILENAME, getfile_or_stdin
+from janim.utils.typst_compile import get_use_external_typst
+
+if TYPE_CHECKING:
+    from janim.anims.timeline import BuiltTimeline, Timeline
+
+_ = get_translator('janim.render.parallel')
+
+
+@dataclass
+class TimelineSource:
+    """
+    用于在其它进程中重新构建时间轴的信息
+
+    由于 :class:`~.BuiltTimeline` 无法在进程之间传递，
+    所以记录时间轴所在的文件、类名以及当前的命令行配置，在子进程中重新加载文件并构建
+    """
+
+    file: str
+    name: str
+    configs: dict[str, Any]
+    hide_subtitles: bool
+    external_typst: bool
+    lang: str
+    loglevel: int
+    # 为 ``None`` 时由文件路径得到，另见 :func:`~.get_module_from_file`
+    module_name: str | None = None
+    # 是否优先使用缓存的构建结果，另见 :mod:`~.build_cache`
+    build_cache: bool = False
+
+    @staticmethod
+    def from_built(built: BuiltTimeline) -> TimelineSource | None:
+        """
+        从 ``built`` 得到对应的 :class:`TimelineSource`
+
+        如果时间轴类无法在其它进程中重新得到（例如来自 stdin，或定义在函数内部），则返回 ``None``
+        """
+        return TimelineSource.from_class(built.timeline.__class__, built.timeline.hide_subtitles)
+
+    @staticmethod
+    def from_class(cls: type[Timeline], hide_subtitles: bool) -> TimelineSource | None:
+        """
+        与 :meth:`from_built` 相同，但不需要事先构建时间轴
+        """
+        file = getfile_or_stdin(cls)
+        if file == STDIN_FILENAME or '<locals>' in cls.__qualname__:
+            return None
+
+        return TimelineSource(
+            file=os.path.abspath(file),
+            name=cls.__name__,
+            configs={
+                key: value
+                for key, value in attrs.asdict(cli_config, recurse=False).items()
+                if value is not None
+            },
+            hide_subtitles=hide_subtitles,
+            external_typst=get_use_external_typst(),
+            lang=get_lang(),
+            loglevel=log.level,
+        )
+
+    def apply_environment(self) -> None:
+        """
+        在子进程中还原语言、日志等级以及命令行配置
+        """
+        from janim.locale import set_lang
+        from janim.utils.typst_compile import set_use_external_typst
+
+        set_lang(self.lang)
+        log.setLevel(self.loglevel)
+        set_use_external_typst(self.external_typst)
+        for key, value in self.configs.items():
+            setattr(cli_config, key, value)
+
+    def build(self) -> BuiltTimeline:
+        """
+        加载文件并构建时间轴
+        """
+        from janim.cli.utils.get_module import get_module_from_file
+
+        module = get_module_from_file(self.file, self.module_name)
+        timeline_cls = getattr(module, self.name)
+        if self.build_cache:
+            from janim.utils.build_cache import build_with_cache
+
+            return build_with_cache(timeline_cls, hide_subtitles=self.hide_subtitles)
+        return timeline_cls().build(quiet=True, hide_subtitles=self.hide_subtitles)
+
+
+def build_timelines_in_parallel(
+    classes: list[type[Timeline]], *, jobs: int
+) -> Iterator[BuiltTimeline]:
+    """
+    在最多 ``jobs`` 个子进程中同时构建 ``classes`` 中的各个时间轴，并按照原本的顺序依次产出构建结果
+
+    子进程构建完成后，通过 ``pickle`` 将 :class:`~.Timeline` 对象传回，
+    再在当前进程中创建对应的 :class:`~.BuiltTimeline`；
+    构建时使用当前的 config 上下文，与在当前进程中直接调用 ``cls().build()`` 的结果相同
+
+    以下情况会回退到在当前进程中构建：
+
+    - 时间轴类无法在子进程中重新得到，另见 :meth:`TimelineSource.from_class`
+    - 在子进程中构建出错，这样可以在当前进程中正常报告错误
+    - 构建结果无法通过 ``pickle`` 传递，例如使用了 ``lambda`` 作为 updater
+
+    后两种情况会给出警告
+    """
+    from janim.anims.timeline import BuiltTimeline, Timeline
+
+    configs = config_ctx_var.get()
+    indent = Timeline.build_indent_ctx.get(-2)
+    indent_str = ' ' * (indent + 2)
+
+    executor = ProcessPoolExecutor(
+        max_workers=max(1, min(jobs, len(classes))), mp_context=mp.get_context('spawn')
+    )
+    with executor:
+        futures: list[Future[bytes] | None] = []
+        for cls in classes:
+            source = TimelineSource.from_class(cls, False)
+            if source is None or cls.__module__ == '__main__':
+                futures.append(None)
+                continue
+            source = replace(source, module_name=cls.__module__)
+            futures.append(executor.submit(_build_timeline, source, configs, indent))
+
+        for cls, future in zip(classes, futures):
+            data = None
+            if future is not None:
+                try:
+                    data = future.result()
+                except Exception as e:
+                    log.warning(
+                        _(
+                            'Failed to build "{name}" in a worker process, '
+                            'building it in the current process instead: {error}'
+                        ).format(name=cls.__name__, error=e)
+                    )
+
+            if data is None:
+                yield cls().build()
+                continue
+
+            timeline: Timeline = pickle.loads(data)
+            log.info(
+                indent_str
+                + _('Built "{name}" in a worker process').format(name=cls.__name__)
+            )
+            yield BuiltTimeline(timeline)
+
+
+def _build_timeline(source: TimelineSource, configs: list[Config], indent: int) -> bytes:
+    from janim.anims.timeline import Timeline
+
+    source.apply_environment()
+    with (
+        ContextSetter(config_ctx_var, configs),
+        ContextSetter(Timeline.build_indent_ctx, indent),
+    ):
+        built = source.build()
+    # 构建或者 pickle 时产生的异常会传回当前进程，由 build_timelines_in_parallel 给出提示
+    return pickle.dumps(built.timeline, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def split_frame_range(start_frame: int, end_frame: int, count: int) -> list[tuple[int, int]]:
+    """
+    将 ``[start_frame, end_frame)`` 尽可能均匀地划分为 ``count`` 个连续的区段
+    """
+    total = end_frame - start_frame
+    count = max(1, min(count, total))
+    bounds = [start_frame + total * i // count for i in range(count + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def write_video_in_parallel(
+    source: TimelineSource,
+    file_path: str,
+    start_frame: int,
+    end_frame: int,
+    *,
+    workers: int,
+    use_pbo: bool,
+    hwaccel: bool,
+    gpu_yuv: bool = False,
+    reuse_frames: bool = True,
+) -> int:
+    """
+    将 ``[start_frame, end_frame)`` 划分为 ``workers`` 个连续区段，
+    每个区段在单独的进程中重新构建时间轴并输出到分段文件，最后无损拼接为 ``file_path``
+
+    返回值是各个进程中被复用的帧数之和，另见 :meth:`~.VideoWriter.write_frames`
+    """
+    from janim.render.writer import concat_videos
+
+    stem, ext = os.path.splitext(file_path)
+    ranges = split_frame_range(start_frame, end_frame, workers)
+    part_paths = [f'{stem}_part{i}{ext}' for i in range(len(ranges))]
+
+    ctx = mp.get_context('spawn')
+    progress_queue = ctx.Queue()
+    reused_queue = ctx.Queue()
+
+    processes = [
+        ctx.Process(
+            target=_write_chunk,
+            args=(
+                source,
+                part_path,
+                chunk_start,
+                chunk_end,
+                use_pbo,
+                hwaccel,
+                gpu_yuv,
+                reuse_frames,
+                progress_queue,
+                reused_queue,
+            ),
+            daemon=True,
+        )
+        for part_path, (chunk_start, chunk_end) in zip(part_paths, ranges)
+    ]
+    for process in processes:
+        process.start()
+
+    log.debug(f'Started {len(processes)} worker processes for VideoWriter')
+
+    progress_display = ProgressDisplay(
+        total=end_frame - start_frame,
+        leave=False,
+        dynamic_ncols=True,
+    )
+    with progress_display:
+        while any(process.is_alive() for process in processes) or not progress_queue.empty():
+            try:
+                progress_display.update(progress_queue.get(timeout=0.1))
+            except Empty:
+                pass
+
+    for process in processes:
+        process.join()
+
+    failed = [i for i, process in enumerate(processes) if process.exitcode != 0]
+    if failed:
+        for part_path in part_paths:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+        raise RenderWorkerError(
+            _('Worker processes {indices} exited unexpectedly').format(
+                indices=', '.join(map(str, failed))
+            )
+        )
+
+    concat_videos(part_paths, file_path)
+
+    return sum(reused_queue.get() for _ in processes)
+
+
+def _write_chunk(
+    source: TimelineSource,
+    file_path: str,
+    start_frame: int,
+    end_frame: int,
+    use_pbo: bool,
+    hwaccel: bool,
+    gpu_yuv: bool,
+    reuse_frames: bool,
+    progress_queue: mp.Queue,
+    reused_queue: mp.Queue,
+) -> None:
+    from janim.render.writer import VideoWriter
+
+    source.apply_environment()
+    built = source.build()
+
+    writer = VideoWriter(built)
+    writer.open_video_pipe(file_path, hwaccel, gpu_yuv)
+    reused_count = writer.write_frames(
+        _report_progress(range(start_frame, end_frame), progress_queue),
+        start_frame,
+        end_frame,
+        use_pbo=use_pbo,
+        reuse_frames=reuse_frames,
+    )
+    writer.close_video_pipe(False)
+    reused_queue.put(reused_count)
+
+
+def _report_progress(frames: Iterable[int], progress_queue: mp.Queue) -> Iterable[int]:
+    for frame in frames:
+        yield frame
+        progress_queue.put(1)
@@ -0,0 +1,179 @@
+"""
+输出视频时各个阶段的耗时统计
+
+:class:`ExportPerf` 由 :class:`~.VideoWriter` 创建，并传递给编码器，在以下位置记录耗时：
+
+- ``render``: :meth:`~.BuiltTimeline.render_all` 以及前后对 framebuffer 的处理
+- ``readback``: ``glReadPixels``，以及映射 PBO 并拷贝数据
+- ``pbo_wait``: 等待 PBO 传输完成，另见 :class:`~.PboRing`
+- ``submit``: 将帧数据提交给编码器（队列已满时会阻塞）
+- ``convert``: 在编码器中将帧数据转换为 ``av.VideoFrame``
+- ``encode``: 在编码器中编码并写入文件
+
+并通过 :meth:`ExportPerf.queue` 记录编码器中各个队列的阻塞时长和队列长度
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from queue import Queue
+
+import numpy as np
+
+from janim.locale import get_translator
+from janim.logger import log
+
+_ = get_translator('janim.render.perf')
+
+
+class PerfQueue[T](Queue[T]):
+    """
+    记录 :meth:`put` 和 :meth:`get` 阻塞时长的 ``Queue``
+
+    - ``put`` 阻塞表示队列已满，即下游跟不上
+    - ``get`` 阻塞表示队列为空，即上游跟不上
+    """
+
+    def __init__(self, maxsize: int, perf: ExportPerf, name: str):
+        super().__init__(maxsize)
+        self.perf = perf
+        self.name = name
+
+    def put(self, item: T, block: bool = True, timeout: float | None = None) -> None:
+        self.perf.queue_depths[self.name].append(self.qsize())
+        t = time.perf_counter()
+        super().put(item, block, timeout)
+        self.perf.queue_stalls[self.name]['put'] += time.perf_counter() - t
+
+    def get(self, block: bool = True, timeout: float | None = None) -> T:
+        t = time.perf_counter()
+        item = super().get(block, timeout)
+        self.perf.queue_stalls[self.name]['get'] += time.perf_counter() - t
+        return item
+
+
+class ExportPerf:
+    """
+    统计输出视频时各个阶段的耗时
+
+    ``enabled=False`` 时不进行任何记录，:meth:`stage` 和 :meth:`queue` 退化为没有额外开销的实现
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+
+        self.stage_times: defaultdict[str, list[float]] = defaultdict(list)
+        self.queue_depths: defaultdict[str, list[int]] = defaultdict(list)
+        self.queue_stalls: defaultdict[str, dict[str, float]] = defaultdict(
+            lambda: {'put': 0.0, 'get': 0.0}
+        )
+
+        # 其它附加的统计信息，例如 :class:`~.PboStats`
+        self.extras: dict[str, dict] = {}
+
+        self.frame_count = 0
+        self.elapsed = 0.0
+
+    def stage(self, name: str):
+        """
+        ``with`` 该方法，记录代码块的用时
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name: str):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_times[name].append(time.perf_counter() - t)
+
+    def queue(self, maxsize: int, name: str) -> Queue:
+        """
+        创建队列，启用时会记录队列的阻塞时长和长度，另见 :class:`PerfQueue`
+        """
+        if not self.enabled:
+            return Queue(maxsize)
+        return PerfQueue(maxsize, self, name)
+
+    def finish(self, frame_count: int, elapsed: float) -> None:
+        self.frame_count = frame_count
+        self.elapsed = elapsed
+
+    def summary(self) -> dict:
+        """
+        得到统计结果，各个时长的单位均为秒
+        """
+        stages = {}
+        for name, times in self.stage_times.items():
+            array = np.array(times)
+            stages[name] = {
+                'count': len(times),
+                'total': float(array.sum()),
+                'mean': float(array.mean()),
+                'p95': float(np.percentile(array, 95)),
+            }
+
+        queues = {}
+        for name, stalls in self.queue_stalls.items():
+            depths = self.queue_depths[name]
+            queues[name] = {
+                'put_stall': stalls['put'],
+                'get_stall': stalls['get'],
+                'mean_depth': float(np.mean(depths)) if depths else 0.0,
+                'max_depth': max(depths, default=0),
+            }
+
+        return {
+            'frames': self.frame_count,
+            'elapsed': self.elapsed,
+            'fps': self.frame_count / self.elapsed if self.elapsed else 0.0,
+            'stages': stages,
+            'queues': queues,
+            'extras': self.extras,
+        }
+
+    def log_summary(self) -> None:
+        summary = self.summary()
+
+        lines = [
+            f'{"stage":<10}{"count":>8}{"total (s)":>12}{"mean (ms)":>12}{"p95 (ms)":>12}',
+        ]
+        for name, stage in summary['stages'].items():
+            lines.append(
+                f'{name:<10}{stage["count"]:>8}{stage["total"]:>12.3f}'
+                f'{stage["mean"] * 1000:>12.3f}{stage["p95"] * 1000:>12.3f}'
+            )
+        if summary['queues']:
+            lines.append('')
+            lines.append(
+                f'{"queue":<14}{"put stall (s)":>15}{"get stall (s)":>15}'
+                f'{"mean depth":>12}{"max":>6}'
+            )
+            for name, queue in summary['queues'].items():
+                lines.append(
+                    f'{name:<14}{queue["put_stall"]:>15.3f}{queue["get_stall"]:>15.3f}'
+                    f'{queue["mean_depth"]:>12.2f}{queue["max_depth"]:>6}'
+                )
+        if summary['extras']:
+            lines.append('')
+            for name, extra in summary['extras'].items():
+                lines.append(f'{name}: ' + ', '.join(f'{k}={v}' for k, v in extra.items()))
+        lines.append('')
+        lines.append(
+            f'{summary["frames"]} frames in {summary["elapsed"]:.2f} s '
+            f'({summary["fps"]:.2f} frames/s)'
+        )
+
+        log.info(_('Export performance:'))
+        log.info('\n'.join(lines), extra={'raw': True})
+
+    def dump(self, file_path: str) -> None:
+        with open(file_path, 'wt', encoding='utf-8') as f:
+            json.dump(self.summary(), f, indent=4)
+        log.info(_('Performance report saved to "{file_path}"').format(file_path=file_path))
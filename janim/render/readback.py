@@ -0,0 +1,213 @@
+"""
+通过 PBO (Pixel Buffer Object) 异步读取帧数据
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+import OpenGL.GL as gl
+
+from janim.render.perf import ExportPerf
+
+PBO_MIN_DEPTH = 2
+PBO_MAX_DEPTH = 8
+PBO_INIT_DEPTH = 3
+
+# 每隔多少帧根据这段时间内的等待时长调整一次深度
+PBO_ADAPT_INTERVAL = 30
+# 平均每帧的等待时长超过该值（秒）时加深，没有等待时变浅
+PBO_GROW_THRESHOLD = 0.001
+
+
+@dataclass
+class PboStats:
+    """
+    :class:`PboRing` 的统计信息
+
+    - ``depth``: 结束时的深度，``max_depth`` 是过程中达到的最大深度
+    - ``stall_time``、``stall_count``: 需要阻塞等待 GPU 传输完成的总时长以及次数
+    - ``frames``: 读取的帧数（不包括复用上一帧的帧）
+    """
+
+    depth: int = PBO_INIT_DEPTH
+    max_depth: int = PBO_INIT_DEPTH
+    stall_time: float = 0.0
+    stall_count: int = 0
+    frames: int = 0
+
+
+@dataclass
+class _Pending:
+    pbo: int | None  # None 表示复用上一帧，不占用 PBO
+    sync: object | None = None
+
+
+class PboRing:
+    """
+    一组循环使用的 PBO，每一帧都读取到空闲的 PBO 中，并在读取后插入 fence
+
+    仅当 fence 已经完成时才映射对应的 PBO，因此映射时不会阻塞；
+    只有正在传输的 PBO 数量达到 ``depth`` 时，才会阻塞等待最早的一个
+
+    ``depth`` 会根据阻塞等待的时长自动调整：每 :data:`PBO_ADAPT_INTERVAL` 帧中，
+    平均每帧的等待时长超过 :data:`PBO_GROW_THRESHOLD` 则加深，
+    完全没有等待则变浅（并释放多余的 PBO），
+    范围在 :data:`PBO_MIN_DEPTH` 和 :data:`PBO_MAX_DEPTH` 之间
+
+    各帧按照提交的顺序通过 ``on_read`` 交出：参数是映射后的指针，在回调返回后解除映射；
+    对于通过 :meth:`skip` 提交的帧，参数是 ``None``
+    """
+
+    def __init__(
+        self,
+        byte_size: int,
+        on_read: Callable[[int | None], None],
+        *,
+        depth: int = PBO_INIT_DEPTH,
+        perf: ExportPerf | None = None,
+    ):
+        self.byte_size = byte_size
+        self.on_read = on_read
+        self.perf = perf or ExportPerf(enabled=False)
+
+        self.depth = depth
+        self.stats = PboStats(depth, depth)
+
+        self.free: list[int] = []
+        self.pending: deque[_Pending] = deque()
+        self.in_flight = 0
+
+        self.window_frames = 0
+        self.window_stall = 0.0
+
+    @property
+    def buffer_count(self) -> int:
+        return len(self.free) + self.in_flight
+
+    def read(self, read_pixels: Callable[[], None]) -> None:
+        """
+        取得空闲的 PBO 并绑定，然后调用 ``read_pixels`` 读取像素数据
+
+        此时 ``glReadPixels`` 的最后一个参数应为偏移量
+        """
+        # 正在传输的 PBO 达到上限时，阻塞等待最早的一个
+        while self.in_flight >= self.depth:
+            self._drain(wait=True)
+        self._drain(wait=False)
+
+        pbo = self.free.pop() if self.free else self._create_pbo()
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
+        read_pixels()
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        sync = gl.glFenceSync(gl.GL_SYNC_GPU_COMMANDS_COMPLETE, 0)
+        self.pending.append(_Pending(pbo, sync))
+        self.in_flight += 1
+        self.stats.frames += 1
+
+        self._drain(wait=False)
+        self._adapt()
+
+    def skip(self) -> None:
+        """
+        提交一个复用上一帧的帧，不进行读取
+        """
+        self.pending.append(_Pending(None))
+        self._drain(wait=False)
+
+    def finish(self) -> None:
+        while self.pending:
+            self._drain(wait=True)
+        self._delete_pbos(self.free)
+        self.free.clear()
+        self.stats.depth = self.depth
+
+    def _create_pbo(self) -> int:
+        pbo = gl.glGenBuffers(1)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
+        # 分配空间，GL_STREAM_READ 表明数据将从 GPU 读取到 CPU，并且每帧都会更新
+        gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, self.byte_size, None, gl.GL_STREAM_READ)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        return pbo
+
+    @staticmethod
+    def _delete_pbos(pbos: list[int]) -> None:
+        if pbos:
+            gl.glDeleteBuffers(len(pbos), pbos)
+
+    def _drain(self, *, wait: bool) -> None:
+        """
+        按顺序交出已经完成传输的帧；``wait=True`` 时至少交出一个读取的帧，必要时阻塞等待
+        """
+        while self.pending:
+            entry = self.pending[0]
+            if entry.pbo is not None:
+                if not self._is_ready(entry.sync, wait):
+                    return
+                wait = False
+            self.pending.popleft()
+            self._deliver(entry)
+
+    def _is_ready(self, sync, wait: bool) -> bool:
+        status = gl.glClientWaitSync(sync, gl.GL_SYNC_FLUSH_COMMANDS_BIT, 0)
+        if status in (gl.GL_ALREADY_SIGNALED, gl.GL_CONDITION_SATISFIED):
+            return True
+        if status == gl.GL_WAIT_FAILED:
+            raise RuntimeError('glClientWaitSync failed')
+        if not wait:
+            return False
+
+        t = time.perf_counter()
+        with self.perf.stage('pbo_wait'):
+            while status not in (gl.GL_ALREADY_SIGNALED, gl.GL_CONDITION_SATISFIED):
+                if status == gl.GL_WAIT_FAILED:
+                    raise RuntimeError('glClientWaitSync failed')
+                status = gl.glClientWaitSync(sync, 0, 1_000_000_000)
+        elapsed = time.perf_counter() - t
+
+        self.stats.stall_time += elapsed
+        self.stats.stall_count += 1
+        self.window_stall += elapsed
+        return True
+
+    def _deliver(self, entry: _Pending) -> None:
+        if entry.pbo is None:
+            self.on_read(None)
+            return
+
+        gl.glDeleteSync(entry.sync)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, entry.pbo)
+        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
+        assert ptr
+        try:
+            self.on_read(ptr)
+        finally:
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, entry.pbo)
+            gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+
+        self.in_flight -= 1
+        self.free.append(entry.pbo)
+
+    def _adapt(self) -> None:
+        self.window_frames += 1
+        if self.window_frames < PBO_ADAPT_INTERVAL:
+            return
+
+        if self.window_stall > PBO_GROW_THRESHOLD * self.window_frames:
+            self.depth = min(self.depth + 1, PBO_MAX_DEPTH)
+        elif self.window_stall == 0:
+            self.depth = max(self.depth - 1, PBO_MIN_DEPTH)
+            # 释放多余的空闲 PBO
+            extra = self.buffer_count - self.depth
+            if extra > 0:
+                self._delete_pbos(self.free[:extra])
+                del self.free[:extra]
+
+        self.stats.max_depth = max(self.stats.max_depth, self.depth)
+        self.window_frames = 0
+        self.window_stall = 0.0
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import moderngl as mgl
+import numpy as np
+import OpenGL.GL as gl
+
+from janim.camera.camera_info import CameraInfo
+from janim.render.base import Renderer
+from janim.render.program import get_compute_shader_from_file, get_program_from_file_prefix
+from janim.render.renderer.r_vitem_batch import VItemBatchRenderer
+from janim.render.renderer.r_vitem_plane import VItemPlaneRenderer
+from janim.utils.iterables import resize_with_interpolation
+
+if TYPE_CHECKING:
+    from janim.items.vitem import InstancedVItem, VItem
+
+
+class InstancedVItemRenderer(Renderer):
+    """
+    :class:`~.InstancedVItem` 所使用的渲染器
+
+    - 形状的数据只写入一次，由 Compute Shader 映射到各个实例的位置后，
+      通过一次实例化绘制画出所有实例；每个实例只需额外写入位置、颜色以及绘制区域
+    - 需要 OpenGL 4.3 以使用 SSBO 以及 Compute Shader；在兼容模式下，或是启用了深度测试、3D 着色时，
+      会通过 :meth:`~.InstancedVItem.to_items` 将各个实例作为单独的 :class:`~.VItem` 逐个绘制
+    """
+
+    shader_path = 'render/shaders/vitem/vitem_plane/_vitem_plane_instanced_'
+
+    def __init__(self):
+        self.initialized: bool = False
+
+        # 逐个绘制时所使用的物件及其渲染器
+        self.items_key: tuple | None = None
+        self.items: list[VItem] = []
+        self.renderers: list[Renderer] = []
+
+    @staticmethod
+    def is_instanced(ctx: mgl.Context, item: InstancedVItem) -> bool:
+        """
+        是否可以通过实例化绘制 ``item``，否则将各个实例逐个绘制
+        """
+        shape = item.shape
+        return (
+            ctx.version_code >= 430
+            and not item._depth_test
+            and not shape._shade_in_3d
+            and shape.renderer_cls.plane_renderer_cls is VItemPlaneRenderer
+            and len(shape.points._points._data) >= 3
+        )
+
+    def render(self, item: InstancedVItem) -> None:
+        if not item.points.has():
+            return
+
+        if self.is_instanced(self.data_ctx.get().ctx, item):
+            self.render_instanced(item)
+        else:
+            self.render_separately(item)
+
+    def render_separately(self, item: InstancedVItem) -> None:
+        key = (
+            item.shape,
+            item.points._points._data,
+            item.color._rgbas._data,
+            item._fix_in_frame,
+            item._depth_test,
+        )
+        if self.items_key is None or any(a is not b for a, b in zip(key, self.items_key)):
+            if self.items_key is None or item.shape is not self.items_key[0]:
+                self.renderers.clear()
+
+            self.items = list(item.to_items())
+            self.renderers.extend(sub.renderer_cls() for sub in self.items[len(self.renderers) :])
+            self.items_key = key
+
+        for sub, renderer in zip(self.items, self.renderers):
+            renderer.render(sub)
+
+    # region instanced
+
+    def init(self) -> None:
+        self.ctx = self.data_ctx.get().ctx
+
+        self.prog = get_program_from_file_prefix(self.shader_path)
+        self.u_fix = self.get_u_fix_in_frame(self.prog)
+        self.u_DEPTH_TEST = self.prog['DEPTH_TEST']
+        self.u_SHADE_IN_3D = self.prog.get('SHADE_IN_3D', None)
+
+        self.comp = get_compute_shader_from_file('render/shaders/map_instanced_points.comp.glsl')
+        self.comp_u_fix = self.get_u_fix_in_frame(self.comp)
+        self.comp_u_count = self.comp['count']
+        self.comp_u_total = self.comp['total']
+
+        coords = np.array([[0, 0], [0, 1], [1, 0], [1, 1]], dtype=np.float32)
+        self.vbo_coord = self.ctx.buffer(coords.tobytes())
+
+        # 形状的数据，所有实例共用
+        self.vbo_points = self.ctx.buffer(reserve=1)
+        self.vbo_radius = self.ctx.buffer(reserve=1)
+        self.vbo_stroke_color = self.ctx.buffer(reserve=1)
+        self.vbo_fill_color = self.ctx.buffer(reserve=1)
+        self.vbo_anchor_offsets = self.ctx.buffer(np.zeros(3, dtype=np.int32).tobytes())
+        self.vbo_glow_color = self.ctx.buffer(reserve=4 * 4)
+        self.vbo_params = self.ctx.buffer(reserve=3 * 4)
+
+        # 每个实例的数据
+        self.vbo_offsets = self.ctx.buffer(reserve=1)
+        self.vbo_mapped_points = self.ctx.buffer(reserve=1)
+        self.vbo_clip_box = self.ctx.buffer(reserve=1)
+        self.vbo_range = self.ctx.buffer(reserve=1)
+        self.vbo_color = self.ctx.buffer(reserve=1)
+
+        self.vao = self.ctx.vertex_array(
+            self.prog,
+            [
+                (self.vbo_coord, '2f', 'in_coord'),
+                (self.vbo_clip_box, '4f/i', 'in_clip_box'),
+                (self.vbo_range, '2i/i', 'in_range'),
+                (self.vbo_anchor_offsets, '3i/r', 'in_anchor_offsets'),
+                (self.vbo_glow_color, '4f/r', 'in_glow_color'),
+                (self.vbo_params, '3f/r', 'in_params'),
+                (self.vbo_color, '4f/i', 'in_color'),
+            ],
+        )
+
+        # 上一次绘制时的数据，没有变化时不需要重新写入 buffer
+        self.shape: VItem | None = None
+        self.positions: np.ndarray | None = None
+        self.colors: np.ndarray | None = None
+        self.fix_in_frame: bool | None = None
+        self.camera_info: CameraInfo | None = None
+        self.anti_alias_radius: float | None = None
+
+    def render_instanced(self, item: InstancedVItem) -> None:
+        if not self.initialized:
+            self.init()
+            self.initialized = True
+
+        render_data = self.data_ctx.get()
+        shape = item.shape
+        positions = item.points._points._data
+        colors = item.color._rgbas._data
+
+        shape_changed = shape is not self.shape
+        if shape_changed:
+            self._update_shape(shape)
+
+        positions_changed = (
+            shape_changed
+            or positions is not self.positions
+            or item._fix_in_frame != self.fix_in_frame
+            or render_data.camera_info is not self.camera_info
+        )
+        if positions_changed:
+            self._update_mapped_points(positions, item._fix_in_frame)
+
+        if positions_changed or render_data.anti_alias_radius != self.anti_alias_radius:
+            self._update_clip_box(
+                positions,
+                item._fix_in_frame,
+                render_data.camera_info,
+                render_data.anti_alias_radius,
+            )
+
+        if colors is not self.colors or positions_changed:
+            colors = resize_with_interpolation(colors, len(positions))
+            VItemBatchRenderer._write(self.vbo_color, colors.astype(np.float32).tobytes())
+
+        self.shape = shape
+        self.positions = positions
+        self.colors = item.color._rgbas._data
+        self.fix_in_frame = item._fix_in_frame
+        self.camera_info = render_data.camera_info
+        self.anti_alias_radius = render_data.anti_alias_radius
+
+        self.vbo_mapped_points.bind_to_storage_buffer(0)
+        self.vbo_radius.bind_to_storage_buffer(1)
+        self.vbo_stroke_color.bind_to_storage_buffer(2)
+        self.vbo_fill_color.bind_to_storage_buffer(3)
+
+        self.update_fix_in_frame(self.u_fix, item)
+        self.u_DEPTH_TEST.value = False
+        if self.u_SHADE_IN_3D is not None:
+            self.u_SHADE_IN_3D.value = False
+
+        self.vao.render(mgl.TRIANGLE_STRIP, instances=len(positions))
+
+    def _update_shape(self, shape: VItem) -> None:
+        points = shape.points._points._data
+        self.count = len(points)
+        self.lim = (self.count - 1) // 2 * 2
+        anchor_count = (self.count + 1) // 2
+
+        # 与 VItemBatchRenderer._update_buffers 相同，只是只有一个物件
+        points_vec4 = np.zeros((self.count, 4), dtype=np.float32)
+        points_vec4[:, :3] = points
+        radius = resize_with_interpolation(shape.radius._radii._data, anchor_count)
+        radius = np.pad(radius.astype(np.float32), (0, -len(radius) % 4))
+        stroke = resize_with_interpolation(shape.stroke._rgbas._data, anchor_count)
+        fill = resize_with_interpolation(shape.fill._rgbas._data, anchor_count)
+
+        VItemBatchRenderer._write(self.vbo_points, points_vec4.tobytes())
+        VItemBatchRenderer._write(self.vbo_radius, radius.tobytes())
+        VItemBatchRenderer._write(self.vbo_stroke_color, stroke.astype(np.float32).tobytes())
+        VItemBatchRenderer._write(self.vbo_fill_color, fill.astype(np.float32).tobytes())
+
+        glow_color = shape.glow._rgba._data.astype(np.float32)
+        params = [shape.glow._size, shape.stroke_background, shape.fill.is_transparent()]
+        self.vbo_glow_color.write(glow_color.tobytes())
+        self.vbo_params.write(np.array(params, dtype=np.float32).tobytes())
+
+        self.corners = np.array(shape.points.self_box.get_corners())
+        self.buff = shape.radius._radii._data.max()
+        self.glow_size = shape.glow._size if glow_color[3] != 0.0 else None
+
+    def _update_mapped_points(self, positions: np.ndarray, fix_in_frame: bool) -> None:
+        offsets = np.zeros((len(positions), 4), dtype=np.float32)
+        offsets[:, :3] = positions
+        VItemBatchRenderer._write(self.vbo_offsets, offsets.tobytes())
+
+        total = len(positions) * self.count
+        if self.vbo_mapped_points.size != total * 16:
+            self.vbo_mapped_points.orphan(total * 16)
+
+        self.vbo_points.bind_to_storage_buffer(0)
+        self.vbo_offsets.bind_to_storage_buffer(1)
+        self.vbo_mapped_points.bind_to_storage_buffer(2)
+        self.comp_u_fix.value = fix_in_frame
+        self.comp_u_count.value = self.count
+        self.comp_u_total.value = total
+
+        # 让 Compute Shader 能正确读取到 vbo_points 和 vbo_offsets (SSBO)
+        self.ctx.memory_barrier(gl.GL_VERTEX_ATTRIB_ARRAY_BARRIER_BIT)
+
+        self.comp.run(group_x=(total + 255) // 256)  # 相当于 total / 256 向上取整
+
+        # 让后续渲染能正确读取到 vbo_mapped_points (SSBO)
+        self.ctx.memory_barrier(gl.GL_SHADER_STORAGE_BARRIER_BIT)
+
+        ranges = np.column_stack(
+            [np.arange(len(positions)) * self.count, np.full(len(positions), self.lim)]
+        )
+        VItemBatchRenderer._write(self.vbo_range, ranges.astype(np.int32).tobytes())
+
+    def _update_clip_box(
+        self,
+        positions: np.ndarray,
+        fix_in_frame: bool,
+        camera_info: CameraInfo,
+        anti_alias_radius: float,
+    ) -> None:
+        buff = self.buff + anti_alias_radius
+        if self.glow_size is not None:
+            buff = max(buff, self.glow_size)
+
+        corners = self.corners[None, :, :] + positions[:, None, :]
+        clip_box = VItemBatchRenderer.get_clip_boxes(
+            corners, np.full(len(positions), buff), fix_in_frame, camera_info
+        )
+        VItemBatchRenderer._write(self.vbo_clip_box, clip_box.astype(np.float32).tobytes())
+
+    # endregion
@@ -21,6 +21,8 @@ _ = get_translator('janim.render.renderer.r_video')
 
 
 class VideoRenderer(Renderer):
+    time_invariant = False
+
     def __init__(self):
         self.initialized: bool = False
 
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from janim.render.base import Renderer
+from janim.render.renderer.r_vitem_batch import VItemBatchRenderer
 from janim.render.renderer.r_vitem_curve import VItemCurveRenderer
 from janim.render.renderer.r_vitem_plane import VItemPlaneRenderer
 
@@ -13,6 +14,7 @@ if TYPE_CHECKING:
 class VItemRenderer(Renderer):
     plane_renderer_cls = VItemPlaneRenderer
     curve_renderer_cls = VItemCurveRenderer
+    batch_cls = VItemBatchRenderer
 
     def __init__(self):
         self.plane_renderer = self.plane_renderer_cls()
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import moderngl as mgl
+import numpy as np
+import OpenGL.GL as gl
+
+from janim.camera.camera_info import CameraInfo
+from janim.render.base import BatchRenderer, Renderer
+from janim.render.program import get_compute_shader_from_file, get_program_from_file_prefix
+from janim.render.renderer.r_vitem_plane import VItemPlaneRenderer
+from janim.utils.iterables import resize_with_interpolation
+
+if TYPE_CHECKING:
+    from janim.items.vitem import VItem
+
+
+class VItemBatchRenderer(BatchRenderer):
+    """
+    将连续的多个 :class:`~.VItem` 合并为一次绘制
+
+    - 只合并会由 :class:`~.VItemPlaneRenderer` 绘制，并且没有启用深度测试和 3D 着色的物件；
+      另外，``fix_in_frame`` 不同的物件不会被合并
+    - 所有物件的数据依次存放在同一组 buffer 中，每个物件作为一个实例，
+      只需一次 Compute Shader 调用以及一次实例化绘制；
+      同一次绘制中的实例按照先后顺序混合，因此结果与逐个绘制相同
+    - 多个物件共用同一份数据时（见 :meth:`~.Array.is_share`，例如通过复制得到的物件），
+      这份数据只写入一次，各个实例引用相同的位置；
+      对于只有位置和颜色不同的大量相同形状，可以使用 :class:`~.InstancedVItem`
+
+    需要 OpenGL 4.3 以使用 SSBO 以及 Compute Shader，在兼容模式下不进行合并
+    """
+
+    shader_path = 'render/shaders/vitem/vitem_plane/_vitem_plane_batch_'
+
+    def __init__(self):
+        self.initialized: bool = False
+
+    @staticmethod
+    def is_supported(ctx: mgl.Context) -> bool:
+        return ctx.version_code >= 430
+
+    @staticmethod
+    def get_key(item: VItem) -> bool | None:
+        if item.renderer_cls.plane_renderer_cls is not VItemPlaneRenderer:
+            return None
+        if item._depth_test or item._shade_in_3d:
+            return None
+        if len(item.points._points._data) < 3:
+            return None
+        return item._fix_in_frame
+
+    def init(self) -> None:
+        self.ctx = Renderer.data_ctx.get().ctx
+
+        self.prog = get_program_from_file_prefix(self.shader_path)
+        self.u_fix = Renderer.get_u_fix_in_frame(self.prog)
+        self.u_DEPTH_TEST = self.prog['DEPTH_TEST']
+        self.u_SHADE_IN_3D = self.prog.get('SHADE_IN_3D', None)
+
+        self.comp = get_compute_shader_from_file('render/shaders/map_points.comp.glsl')
+        self.comp_u_fix = Renderer.get_u_fix_in_frame(self.comp)
+
+        coords = np.array([[0, 0], [0, 1], [1, 0], [1, 1]], dtype=np.float32)
+        self.vbo_coord = self.ctx.buffer(coords.tobytes())
+
+        self.vbo_points = self.ctx.buffer(reserve=1)
+        self.vbo_mapped_points = self.ctx.buffer(reserve=1)
+        self.vbo_radius = self.ctx.buffer(reserve=1)
+        self.vbo_stroke_color = self.ctx.buffer(reserve=1)
+        self.vbo_fill_color = self.ctx.buffer(reserve=1)
+
+        # 每个实例（即每个物件）的属性
+        self.vbo_clip_box = self.ctx.buffer(reserve=1)
+        self.vbo_range = self.ctx.buffer(reserve=1)
+        self.vbo_glow_color = self.ctx.buffer(reserve=1)
+        self.vbo_params = self.ctx.buffer(reserve=1)
+
+        self.vao = self.ctx.vertex_array(
+            self.prog,
+            [
+                (self.vbo_coord, '2f', 'in_coord'),
+                (self.vbo_clip_box, '4f/i', 'in_clip_box'),
+                (self.vbo_range, '2i 3i/i', 'in_range', 'in_anchor_offsets'),
+                (self.vbo_glow_color, '4f/i', 'in_glow_color'),
+                (self.vbo_params, '3f/i', 'in_params'),
+            ],
+        )
+
+        # 上一次绘制时的物件数据，都没有变化时不需要重新写入 buffer
+        self.camera_info: CameraInfo | None = None
+        self.anti_alias_radius: float | None = None
+        self.arrays: list[np.ndarray] = []
+        self.values: list[tuple] = []
+
+    def render(self, items: list[VItem]) -> None:
+        if not self.initialized:
+            self.init()
+            self.initialized = True
+
+        render_data = Renderer.data_ctx.get()
+        fix_in_frame = items[0]._fix_in_frame
+
+        arrays = [
+            array
+            for item in items
+            for array in (
+                item.points._points._data,
+                item.radius._radii._data,
+                item.stroke._rgbas._data,
+                item.fill._rgbas._data,
+                item.glow._rgba._data,
+            )
+        ]
+        values = [(item._fix_in_frame, item.stroke_background, item.glow._size) for item in items]
+
+        if (
+            render_data.camera_info is not self.camera_info
+            or render_data.anti_alias_radius != self.anti_alias_radius
+            or len(arrays) != len(self.arrays)
+            or any(a is not b for a, b in zip(arrays, self.arrays))
+            or values != self.values
+        ):
+            self._update_buffers(items, render_data.camera_info, render_data.anti_alias_radius)
+            self.camera_info = render_data.camera_info
+            self.anti_alias_radius = render_data.anti_alias_radius
+            self.arrays = arrays
+            self.values = values
+
+        self.vbo_mapped_points.bind_to_storage_buffer(0)
+        self.vbo_radius.bind_to_storage_buffer(1)
+        self.vbo_stroke_color.bind_to_storage_buffer(2)
+        self.vbo_fill_color.bind_to_storage_buffer(3)
+
+        self.u_fix.value = fix_in_frame
+        self.u_DEPTH_TEST.value = False
+        if self.u_SHADE_IN_3D is not None:
+            self.u_SHADE_IN_3D.value = False
+
+        self.vao.render(mgl.TRIANGLE_STRIP, instances=len(items))
+
+    def _update_buffers(
+        self, items: list[VItem], camera_info: CameraInfo, anti_alias_radius: float
+    ) -> None:
+        fix_in_frame = items[0]._fix_in_frame
+
+        points_list = [item.points._points._data for item in items]
+        counts = np.array([len(points) for points in points_list])
+        anchor_counts = (counts + 1) // 2
+        radius_list = [item.radius._radii._data for item in items]
+
+        # 逐个绘制时使用的数据，另见 VItemPlaneRenderer.render_normal
+        # 其中相同的数据只写入一份，例如通过复制得到的物件在修改之前都共用同样的数据
+        point_offsets, points_unique = self._pack(points_list, counts)
+        radius_offsets, radius_unique = self._pack(radius_list, anchor_counts)
+        stroke_offsets, stroke_unique = self._pack(
+            [item.stroke._rgbas._data for item in items], anchor_counts
+        )
+        fill_offsets, fill_unique = self._pack(
+            [item.fill._rgbas._data for item in items], anchor_counts
+        )
+
+        points = np.zeros((sum(map(len, points_unique)), 4), dtype=np.float32)
+        points[:, :3] = np.concatenate(points_unique)
+        radius = np.concatenate(radius_unique).astype(np.float32)
+        # radius 以 vec4 的形式读取，需要补齐到 4 的倍数
+        radius = np.pad(radius, (0, -len(radius) % 4))
+        stroke = np.concatenate(stroke_unique).astype(np.float32)
+        fill = np.concatenate(fill_unique).astype(np.float32)
+
+        self._write(self.vbo_points, points.tobytes())
+        self._write(self.vbo_radius, radius.tobytes())
+        self._write(self.vbo_stroke_color, stroke.tobytes())
+        self._write(self.vbo_fill_color, fill.tobytes())
+
+        if self.vbo_mapped_points.size != self.vbo_points.size:
+            self.vbo_mapped_points.orphan(self.vbo_points.size)
+
+        self.vbo_points.bind_to_storage_buffer(0)
+        self.vbo_mapped_points.bind_to_storage_buffer(1)
+        self.comp_u_fix.value = fix_in_frame
+
+        # 让 Compute Shader 能正确读取到 vbo_points (SSBO)
+        self.ctx.memory_barrier(gl.GL_VERTEX_ATTRIB_ARRAY_BARRIER_BIT)
+
+        self.comp.run(group_x=(len(points) + 255) // 256)  # 相当于 len() / 256 向上取整
+
+        # 让后续渲染能正确读取到 vbo_mapped_points (SSBO)
+        self.ctx.memory_barrier(gl.GL_SHADER_STORAGE_BARRIER_BIT)
+
+        corners = np.array([item.points.self_box.get_corners() for item in items])
+        glow_colors = np.array([item.glow._rgba._data for item in items], dtype=np.float32)
+        glow_sizes = np.array([item.glow._size for item in items], dtype=np.float32)
+        buff = np.array([radius.max() for radius in radius_list]) + anti_alias_radius
+        buff = np.where(glow_colors[:, 3] != 0.0, np.maximum(buff, glow_sizes), buff)
+        clip_box = self.get_clip_boxes(corners, buff, fix_in_frame, camera_info)
+
+        ranges = np.column_stack(
+            [point_offsets, (counts - 1) // 2 * 2, radius_offsets, stroke_offsets, fill_offsets]
+        )
+        params = np.column_stack(
+            [
+                glow_sizes,
+                [item.stroke_background for item in items],
+                [item.fill.is_transparent() for item in items],
+            ]
+        )
+
+        self._write(self.vbo_clip_box, clip_box.astype(np.float32).tobytes())
+        self._write(self.vbo_range, ranges.astype(np.int32).tobytes())
+        self._write(self.vbo_glow_color, glow_colors.tobytes())
+        self._write(self.vbo_params, params.astype(np.float32).tobytes())
+
+    @staticmethod
+    def get_clip_boxes(
+        corners: np.ndarray, buff: np.ndarray, fix_in_frame: bool, camera_info: CameraInfo
+    ) -> np.ndarray:
+        """
+        与 :meth:`~.VItemPlaneRenderer._update_clip_box` 相同，但一次计算多个物件的
+
+        ``corners`` 的形状为 ``(n, 8, 3)``，即每个物件边界框的角；``buff`` 是每个物件向外扩展的距离
+
+        返回的每一行是 ``(min_x, min_y, max_x, max_y)``
+        """
+        if fix_in_frame:
+            mapped = camera_info.map_fixed_in_frame_points(corners.reshape(-1, 3))
+        else:
+            mapped = camera_info.map_points(corners.reshape(-1, 3))
+        mapped = mapped.reshape(len(corners), -1, 2) * camera_info.frame_radius
+
+        clip_min = mapped.min(axis=1) - buff[:, None]
+        clip_max = mapped.max(axis=1) + buff[:, None]
+        clip_box = np.hstack([clip_min, clip_max]) / np.tile(camera_info.frame_radius, 2)
+        return np.clip(clip_box, -1, 1)
+
+    @staticmethod
+    def _pack(arrays: list[np.ndarray], counts: np.ndarray) -> tuple[list[int], list[np.ndarray]]:
+        """
+        将 ``arrays`` 中的数组分别调整到 ``counts`` 中对应的长度，用于拼接写入同一个 buffer
+
+        返回每个数组在拼接后的偏移，以及需要拼接的数组；是同一个对象并且长度相同的数组只会出现一次
+        """
+        offsets: list[int] = []
+        unique: list[np.ndarray] = []
+        found: dict[tuple[int, int], int] = {}
+        total = 0
+        for array, count in zip(arrays, counts):
+            key = (id(array), count)
+            offset = found.get(key, None)
+            if offset is None:
+                offset = found[key] = total
+                unique.append(resize_with_interpolation(array, count))
+                total += count
+            offsets.append(offset)
+        return offsets, unique
+
+    @staticmethod
+    def _write(vbo: mgl.Buffer, data: bytes) -> None:
+        if len(data) != vbo.size:
+            vbo.orphan(len(data))
+        vbo.write(data)
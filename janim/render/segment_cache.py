@@ -0,0 +1,352 @@
+"""
+按区段缓存已编码的视频，使得修改时间轴的一部分后再次输出时，只需要重新渲染发生变化的区段
+
+输出的帧范围被划分为固定时长的区段，每个区段单独编码为一个文件（因此总是从关键帧开始），
+并以该区段的内容摘要命名存放在缓存目录中；摘要包含了影响这些帧的所有数据：
+
+- 与渲染有关的配置项以及编码方式
+- 每一帧中摄像机、光源和所有可见物件的数据，另见 :meth:`~.BuiltTimeline.compute_frame_items`
+
+再次输出时，摘要没有变化的区段直接使用缓存的文件，最后无损拼接为完整的视频
+
+如果某一帧的画面无法通过数据确定（例如有视频物件或额外渲染），那么该区段不会被缓存，每次都会重新渲染
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import types
+from enum import Enum
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from PIL import Image
+from tqdm import tqdm as ProgressDisplay
+
+import janim
+from janim.components.component import Component, _CmptGroup
+from janim.components.depth import Cmpt_Depth
+from janim.items.item import Item
+from janim.locale import get_translator
+from janim.logger import log
+from janim.utils.data import Array
+from janim.utils.file_ops import guarantee_existence
+from janim.utils.signal import SIGNAL_OBJ_SLOTS_NAME
+
+if TYPE_CHECKING:
+    from janim.anims.timeline import BuiltTimeline
+    from janim.render.writer import VideoWriter
+
+_ = get_translator('janim.render.segment_cache')
+
+SEGMENT_DURATION = 2
+
+# 缓存的版本，当摘要的计算方式或者编码方式发生变化时需要增加，使得旧的缓存失效
+CACHE_VERSION = 1
+
+# 影响渲染结果的配置项
+RENDER_CONFIG_KEYS = (
+    'fps',
+    'anti_alias_width',
+    'frame_height',
+    'frame_width',
+    'pixel_height',
+    'pixel_width',
+    'background_color',
+)
+
+
+class Uncacheable(Exception):
+    """
+    表示遇到了无法确定内容的数据，所在的区段不能被缓存
+    """
+
+
+class Hasher:
+    """
+    计算数据的摘要
+
+    只接受能够确定内容的数据：基本类型、numpy 数组、PIL 图像，以及由它们组成的容器和对象，
+    遇到其它数据时抛出 :class:`Uncacheable`
+    """
+
+    MAX_DEPTH = 8
+
+    # 物件和组件中与渲染结果无关的属性
+    ITEM_SKIPPED_ATTRS = {'timeline', '_stored', 'refresh_data'}
+    CMPT_SKIPPED_ATTRS = {'refresh_data', 'bind', SIGNAL_OBJ_SLOTS_NAME}
+
+    def __init__(self):
+        self.h = hashlib.blake2b(digest_size=16)
+        self.order_ranks: dict[int, int] = {}
+        # 图像一般在多帧之间共用，所以缓存其摘要；同时持有图像的引用，避免 id 被复用
+        self.image_digests: dict[int, tuple[Image.Image, bytes]] = {}
+
+    def hexdigest(self) -> str:
+        return self.h.hexdigest()
+
+    def update_tag(self, tag: str) -> None:
+        self.h.update(tag.encode())
+        self.h.update(b'\0')
+
+    def update_frame(self, items: list[Item]) -> None:
+        """
+        一帧中所有物件的数据
+
+        其中 :class:`~.Cmpt_Depth` 的 ``_order`` 来自全局的计数，只有相对大小会影响绘制顺序，
+        所以替换为在这一帧中的排名，使得在其它位置增删物件不会影响摘要
+        """
+        orders = sorted({item.depth._order for item in items})
+        self.order_ranks = {order: i for i, order in enumerate(orders)}
+
+        self.update_tag(f'frame:{len(items)}')
+        for item in items:
+            self.update_item(item)
+
+    def update_item(self, item: Item) -> None:
+        """
+        物件自身的基本类型属性（例如 ``_fix_in_frame``）以及所有组件的数据；不包括子物件
+        """
+        self.update_tag(f'item:{type(item).__module__}.{type(item).__qualname__}')
+        for key, value in vars(item).items():
+            if key in self.ITEM_SKIPPED_ATTRS or not isinstance(value, (bool, int, float, str)):
+                continue
+            self.update_tag(key)
+            self.update(value)
+        for key, cmpt in item.components.items():
+            self.update_tag(key)
+            self.update_component(cmpt)
+
+    def update_component(self, cmpt: Component, depth: int = 0) -> None:
+        self.update_tag(f'cmpt:{type(cmpt).__module__}.{type(cmpt).__qualname__}')
+        # _CmptGroup 只是对其它组件的引用，而那些组件会另外计算
+        if isinstance(cmpt, _CmptGroup):
+            return
+        if isinstance(cmpt, Cmpt_Depth):
+            self.update(cmpt._depth)
+            self.update(self.order_ranks[cmpt._order])
+            return
+        # 例如 Cmpt_List、Cmpt_Dict
+        if isinstance(cmpt, (list, dict)):
+            self.update(list(cmpt.items()) if isinstance(cmpt, dict) else list(cmpt), depth + 1)
+        for key, value in vars(cmpt).items():
+            if key in self.CMPT_SKIPPED_ATTRS:
+                continue
+            self.update_tag(key)
+            self.update(value, depth + 1)
+
+    def update(self, value: Any, depth: int = 0) -> None:
+        if depth > self.MAX_DEPTH:
+            raise Uncacheable()
+
+        match value:
+            case None | bool() | int() | float() | complex() | str() | Enum() | np.generic():
+                self.update_tag(f'{type(value).__name__}:{value!r}')
+
+            case bytes():
+                self.update_tag(f'bytes:{len(value)}')
+                self.h.update(value)
+
+            case Array():
+                self.update_array(value.data)
+
+            case np.ndarray():
+                self.update_array(value)
+
+            case list() | tuple():
+                self.update_tag(f'{type(value).__name__}:{len(value)}')
+                for v in value:
+                    self.update(v, depth + 1)
+
+            case dict():
+                self.update_tag(f'dict:{len(value)}')
+                for k, v in value.items():
+                    self.update(k, depth + 1)
+                    self.update(v, depth + 1)
+
+            case Image.Image():
+                self.update_image(value)
+
+            case types.FunctionType():
+                self.update_tag(f'function:{value.__module__}.{value.__qualname__}')
+                self.h.update(value.__code__.co_code)
+                for cell in value.__closure__ or ():
+                    self.update(cell.cell_contents, depth + 1)
+
+            case types.BuiltinFunctionType() | type():
+                self.update_tag(f'{type(value).__name__}:{value.__module__}.{value.__qualname__}')
+
+            case Item() | Component():
+                # 物件和组件只会通过 update_item 计算，在其它数据中出现时无法确定其作用
+                raise Uncacheable()
+
+            case _ if hasattr(value, '__dict__'):
+                self.update_tag(f'object:{type(value).__module__}.{type(value).__qualname__}')
+                for k, v in vars(value).items():
+                    if k == SIGNAL_OBJ_SLOTS_NAME:
+                        continue
+                    self.update_tag(k)
+                    self.update(v, depth + 1)
+
+            case _:
+                raise Uncacheable()
+
+    def update_array(self, array: np.ndarray) -> None:
+        if array.dtype.hasobject:
+            raise Uncacheable()
+        self.update_tag(f'ndarray:{array.dtype.str}:{array.shape}')
+        self.h.update(np.ascontiguousarray(array).data)
+
+    def update_image(self, image: Image.Image) -> None:
+        cached = self.image_digests.get(id(image))
+        if cached is None:
+            digest = hashlib.blake2b(image.tobytes(), digest_size=16).digest()
+            self.image_digests[id(image)] = cached = (image, digest)
+        self.update_tag(f'image:{image.mode}:{image.size}')
+        self.h.update(cached[1])
+
+
+def get_segment_cache_dir() -> str:
+    from janim.utils.config import Config
+
+    return guarantee_existence(os.path.join(Config.get.temp_dir, 'segment_cache'))
+
+
+def split_segments(built: BuiltTimeline, start_frame: int, end_frame: int) -> list[tuple[int, int]]:
+    """
+    将 ``[start_frame, end_frame)`` 按照 :data:`SEGMENT_DURATION` 划分为区段
+
+    区段的边界对齐到整段时间轴上 :data:`SEGMENT_DURATION` 的整数倍，
+    使得修改入点和出点时，中间的区段仍然与之前相同
+    """
+    segment_frames = SEGMENT_DURATION * built.cfg.fps
+    bounds = [start_frame]
+    first_bound = (start_frame // segment_frames + 1) * segment_frames
+    bounds.extend(range(first_bound, end_frame, segment_frames))
+    bounds.append(end_frame)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def compute_segment_key(
+    built: BuiltTimeline,
+    hasher: Hasher,
+    start_frame: int,
+    end_frame: int,
+) -> str | None:
+    """
+    计算区段 ``[start_frame, end_frame)`` 的摘要，无法缓存时返回 ``None``
+
+    ``hasher`` 中应当已经包含了配置项、编码方式等与区段无关的信息，这里会在其副本上继续计算
+    """
+    seg_hasher = Hasher()
+    seg_hasher.h = hasher.h.copy()
+    seg_hasher.image_digests = hasher.image_digests
+    seg_hasher.update_tag(f'segment:{start_frame}:{end_frame}')
+
+    fps = built.cfg.fps
+    prev_fingerprint: tuple | None = None
+
+    for frame in range(start_frame, end_frame):
+        # 与上一帧相同时不必再计算物件数据
+        fingerprint = built.static_fingerprint(frame / fps)
+        if fingerprint is not None and fingerprint == prev_fingerprint:
+            seg_hasher.update_tag('same')
+            continue
+        prev_fingerprint = fingerprint
+
+        items = built.compute_frame_items(frame / fps)
+        if items is None:
+            return None
+
+        try:
+            seg_hasher.update_frame(items)
+        except Uncacheable:
+            return None
+
+    return seg_hasher.hexdigest()
+
+
+def write_video_with_segment_cache(
+    writer: VideoWriter,
+    file_path: str,
+    start_frame: int,
+    end_frame: int,
+    *,
+    use_pbo: bool,
+    hwaccel: bool,
+    gpu_yuv: bool,
+    reuse_frames: bool,
+) -> tuple[int, int, int]:
+    """
+    将 ``[start_frame, end_frame)`` 输出到 ``file_path``，其中内容未变化的区段直接使用缓存
+
+    返回值依次是命中缓存的区段数、区段总数，
+    以及被复用的帧数（另见 :meth:`~.VideoWriter.write_frames`）
+    """
+    from janim.render.encoder import PyavVideoEncoder
+    from janim.render.writer import concat_videos
+
+    built = writer.built
+    cache_dir = get_segment_cache_dir()
+    stem, ext = os.path.splitext(file_path)
+
+    hasher = Hasher()
+    hasher.update_tag(f'janim:{janim.__version__}:{CACHE_VERSION}')
+    hasher.update_tag(f'encoder:{ext}:{hwaccel}:{gpu_yuv}')
+    hasher.update(PyavVideoEncoder.CODEC_CONFIGS.get(ext))
+    for key in RENDER_CONFIG_KEYS:
+        hasher.update_tag(key)
+        hasher.update(getattr(built.cfg, key))
+
+    segments = split_segments(built, start_frame, end_frame)
+    part_paths: list[str] = []
+    uncached_paths: list[str] = []
+    hit_count = 0
+    reused_count = 0
+
+    progress_display = ProgressDisplay(
+        total=end_frame - start_frame,
+        leave=False,
+        dynamic_ncols=True,
+    )
+    with progress_display:
+        for i, (seg_start, seg_end) in enumerate(segments):
+            key = compute_segment_key(built, hasher, seg_start, seg_end)
+            if key is None:
+                part_path = f'{stem}_seg{i}{ext}'
+                uncached_paths.append(part_path)
+            else:
+                part_path = os.path.join(cache_dir, key + ext)
+            part_paths.append(part_path)
+
+            if key is not None and os.path.exists(part_path):
+                hit_count += 1
+                progress_display.update(seg_end - seg_start)
+                continue
+
+            writer.open_video_pipe(part_path, hwaccel, gpu_yuv)
+            reused_count += writer.write_frames(
+                _report_progress(range(seg_start, seg_end), progress_display),
+                seg_start,
+                seg_end,
+                use_pbo=use_pbo,
+                reuse_frames=reuse_frames,
+            )
+            # 先写入临时文件再移动，使得中断时不会留下不完整的缓存
+            writer.close_video_pipe(False)
+
+    log.debug(f'Segment cache: {hit_count}/{len(segments)} hit, cache_dir="{cache_dir}"')
+
+    writer.set_file_paths(file_path)
+    concat_videos(part_paths, writer.temp_file_path, remove=False)
+    for part_path in uncached_paths:
+        os.remove(part_path)
+
+    return hit_count, len(segments), reused_count
+
+
+def _report_progress(frames: range, progress_display: ProgressDisplay):
+    for frame in frames:
+        yield frame
+        progress_display.update(1)
@@ -0,0 +1,43 @@
+#version 430 core
+
+// 与 map_points.comp.glsl 类似，但是将同一组点分别平移到各个实例的位置后再进行映射
+// 第 i 个实例的第 j 个点会被写入到 mapped_points[i * count + j]
+
+layout(local_size_x = 256) in;
+
+layout(std140, binding = 0) buffer InputBuffer {
+    vec4 points[];      // (x, y, z, 0)
+};
+
+layout(std140, binding = 1) buffer OffsetBuffer {
+    vec4 offsets[];     // (x, y, z, 0)
+};
+
+layout(std140, binding = 2) buffer OutputBuffer {
+    vec4 mapped_points[];     // (x, y, 0, 0)
+};
+
+uniform int count;
+uniform int total;
+
+uniform bool JA_FIX_IN_FRAME;
+uniform mat4 JA_VIEW_MATRIX;
+uniform mat4 JA_PROJ_MATRIX;
+uniform float JA_FIXED_DIST_FROM_PLANE;
+uniform vec2 JA_FRAME_RADIUS;
+
+void main() {
+    int index = int(gl_GlobalInvocationID.x);
+    if (index >= total)
+        return;
+
+    vec3 p = points[index % count].xyz + offsets[index / count].xyz;
+
+    vec4 point;
+    if (JA_FIX_IN_FRAME) {
+        point = JA_PROJ_MATRIX * vec4(p.xy, p.z - JA_FIXED_DIST_FROM_PLANE, 1.0);
+    } else {
+        point = JA_PROJ_MATRIX * JA_VIEW_MATRIX * vec4(p, 1.0);
+    }
+    mapped_points[index].xy = (point.xy / point.w) * JA_FRAME_RADIUS;
+}
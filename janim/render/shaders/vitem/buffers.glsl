@@ -47,6 +47,19 @@ vec4 get_fill(int anchor_idx) {
 
 #else
 
+// 合并绘制时，多个物件的数据依次存放在同一个 buffer 中，需要加上各自的偏移
+#ifdef BATCH
+#define POINT_OFFSET v_range.x
+#define RADIUS_OFFSET v_anchor_offsets.x
+#define COLOR_OFFSET v_anchor_offsets.y
+#define FILL_OFFSET v_anchor_offsets.z
+#else
+#define POINT_OFFSET 0
+#define RADIUS_OFFSET 0
+#define COLOR_OFFSET 0
+#define FILL_OFFSET 0
+#endif
+
 layout(std140, binding = 0) buffer MappedPoints
 {
     vec4 points[];  // vec4(x, y, 0 or depth, 0)
@@ -66,26 +79,27 @@ layout(std140, binding = 3) buffer Fills
 };
 
 vec2 get_point(int idx) {
-    return points[idx].xy;
+    return points[POINT_OFFSET + idx].xy;
 }
 
 vec3 get_point_with_depth(int idx) {
-    return points[idx].xyz;
+    return points[POINT_OFFSET + idx].xyz;
 }
 
 float get_radius(int anchor_idx) {
+    int i = RADIUS_OFFSET + anchor_idx;
     if (JA_FIX_IN_FRAME) {
-        return radii[anchor_idx / 4][anchor_idx % 4] * JA_CAMERA_SCALED_FACTOR;
+        return radii[i / 4][i % 4] * JA_CAMERA_SCALED_FACTOR;
     }
-    return radii[anchor_idx / 4][anchor_idx % 4];
+    return radii[i / 4][i % 4];
 }
 
 vec4 get_color(int anchor_idx) {
-    return colors[anchor_idx];
+    return colors[COLOR_OFFSET + anchor_idx];
 }
 
 vec4 get_fill(int anchor_idx) {
-    return fills[anchor_idx];
+    return fills[FILL_OFFSET + anchor_idx];
 }
 
 #endif
@@ -1,7 +1,9 @@
 #include "inputs.glsl"
 #include "../buffers.glsl"
 
-#ifdef COMPATIBILITY
+#if defined(BATCH)
+int get_lim() { return v_range.y; }
+#elif defined(COMPATIBILITY)
 uniform int lim;
 int get_lim() { return lim; }
 #else
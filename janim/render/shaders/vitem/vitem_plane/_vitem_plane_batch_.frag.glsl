@@ -0,0 +1,3 @@
+#version 430 core
+#define BATCH
+#include "_main_.frag.glsl"
@@ -0,0 +1,40 @@
+#version 330 core
+
+// 合并绘制多个物件时所使用的顶点着色器，每个物件是一个实例
+
+in vec2 in_coord;               // 四个角 (0, 0) (0, 1) (1, 0) (1, 1)
+
+in vec4 in_clip_box;            // (min_x, min_y, max_x, max_y)
+in ivec2 in_range;              // (point_offset, lim)
+in ivec3 in_anchor_offsets;     // (radius_offset, color_offset, fill_offset)
+in vec4 in_glow_color;
+in vec3 in_params;              // (glow_size, stroke_background, is_fill_transparent)
+#ifdef INSTANCED
+in vec4 in_color;               // 与描边和填充颜色相乘
+#endif
+
+out vec2 v_coord;
+flat out ivec2 v_range;
+flat out ivec3 v_anchor_offsets;
+flat out vec4 v_glow_color;
+flat out vec3 v_params;
+#ifdef INSTANCED
+flat out vec4 v_color;
+#endif
+
+uniform vec2 JA_FRAME_RADIUS;
+
+void main()
+{
+    vec2 coord = mix(in_clip_box.xy, in_clip_box.zw, in_coord);
+    gl_Position = vec4(coord, 0.0, 1.0);
+
+    v_coord = coord * JA_FRAME_RADIUS;
+    v_range = in_range;
+    v_anchor_offsets = in_anchor_offsets;
+    v_glow_color = in_glow_color;
+    v_params = in_params;
+#ifdef INSTANCED
+    v_color = in_color;
+#endif
+}
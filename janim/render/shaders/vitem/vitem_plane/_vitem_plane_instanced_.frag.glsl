@@ -0,0 +1,4 @@
+#version 430 core
+#define BATCH
+#define INSTANCED
+#include "_main_.frag.glsl"
@@ -0,0 +1,6 @@
+#version 330 core
+
+// 绘制 InstancedVItem 时所使用的顶点着色器，在合并绘制的基础上，每个实例额外带有颜色
+
+#define INSTANCED
+#include "_vitem_plane_batch_.vert.glsl"
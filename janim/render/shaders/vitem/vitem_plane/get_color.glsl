@@ -47,6 +47,11 @@ vec4 get_vitem_color(float stroke_d, float fill_sgn_d, int idx, int lim)
     vec4 stroke_color = mix(get_color(anchor_idx), get_color(anchor_idx + 1), ratio);
     stroke_color.a *= smoothstep(1, -1, (stroke_d - radius) / JA_ANTI_ALIAS_RADIUS);
 
+    #ifdef INSTANCED
+    fill_color *= v_color;
+    stroke_color *= v_color;
+    #endif
+
     vec4 result_color = stroke_background
         ? blend_color(fill_color, stroke_color)
         : blend_color(stroke_color, fill_color);
@@ -1,9 +1,26 @@
 in vec2 v_coord;
 
+#ifdef BATCH
+// 合并绘制时，这些属性对于每个物件各不相同，由顶点着色器传入
+flat in ivec2 v_range;              // (point_offset, lim)
+flat in ivec3 v_anchor_offsets;     // (radius_offset, color_offset, fill_offset)
+flat in vec4 v_glow_color;
+flat in vec3 v_params;      // (glow_size, stroke_background, is_fill_transparent)
+
+#define stroke_background (v_params.y != 0.0)
+#define is_fill_transparent (v_params.z != 0.0)
+#define glow_color v_glow_color
+#define glow_size v_params.x
+
+#ifdef INSTANCED
+flat in vec4 v_color;               // 每个实例的颜色，与描边和填充颜色相乘
+#endif
+#else
 uniform bool stroke_background;
 uniform bool is_fill_transparent;
 uniform vec4 glow_color;
 uniform float glow_size;
+#endif
 
 uniform vec3 unit_normal;
 uniform vec3 start_point;
@@ -1,8 +1,11 @@
+from __future__ import annotations
+
 import os
 import shutil
 import time
+from dataclasses import asdict
 from functools import partial
-from typing import Generator
+from typing import TYPE_CHECKING, Iterable
 
 import moderngl as mgl
 import OpenGL.GL as gl
@@ -13,16 +16,21 @@ from janim.locale import get_translator
 from janim.logger import log
 from janim.render.base import apply_blend_flags, create_context_430_or_330
 from janim.render.encoder import (
+    AudioTrack,
     FFmpegH264VideoEncoder,
+    ImageSequenceEncoder,
     PyavAudioEncoder,
     PyavVideoEncoder,
 )
 from janim.render.framebuffer import FrameBuffer
+from janim.render.perf import ExportPerf
+from janim.render.readback import PboRing, PboStats
 from janim.utils.simple_functions import clip
 
-_ = get_translator('janim.render.writer')
+if TYPE_CHECKING:
+    from janim.render.farm import FarmServeConfig
 
-PBO_COUNT = 3
+_ = get_translator('janim.render.writer')
 
 
 class VideoWriter:
@@ -54,35 +62,34 @@ class VideoWriter:
         self.pw, self.ph = built.cfg.pixel_width, built.cfg.pixel_height
 
         # PBO 相关初始化
-        self.byte_size = self.pw * self.ph * 4  # 每帧的字节大小 (RGBA)
-
-    def _init_pbos(self) -> None:
-        """初始化PBO缓冲区"""
-        self.pbos = gl.glGenBuffers(PBO_COUNT)
+        # 每帧的字节大小 (RGBA)，在 GPU 上转换为 yuv420p 时会改变
+        self.byte_size = self.pw * self.ph * 4
 
-        for pbo in self.pbos:
-            gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, pbo)
-            # 分配空间，GL_STREAM_READ 表明数据将从 GPU 读取到 CPU，并且每帧都会更新
-            gl.glBufferData(gl.GL_PIXEL_PACK_BUFFER, self.byte_size, None, gl.GL_STREAM_READ)
-
-        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)  # 解绑PBO
-
-    def _read_idx_iter(self, start_frame: int, end_frame: int) -> Generator[int | None, None, None]:
-        for _ in range(PBO_COUNT - 1):
-            yield None
-        for frame_idx in range(start_frame, end_frame):
-            yield frame_idx % PBO_COUNT
-
-    def _cleanup_pbos(self) -> None:
-        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)  # 确保解绑
-        # 正确删除多个缓冲区
-        gl.glDeleteBuffers(len(self.pbos), self.pbos)
+        self.perf = ExportPerf(enabled=False)
+        # 最近一次使用 PBO 输出时的统计信息
+        self.pbo_stats: PboStats | None = None
 
     @staticmethod
     def writes(
-        built: BuiltTimeline, file_path: str, *, quiet=False, use_pbo=True, hwaccel=False
+        built: BuiltTimeline,
+        file_path: str,
+        *,
+        quiet=False,
+        use_pbo=True,
+        hwaccel=False,
+        gpu_yuv=False,
+        reuse_frames=True,
+        workers: int = 1,
     ) -> None:
-        VideoWriter(built).write_all(file_path, quiet=quiet, use_pbo=use_pbo, hwaccel=hwaccel)
+        VideoWriter(built).write_all(
+            file_path,
+            quiet=quiet,
+            use_pbo=use_pbo,
+            hwaccel=hwaccel,
+            gpu_yuv=gpu_yuv,
+            reuse_frames=reuse_frames,
+            workers=workers,
+        )
 
     def write_all(
         self,
@@ -93,123 +100,449 @@ class VideoWriter:
         quiet=False,
         use_pbo=True,
         hwaccel=False,
+        gpu_yuv=False,
+        reuse_frames=True,
+        segment_cache=False,
+        workers: int = 1,
+        farm: FarmServeConfig | None = None,
+        with_audio=False,
+        perf: bool | str = False,
         _keep_temp=False,
     ) -> None:
         """将时间轴动画输出到文件中
 
         - 指定 ``quiet=True``，则不会输出前后的提示信息，但仍有进度条
+        - 指定 ``gpu_yuv=True``，则在 GPU 上将画面转换为 yuv420p 后再读取，
+          使读取的数据量减少至 RGBA 的 3/8，并省去 CPU 上的颜色空间转换；
+          仅对不使用硬件加速的 ``.mp4`` 有效
+        - 默认会跳过与上一帧完全相同的帧的渲染，直接复用上一帧，指定 ``reuse_frames=False`` 以禁用，
+          详见 :meth:`write_frames`
+        - 指定 ``segment_cache=True`` 时，会按区段缓存编码后的视频，
+          再次输出时只重新渲染内容发生变化的区段，详见 :mod:`~.render.segment_cache`
+        - 指定 ``workers`` 大于 1 时，会将帧范围划分为连续的区段，
+          由多个进程分别重新构建时间轴并渲染，最后无损拼接为一个文件，详见 :mod:`~.render.parallel`
+        - ``file_path`` 的后缀是 ``.png-seq`` 等时，输出为图片序列，
+          详见 :class:`~.ImageSequenceEncoder`
+        - 指定 ``farm`` 时，会作为 coordinator 等待 worker 连接，由 worker 渲染各个区段，
+          详见 :mod:`~.render.farm`
+        - 指定 ``with_audio=True`` 时，会尝试在渲染的同时将音频编码到同一个文件中，
+          成功时 :attr:`audio_embedded` 为 ``True``，并直接输出最终的文件（忽略 ``_keep_temp``）；
+          不支持时（例如使用了硬件加速、多进程等）则为 ``False``，
+          需要另外输出音频后使用 :func:`merge_video_and_audio` 合并
+        - 指定 ``perf=True`` 时，会统计渲染、读取、编码等各个阶段的耗时，并在结束时输出表格，
+          详见 :mod:`~.render.perf`；传入字符串时，还会将统计结果以 JSON 格式保存到该路径；
+          多进程和 render farm 中的耗时不会被统计
         """
         name = self.built.timeline.__class__.__name__
         if not quiet:
             log.info(_('Writing video "{name}"').format(name=name))
             t = time.time()
 
-        fps = self.built.cfg.fps
+        start_frame, end_frame = get_frame_start_and_end(in_point, out_point, self.built)
 
-        self.open_video_pipe(file_path, hwaccel)
-        log.debug('Opened video pipe')
+        self.perf = ExportPerf(enabled=bool(perf))
+        perf_t = time.perf_counter()
 
-        if use_pbo:
-            self._init_pbos()
-            log.debug('Created PBOs')
+        if os.path.splitext(file_path)[1] in ImageSequenceEncoder.FORMATS and (
+            workers > 1 or segment_cache or farm is not None
+        ):
+            log.warning(
+                _(
+                    'Image sequences are written in a single process, '
+                    'ignoring the workers, segment_cache and farm options'
+                )
+            )
+            workers = 1
+            segment_cache = False
+            farm = None
+
+        if farm is not None:
+            if workers > 1 or segment_cache:
+                log.warning(_('Render farm ignores the workers and segment_cache options'))
+            workers = 1
+            segment_cache = False
+
+        source = None
+        if farm is not None:
+            from janim.render.parallel import TimelineSource
+
+            source = TimelineSource.from_built(self.built)
+            if source is None:
+                log.warning(
+                    _(
+                        '"{name}" cannot be rebuilt by farm workers, '
+                        'falling back to single-process writing'
+                    ).format(name=name)
+                )
+                farm = None
+        elif workers > 1 and segment_cache:
+            log.warning(_('Segment cache does not support multiple workers, using one worker'))
+        elif workers > 1:
+            from janim.render.parallel import TimelineSource
+
+            source = TimelineSource.from_built(self.built)
+            if source is None:
+                log.warning(
+                    _(
+                        '"{name}" cannot be rebuilt in worker processes, '
+                        'falling back to single-process writing'
+                    ).format(name=name)
+                )
 
-        start_frame, end_frame = get_frame_start_and_end(in_point, out_point, self.built)
+        segment_hits: tuple[int, int] | None = None
 
-        progress_display = ProgressDisplay(
-            range(start_frame, end_frame),
-            leave=False,
-            dynamic_ncols=True,
+        self.audio_embedded = (
+            with_audio
+            and not segment_cache
+            and source is None
+            and not hwaccel
+            and os.path.splitext(file_path)[1] in PyavVideoEncoder.AUDIO_EXTS
         )
+        if self.audio_embedded:
+            _keep_temp = False
+
+        if farm is not None:
+            from janim.render.farm import FarmSettings, write_video_with_farm
+
+            self.set_file_paths(file_path)
+            write_video_with_farm(
+                self,
+                source,
+                self.temp_file_path,
+                start_frame,
+                end_frame,
+                config=farm,
+                settings=FarmSettings(
+                    ext=self.ext,
+                    use_pbo=use_pbo,
+                    hwaccel=hwaccel,
+                    gpu_yuv=gpu_yuv,
+                    reuse_frames=reuse_frames,
+                ),
+            )
+            reused_count = 0
+            log.debug('Finished writing frames with render farm')
+
+            if not _keep_temp:
+                shutil.move(self.temp_file_path, self.final_file_path)
+        elif segment_cache:
+            from janim.render.segment_cache import write_video_with_segment_cache
+
+            hit_count, segment_count, reused_count = write_video_with_segment_cache(
+                self,
+                file_path,
+                start_frame,
+                end_frame,
+                use_pbo=use_pbo,
+                hwaccel=hwaccel,
+                gpu_yuv=gpu_yuv,
+                reuse_frames=reuse_frames,
+            )
+            segment_hits = (hit_count, segment_count)
+            log.debug('Finished writing segments')
+
+            if not _keep_temp:
+                shutil.move(self.temp_file_path, self.final_file_path)
+        elif source is not None:
+            from janim.render.parallel import write_video_in_parallel
+
+            self.set_file_paths(file_path)
+            reused_count = write_video_in_parallel(
+                source,
+                self.temp_file_path,
+                start_frame,
+                end_frame,
+                workers=workers,
+                use_pbo=use_pbo,
+                hwaccel=hwaccel,
+                gpu_yuv=gpu_yuv,
+                reuse_frames=reuse_frames,
+            )
+            log.debug('Finished writing frames in worker processes')
+
+            if not _keep_temp:
+                shutil.move(self.temp_file_path, self.final_file_path)
+        else:
+            audio = self.audio_track(start_frame, end_frame) if self.audio_embedded else None
+            self.open_video_pipe(file_path, hwaccel, gpu_yuv, audio)
+            log.debug('Opened video pipe')
+
+            progress_display = ProgressDisplay(
+                range(start_frame, end_frame),
+                leave=False,
+                dynamic_ncols=True,
+            )
+            reused_count = self.write_frames(
+                progress_display,
+                start_frame,
+                end_frame,
+                use_pbo=use_pbo,
+                reuse_frames=reuse_frames,
+            )
+            log.debug('Finished writing frames to video pipe')
+
+            self.close_video_pipe(_keep_temp)
+            log.debug('Closed video pipe')
+
+        if perf:
+            self.perf.finish(end_frame - start_frame, time.perf_counter() - perf_t)
+            self.perf.log_summary()
+            if isinstance(perf, str):
+                self.perf.dump(perf)
+
+        if not quiet:
+            msg = _('Finished writing video "{name}" in {elapsed:.2f} s').format(
+                name=name,
+                elapsed=time.time() - t,
+            )
+            if reused_count != 0:
+                msg += ' ' + _('({reused}/{total} static frames reused)').format(
+                    reused=reused_count,
+                    total=end_frame - start_frame,
+                )
+            if segment_hits is not None:
+                msg += ' ' + _('({hits}/{total} cached segments reused)').format(
+                    hits=segment_hits[0],
+                    total=segment_hits[1],
+                )
+            log.info(msg)
+
+            if self.audio_embedded:
+                log.info(
+                    _('File saved to "{file_path}" (merged)').format(
+                        file_path=self.final_file_path
+                    )
+                )
+            elif not _keep_temp:
+                log.info(
+                    _('File saved to "{file_path}" (video only)').format(
+                        file_path=self.final_file_path
+                    )
+                )
+
+    def audio_track(self, start_frame: int, end_frame: int) -> AudioTrack:
+        """
+        与 :meth:`AudioWriter.write_all` 相同，每次提取 ``fps`` 帧（即一秒）的音频
+        """
+        fps = self.built.cfg.fps
+        framerate = self.built.cfg.audio_framerate
+
+        def chunks():
+            for frame in range(start_frame, end_frame, fps):
+                samples = self.built.get_audio_samples_between(
+                    framerate,
+                    frame / fps,
+                    min(frame + fps, end_frame) / fps,
+                )
+                yield (frame - start_frame) / fps, samples
+
+        return AudioTrack(framerate, self.built.cfg.audio_channels, chunks())
+
+    def write_frames(
+        self,
+        frames: Iterable[int],
+        start_frame: int,
+        end_frame: int,
+        *,
+        use_pbo=True,
+        reuse_frames=True,
+    ) -> int:
+        """渲染 ``frames`` 中的每一帧，并将像素数据传递给已打开的编码器
+
+        ``frames`` 应依次产生 ``[start_frame, end_frame)`` 中的每一帧，一般是包装了该范围的进度条
+
+        指定 ``reuse_frames=True`` 时，若某一帧与上一帧的
+        :meth:`~.BuiltTimeline.static_fingerprint` 相同，
+        则跳过渲染和读取，直接将上一帧的数据再次提交给编码器
+
+        返回值是被复用的帧数
+        """
+        fps = self.built.cfg.fps
+
+        ring = self.encoder.ring
+        gpu_yuv = ring is not None and ring.format == 'yuv420p'
+        if gpu_yuv:
+            self.byte_size = ring.byte_size
 
         rgb = self.built.cfg.background_color.rgb
-        transparent = self.ext in ('.webm', '.mov')
+        transparent = self.ext in ('.webm', '.mov') or self.ext in ImageSequenceEncoder.FORMATS
 
         fbo = FrameBuffer(self.ctx, self.pw, self.ph, rgb, transparent)
 
+        # 最近一次提交给编码器的帧数据，用于复用
+        # 当使用 self.encoder.ring 时是缓冲的下标，并且会额外持有一次引用；否则是 bytes
+        self._last_frame: bytes | int | None = None
+
+        prev_fingerprint: tuple | None = None
+        reused_count = 0
+
+        def is_reusable(frame: int) -> bool:
+            nonlocal prev_fingerprint, reused_count
+            if not reuse_frames:
+                return False
+            fingerprint = self.built.static_fingerprint(frame / fps)
+            reusable = fingerprint is not None and fingerprint == prev_fingerprint
+            prev_fingerprint = fingerprint
+            if reusable:
+                reused_count += 1
+            return reusable
+
         if use_pbo:
-            # 使用PBO优化的渲染循环
+            # 使用PBO优化的渲染循环，各帧读取到 PBO 中后，等到传输完成时才交给 _write_pbo_to_encoder
+            pbo_ring = PboRing(self.byte_size, self._write_pbo_to_encoder, perf=self.perf)
+
+            def read_pixels() -> None:
+                # 注意: 当PBO绑定时，最后一个参数是偏移量而不是指针
+                with self.perf.stage('readback'):
+                    if gpu_yuv:
+                        with fbo.yuv420p_context():
+                            gl.glReadPixels(
+                                0,
+                                0,
+                                self.pw // 4,
+                                self.ph * 3 // 2,
+                                gl.GL_RGBA,
+                                gl.GL_UNSIGNED_BYTE,
+                                0,
+                            )
+                    else:
+                        gl.glReadPixels(0, 0, self.pw, self.ph, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+
             with fbo.context():
-                read_idx_iter = self._read_idx_iter(start_frame, end_frame)
-                for frame_idx, read_idx in zip(progress_display, read_idx_iter):
+                for frame in frames:
+                    if is_reusable(frame):
+                        pbo_ring.skip()
+                        continue
+
                     # 渲染当前帧
-                    fbo.clear()
-                    self.built.render_all(self.ctx, frame_idx / fps)
-                    fbo.unpremultiply()
-
-                    # 绑定当前PBO来存储新帧
-                    gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[frame_idx % PBO_COUNT])
-                    # 注意: 当PBO绑定时，最后一个参数是偏移量而不是指针
-                    gl.glReadPixels(
-                        0,
-                        0,
-                        self.built.cfg.pixel_width,
-                        self.built.cfg.pixel_height,
-                        gl.GL_RGBA,
-                        gl.GL_UNSIGNED_BYTE,
-                        0,
-                    )
+                    with self.perf.stage('render'):
+                        fbo.clear()
+                        self.built.render_all(self.ctx, frame / fps)
+                        fbo.unpremultiply()
 
-                    # 如果不是第一批，处理上一批的数据
-                    if read_idx is not None:
-                        # 绑定对应的PBO，用于读取数据
-                        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[read_idx])
-
-                        # 使用numpy从映射的内存中读取数据
-                        ptr = gl.glMapBuffer(gl.GL_PIXEL_PACK_BUFFER, gl.GL_READ_ONLY)
-                        assert ptr
-                        data = gl.ctypes.string_at(ptr, self.byte_size)
-                        # 写入数据到ffmpeg
-                        self.encoder.write(data)
-                        gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
-
-                # 处理最后一批
-                for read_idx in read_idx_iter:
-                    # 在大多数情况下 read_idx 并不是 None
-                    # 只有在 Timeline 时长特别短的时候会出现 None
-                    if read_idx is None:
-                        continue
-                    gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.pbos[read_idx])
-                    data = gl.glGetBufferSubData(gl.GL_PIXEL_PACK_BUFFER, 0, self.byte_size)
-                    self.encoder.write(data.tobytes())
+                    pbo_ring.read(read_pixels)
 
-            self._cleanup_pbos()
+                # 处理剩余的帧
+                pbo_ring.finish()
+
+            self.pbo_stats = pbo_ring.stats
+            self.perf.extras['pbo'] = asdict(pbo_ring.stats)
+            log.debug(f'PBO ring: {pbo_ring.stats}')
         else:
             # 原始渲染循环（不使用PBO）
             with fbo.context():
-                for frame in progress_display:
-                    fbo.clear()
-                    self.built.render_all(self.ctx, frame / fps)
-                    fbo.unpremultiply()
-                    bytes = fbo.read()
-                    self.encoder.write(bytes)
-
-        log.debug('Finished writing frames to video pipe')
-
-        self.close_video_pipe(_keep_temp)
-        log.debug('Closed video pipe')
-
-        if not quiet:
-            log.info(
-                _('Finished writing video "{name}" in {elapsed:.2f} s').format(
-                    name=name,
-                    elapsed=time.time() - t,
-                )
-            )
+                for frame in frames:
+                    if is_reusable(frame):
+                        self._submit_last_frame()
+                        continue
 
-            if not _keep_temp:
-                log.info(_('File saved to "{file_path}" (video only)').format(file_path=file_path))
+                    with self.perf.stage('render'):
+                        fbo.clear()
+                        self.built.render_all(self.ctx, frame / fps)
+                        fbo.unpremultiply()
+                    with self.perf.stage('readback'):
+                        if gpu_yuv:
+                            data = ring.acquire()
+                            with fbo.yuv420p_context() as yuv_fbo:
+                                yuv_fbo.read_into(ring.buffers[data], components=4)
+                        else:
+                            data = fbo.read()
+                    self._submit_frame(data)
+
+        if isinstance(self._last_frame, int):
+            ring.release(self._last_frame)
+        self._last_frame = None
+
+        return reused_count
+
+    def _write_pbo_to_encoder(self, ptr: int | None) -> None:
+        """
+        将映射后的 PBO 中的数据提交给编码器，``ptr`` 为 ``None`` 时表示复用上一帧，
+        另见 :class:`~.PboRing`
+        """
+        if ptr is None:
+            self._submit_last_frame()
+            return
+
+        with self.perf.stage('readback'):
+            ring = self.encoder.ring
+            if ring is None:
+                data = gl.ctypes.string_at(ptr, self.byte_size)
+            else:
+                # 从映射的内存直接拷贝到预分配的缓冲中，不产生新的 bytes 对象
+                # yuv420p 的数据在 GPU 上转换时已经完成了翻转，RGBA 的数据则在拷贝的同时翻转
+                data = ring.acquire()
+                if ring.format == 'yuv420p':
+                    ring.write(data, ptr)
+                else:
+                    ring.write_flipped(data, ptr)
+
+        self._submit_frame(data)
+
+    def _submit_frame(self, data: bytes | int) -> None:
+        """
+        将新的一帧提交给编码器，并记录下来以便复用
 
-    def open_video_pipe(self, file_path: str, hwaccel: bool) -> None:
+        ``data`` 是 ``int`` 时表示 ``self.encoder.ring`` 中的缓冲下标，
+        此时会将 :meth:`~.FrameRing.acquire` 得到的引用留作复用，另外增加一次引用交给编码器
+        """
+        last_frame = self._last_frame
+        self._last_frame = data
+        self._submit_last_frame()
+        if isinstance(last_frame, int):
+            self.encoder.ring.release(last_frame)
+
+    def _submit_last_frame(self) -> None:
+        data = self._last_frame
+        with self.perf.stage('submit'):
+            if isinstance(data, int):
+                self.encoder.ring.retain(data)
+                self.encoder.write_ring_buffer(data)
+            else:
+                self.encoder.write(data)
+
+    def set_file_paths(self, file_path: str) -> None:
         stem, self.ext = os.path.splitext(file_path)
-        self.final_file_path = file_path
-        self.temp_file_path = stem + '_temp' + self.ext
+        if self.ext in ImageSequenceEncoder.FORMATS:
+            # 图片序列输出到与文件同名（不含后缀）的文件夹中
+            self.final_file_path = stem
+            self.temp_file_path = stem + '_temp'
+        else:
+            self.final_file_path = file_path
+            self.temp_file_path = stem + '_temp' + self.ext
+
+    def open_video_pipe(
+        self,
+        file_path: str,
+        hwaccel: bool,
+        gpu_yuv: bool = False,
+        audio: AudioTrack | None = None,
+    ) -> None:
+        self.set_file_paths(file_path)
 
         if hwaccel and self.ext != '.mp4':
             log.warning('Only ".mp4" video supports hardware acceleration')
             hwaccel = False
 
+        if gpu_yuv and (
+            hwaccel
+            or self.ext not in PyavVideoEncoder.GPU_YUV_EXTS
+            or self.pw % 4 != 0
+            or self.ph % 2 != 0
+        ):
+            log.warning(
+                _(
+                    'GPU YUV conversion only applies to ".mp4" video '
+                    'whose width is a multiple of 4 and height is even, '
+                    'written without hardware acceleration, ignored'
+                )
+            )
+            gpu_yuv = False
+
         if hwaccel:
             self.encoder = FFmpegH264VideoEncoder()
+        elif self.ext in ImageSequenceEncoder.FORMATS:
+            self.encoder = ImageSequenceEncoder(self.ext)
         else:
             self.encoder = PyavVideoEncoder()
         self.encoder.open(
@@ -217,11 +550,17 @@ class VideoWriter:
             self.built.cfg.pixel_width,
             self.built.cfg.pixel_height,
             self.built.cfg.fps,
+            gpu_yuv=gpu_yuv,
+            audio=audio,
+            perf=self.perf,
         )
 
     def close_video_pipe(self, _keep_temp: bool) -> None:
         self.encoder.finish()
         if not _keep_temp:
+            # 对于图片序列，shutil.move 会将文件夹移动到已存在的同名文件夹中，所以需要先删除
+            if os.path.isdir(self.final_file_path):
+                shutil.rmtree(self.final_file_path)
             shutil.move(self.temp_file_path, self.final_file_path)
 
 
@@ -401,6 +740,48 @@ def merge_video_and_audio(
         log.info(_('File saved to "{file_path}" (merged)').format(file_path=result_path))
 
 
+def concat_videos(video_paths: list[str], result_path: str, remove: bool = True) -> None:
+    """
+    将以相同编码参数输出的多段视频依次拼接为一个文件
+
+    直接复制 packet 并偏移时间戳，不进行重新编码
+    """
+    import av
+
+    inputs = [av.open(path) for path in video_paths]
+
+    output = av.open(result_path, 'w')
+    output_video = output.add_stream_from_template(inputs[0].streams.video[0])
+
+    # 以秒为单位的偏移量，每拼接一段，就加上这一段的时长
+    offset = 0
+
+    for input in inputs:
+        video_stream = input.streams.video[0]
+        pts_offset = round(offset / video_stream.time_base)
+        end_pts = 0
+
+        for packet in input.demux(video_stream):
+            # 跳过 demux 末尾用于 flush 的空 packet
+            if packet.pts is None:
+                continue
+            end_pts = max(end_pts, packet.pts + packet.duration)
+            packet.pts += pts_offset
+            packet.dts += pts_offset
+            packet.stream = output_video
+            output.mux(packet)
+
+        offset += end_pts * video_stream.time_base
+
+    output.close()
+    for input in inputs:
+        input.close()
+
+    if remove:
+        for path in video_paths:
+            os.remove(path)
+
+
 class SRTWriter:
     @staticmethod
     def writes(built: BuiltTimeline, file_path: str) -> None:
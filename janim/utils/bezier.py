@@ -256,6 +256,53 @@ def partial_quadratic_bezier_points(
     return [h0, h1, h2]
 
 
+def partial_quadratic_bezier_points_batch(
+    tuples: np.ndarray,
+    a: np.ndarray,
+    b: np.ndarray,
+) -> np.ndarray:
+    """
+    与 :func:`partial_quadratic_bezier_points` 相同，但是一次处理多段曲线
+
+    ``tuples`` 的形状为 ``(k, 3, dim)``，``a`` 和 ``b`` 的长度均为 ``k``，
+    返回形状为 ``(k, 3, dim)`` 的数组
+
+    计算的步骤与逐个调用 :func:`partial_quadratic_bezier_points` 完全相同，因此结果也完全一致
+    """
+    tuples = np.asarray(tuples)
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    p0, p1, p2 = tuples[:, 0], tuples[:, 1], tuples[:, 2]
+
+    # 逐个调用时 a 和 b 是 np.float64 标量，这里按照与其相同的类型提升规则得到系数参与运算时的类型
+    dtype = np.result_type(tuples.dtype, np.float64(0))
+
+    def coef(x: np.ndarray) -> np.ndarray:
+        return x.astype(dtype, copy=False)[:, None]
+
+    def curve(t: np.ndarray) -> np.ndarray:
+        return (
+            p0 * coef(1 - t) * coef(1 - t)
+            + 2 * p1 * coef(t) * coef(1 - t)
+            + p2 * coef(t) * coef(t)
+        )
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        h0 = np.where((a > 0)[:, None], curve(a), p0)
+        h2 = np.where((b < 1)[:, None], curve(b), p2)
+        h1_prime = coef(1 - a) * p1 + coef(a) * p2
+        end_prop = (b - a) / (1.0 - a)
+        h1 = coef(1 - end_prop) * h0 + coef(end_prop) * h1_prime
+
+    result = np.stack([h0, h1, h2], axis=1)
+
+    at_end = a == 1
+    if at_end.any():
+        result[at_end] = p2[at_end, None]
+
+    return result
+
+
 # Linear interpolation variants
 
 
@@ -0,0 +1,248 @@
+"""
+将构建完成的时间轴缓存到 ``temp_dir`` 中，使得源代码、配置以及用到的资源文件都没有变化时，
+可以跳过 :meth:`~.Timeline.construct`，直接使用缓存的构建结果
+
+缓存按照以下内容区分，另见 :func:`compute_key`：
+
+- JAnim 的版本以及 :data:`CACHE_VERSION`
+- 时间轴类所在的文件、模块名和类名，以及构建参数
+- 命令行配置、语言以及是否使用外部 Typst
+
+缓存中还记录了构建时各个依赖文件的修改时间和大小，读取缓存时只要有一个发生了变化就视为失效：
+
+- 时间轴所在的文件，以及所有从用户代码中导入的模块（不包括标准库、第三方库以及 JAnim 自身）
+- 构建时通过 :func:`~.find_file` 找到的资源文件，例如图片、音频
+
+缓存的内容是通过 ``pickle`` 序列化的 :class:`~.Timeline` 对象，
+包括物件的显示信息、动画、音频以及字幕等，读取后重新创建 :class:`~.BuiltTimeline`；
+如果构建结果中含有无法序列化的对象
+（例如在 ``construct`` 中定义的函数或者 ``lambda`` 被用作 updater），
+则会给出提示并且不进行缓存，每次都正常构建
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import sysconfig
+from typing import TYPE_CHECKING
+
+import attrs
+
+import janim
+from janim.components.depth import Cmpt_Depth
+from janim.locale import get_lang, get_translator
+from janim.logger import log
+from janim.utils.config import Config, cli_config
+from janim.utils.file_ops import (
+    STDIN_FILENAME,
+    get_janim_dir,
+    getfile_or_stdin,
+    guarantee_existence,
+    record_found_files,
+)
+from janim.utils.typst_compile import get_use_external_typst
+
+if TYPE_CHECKING:
+    from janim.anims.timeline import BuiltTimeline, Timeline
+
+_ = get_translator('janim.utils.build_cache')
+
+# 缓存的版本，当缓存的格式发生变化时需要增加，使得旧的缓存失效
+CACHE_VERSION = 5
+
+type FileStamp = tuple[int, int]
+
+
+def build_with_cache(
+    cls: type[Timeline], *, hide_subtitles: bool = False, show_debug_notice: bool = False
+) -> BuiltTimeline:
+    """
+    与 ``cls().build(...)`` 相同，但是会优先使用缓存的构建结果，并在构建后更新缓存
+
+    对于无法确定源代码的时间轴（例如来自 stdin），直接进行构建
+    """
+    key = compute_key(cls, hide_subtitles=hide_subtitles, show_debug_notice=show_debug_notice)
+    if key is None:
+        return cls().build(hide_subtitles=hide_subtitles, show_debug_notice=show_debug_notice)
+
+    file_path = get_cache_path(cls, key)
+
+    built = load(file_path)
+    if built is not None:
+        log.info(_('Loaded "{name}" from the build cache').format(name=cls.__name__))
+        return built
+
+    with record_found_files() as found_files:
+        built = cls().build(hide_subtitles=hide_subtitles, show_debug_notice=show_debug_notice)
+
+    save(file_path, built, found_files)
+    return built
+
+
+def compute_key(cls: type[Timeline], **build_kwargs) -> str | None:
+    """
+    计算用于区分缓存的键，无法缓存时返回 ``None``
+    """
+    file = getfile_or_stdin(cls)
+    if file == STDIN_FILENAME or '<locals>' in cls.__qualname__:
+        return None
+
+    configs = {
+        key: value
+        for key, value in attrs.asdict(cli_config, recurse=False).items()
+        if value is not None
+    }
+
+    h = hashlib.blake2b(digest_size=16)
+    for part in (
+        janim.__version__,
+        CACHE_VERSION,
+        os.path.abspath(file),
+        cls.__module__,
+        cls.__qualname__,
+        sorted(build_kwargs.items()),
+        sorted(configs.items()),
+        get_lang(),
+        get_use_external_typst(),
+    ):
+        h.update(repr(part).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def get_cache_path(cls: type[Timeline], key: str) -> str:
+    cache_dir = guarantee_existence(os.path.join(Config.get.temp_dir, 'build_cache'))
+    return os.path.join(cache_dir, f'{cls.__module__}.{cls.__qualname__}_{key}.pkl')
+
+
+def load(file_path: str) -> BuiltTimeline | None:
+    """
+    读取缓存，缓存不存在或者已经失效时返回 ``None``
+    """
+    from janim.anims.timeline import BuiltTimeline
+
+    if not os.path.exists(file_path):
+        return None
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(file_path, 'rb') as f:
+            header: dict = pickle.load(f)
+            if header.get('version') != CACHE_VERSION:
+                return None
+
+            for path, stamp in header['dependencies'].items():
+                if get_file_stamp(path) != stamp:
+                    log.debug(f'Build cache is outdated because "{path}" has changed')
+                    return None
+
+            timeline: Timeline = pickle.load(f)
+    except Exception as e:
+        # 例如缓存文件损坏，或者缓存中的类已经不存在
+        log.debug(f'Failed to load the build cache "{file_path}": {e!r}')
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    # 使得之后新创建的物件的绘制顺序不与缓存中的物件重复
+    counter = Cmpt_Depth._counter
+    for depth, order in header['depth_counter'].items():
+        counter[depth] = min(counter[depth], order)
+
+    return BuiltTimeline(timeline)
+
+
+def save(file_path: str, built: BuiltTimeline, found_files: set[str]) -> None:
+    """
+    写入缓存；构建结果无法序列化时给出提示，并删除该时间轴原有的缓存
+    """
+    try:
+        data = pickle.dumps(built.timeline, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        log.warning(
+            _(
+                '"{name}" is not cached because its build result cannot be serialized: {error}'
+            ).format(name=built.timeline.__class__.__name__, error=e)
+        )
+        remove_outdated(file_path, keep=False)
+        return
+
+    dependencies: dict[str, FileStamp] = {}
+    for path in sorted({*get_user_module_files(), *found_files}):
+        stamp = get_file_stamp(path)
+        if stamp is not None:
+            dependencies[path] = stamp
+
+    header = {
+        'version': CACHE_VERSION,
+        'dependencies': dependencies,
+        'depth_counter': dict(Cmpt_Depth._counter),
+    }
+
+    # 先写入临时文件再替换，避免中断时留下不完整的缓存
+    temp_path = file_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.write(data)
+    os.replace(temp_path, file_path)
+
+    remove_outdated(file_path, keep=True)
+
+
+def remove_outdated(file_path: str, *, keep: bool) -> None:
+    """
+    删除同一个时间轴的其它缓存（例如配置不同时产生的），``keep=False`` 时连同 ``file_path`` 一起删除
+    """
+    cache_dir, name = os.path.split(file_path)
+    stem = name.rsplit('_', 1)[0]
+    for other in os.listdir(cache_dir):
+        if not other.endswith('.pkl') or other.rsplit('_', 1)[0] != stem:
+            continue
+        if keep and other == name:
+            continue
+        try:
+            os.remove(os.path.join(cache_dir, other))
+        except OSError:
+            pass
+
+
+def get_file_stamp(path: str) -> FileStamp | None:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_user_module_files() -> list[str]:
+    """
+    得到所有已导入的用户代码模块的文件路径，不包括标准库、第三方库以及 JAnim 自身
+    """
+    paths = sysconfig.get_paths()
+    excluded = tuple(
+        os.path.join(os.path.abspath(path), '')
+        for path in {
+            sys.prefix,
+            sys.base_prefix,
+            paths['stdlib'],
+            paths['purelib'],
+            paths['platlib'],
+            get_janim_dir(),
+        }
+    )
+
+    files: list[str] = []
+    for module in list(sys.modules.values()):
+        file = getattr(module, '__file__', None)
+        if not file or not file.endswith('.py'):
+            continue
+        file = os.path.abspath(file)
+        if not file.startswith(excluded):
+            files.append(file)
+    return files
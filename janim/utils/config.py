@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os
 import tempfile
+from contextlib import contextmanager
 from contextvars import ContextVar
 from functools import partial
 from pathlib import Path
@@ -152,6 +153,19 @@ class Config(metaclass=_ConfigMeta):
     def __exit__(self, exc_type, exc_value, tb) -> None:
         config_ctx_var.reset(self.token)
 
+    def __getstate__(self) -> dict:
+        # Color 对象中含有 lambda（默认的 equality），无法直接被 pickle，
+        # 这里只保存颜色的十六进制表示，使得含有 Config 的构建结果可以传递给子进程或者写入构建缓存
+        state = self.__dict__.copy()
+        if self.background_color is not None:
+            state['background_color'] = self.background_color.hex_l
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.background_color is not None:
+            self.__dict__['background_color'] = Color(self.background_color)
+
 
 def is_power_plugged() -> bool:
     battery = psutil.sensors_battery()
@@ -363,6 +377,27 @@ class ConfigGetter:
             **self.scaled_height(scale),
         }
 
+    def proxy_size(self, scale: float) -> dict[str, float]:
+        """
+        根据缩放比例计算草稿（低分辨率）输出所需的 **像素尺寸和抗锯齿宽度**
+
+        画面尺寸不变，因此布局与原本完全一致；
+        像素尺寸会取为偶数，以便编码为 yuv420p；
+        ``anti_alias_width`` 会除以 ``scale``，使得以像素计的抗锯齿宽度不变，避免缩小后出现锯齿
+
+        使用示例：
+
+        .. code-block:: python
+
+            with override_cli_config(**Config.get.proxy_size(0.25)):
+                ...
+        """
+        return {
+            'pixel_width': max(2, round(self.pixel_width * scale / 2) * 2),
+            'pixel_height': max(2, round(self.pixel_height * scale / 2) * 2),
+            'anti_alias_width': self.anti_alias_width / scale,
+        }
+
     def swapped_size(self) -> dict[str, int]:
         """
         获取交换宽高后的 **画面尺寸和像素尺寸**
@@ -384,3 +419,18 @@ class ConfigGetter:
 
 
 config_getter = ConfigGetter()
+
+
+@contextmanager
+def override_cli_config(**kwargs):
+    """
+    在 ``with`` 的范围内修改 :py:obj:`cli_config`，结束后还原
+    """
+    old = {key: getattr(cli_config, key) for key in kwargs}
+    for key, value in kwargs.items():
+        setattr(cli_config, key, value)
+    try:
+        yield
+    finally:
+        for key, value in old.items():
+            setattr(cli_config, key, value)
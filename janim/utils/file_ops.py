@@ -3,11 +3,16 @@ import inspect
 import os
 import platform
 import subprocess as sp
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import lru_cache
 from pathlib import Path
+from typing import Iterator
 
 STDIN_FILENAME = '<stdin>'
 
+found_files_ctx: ContextVar[set[str] | None] = ContextVar('found_files_ctx', default=None)
+
 
 def guarantee_existence(path: str | Path) -> str:
     if not os.path.exists(path):
@@ -92,7 +97,28 @@ def find_file_in_asset_dir(prefix: str | Path, file_path: str | Path) -> str | N
     return None
 
 
+@contextmanager
+def record_found_files() -> Iterator[set[str]]:
+    """
+    在 ``with`` 期间记录通过 :func:`find_file` 找到的所有文件（绝对路径），另见 :mod:`~.build_cache`
+    """
+    files: set[str] = set()
+    token = found_files_ctx.set(files)
+    try:
+        yield files
+    finally:
+        found_files_ctx.reset(token)
+
+
 def find_file(file_path: str | Path) -> str:
+    found_path = _find_file(file_path)
+    files = found_files_ctx.get()
+    if files is not None:
+        files.add(os.path.abspath(found_path))
+    return found_path
+
+
+def _find_file(file_path: str | Path) -> str:
     # find in default path
     found_path = find_file_in_path('', file_path)
     if found_path is not None:
@@ -28,6 +28,13 @@ class _ObjSlots:
         self.normal_slots: list[Callable] = []
         self.refresh_slots: list[_RefreshSlot] = []
 
+    def __getstate__(self) -> dict:
+        # 已经失效的弱引用不需要保存
+        return {
+            **self.__dict__,
+            'refresh_slots': [slot for slot in self.refresh_slots if slot.obj() is not None],
+        }
+
 
 @dataclass
 class _SelfSlotWithRecurse:
@@ -41,6 +48,14 @@ class _RefreshSlot:
     obj: weakref.ReferenceType[refresh.Refreshable]
     name: str
 
+    def __reduce__(self):
+        # 弱引用无法被 pickle，因此保存所引用的对象本身，恢复时再重新创建弱引用
+        return _restore_refresh_slot, (self.obj(), self.name)
+
+
+def _restore_refresh_slot(obj: refresh.Refreshable, name: str) -> _RefreshSlot:
+    return _RefreshSlot(weakref.ref(obj), name)
+
 
 class Signal[T, **P, R]:
     # for gc
@@ -66,6 +81,10 @@ class Signal[T, **P, R]:
     def __call__(self, *args, **kwargs):  # pragma: no cover
         return self.func(*args, **kwargs)
 
+    def __reduce__(self) -> str:
+        # 信号是类的属性，pickle 时按照 ``模块.类名.方法名`` 引用，而不是复制其中的内容
+        return self.__qualname__
+
     # endregion
 
     # region utils
@@ -23,6 +23,13 @@ def set_use_external_typst(flag: bool) -> None:
     _flag_use_external_typst = flag
 
 
+def get_use_external_typst() -> bool:
+    """
+    是否使用外部 Typst 可执行程序进行编译，另见 :func:`set_use_external_typst`
+    """
+    return _flag_use_external_typst
+
+
 def compile_typst(
     text: str,
     shared_preamble: str,
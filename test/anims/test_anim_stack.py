@@ -0,0 +1,159 @@
+import pickle
+import unittest
+
+from janim.anims.anim_stack import AnimNode, compute_cache
+from janim.anims.display import Display
+from janim.anims.timeline import Timeline
+from janim.anims.updater import DataUpdater
+from janim.constants import FOREVER, ORIGIN, RIGHT, UP
+from janim.items.points import Points
+
+
+class AnimStackTest(unittest.TestCase):
+    def test_append(self) -> None:
+        testcase_self = self
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                item = Points(ORIGIN).show()
+                self.stack = self.item_appearances[item].stack
+
+                def updater(**kwargs) -> DataUpdater:
+                    return DataUpdater(item, lambda data, p: None, become_at_end=False, **kwargs)
+
+                self.u1 = updater(at=1, duration=2)
+                self.u2 = updater(at=2, duration=FOREVER)
+                self.prepare(self.u1, self.u2)
+
+                self.forward(4)
+                item.points.shift(RIGHT)
+                self.forward(1)
+
+                # [2, 3) 的序列是在 [1, 2) 的基础上添加 u2 得到的
+                testcase_self.assertIs(self.stack.stacks[2].prev, self.stack.stacks[1])
+
+        tl = MyTimeline()
+        tl.build(quiet=True)
+
+        def anims_at(t: float, *, left: bool = False) -> list:
+            anims = (tl.stack.get_at_left if left else tl.stack.get)(t)
+            return [anim if anim._generate_by is None else anim._generate_by for anim in anims]
+
+        d1, = anims_at(0.5)
+        d2, = anims_at(4.5)
+        self.assertIsInstance(d1, Display)
+        self.assertIsInstance(d2, Display)
+
+        self.assertListEqual(tl.stack.times, [0, 1, 2, 3, 4])
+        self.assertListEqual(anims_at(1), [d1, tl.u1])
+        self.assertListEqual(anims_at(1, left=True), [d1])
+        self.assertListEqual(anims_at(2.5), [d1, tl.u1, tl.u2])
+        self.assertListEqual(anims_at(3.5), [d1, tl.u2])
+        self.assertListEqual(anims_at(4, left=True), [d1, tl.u2])
+        # d2 覆盖了之前的动画
+        self.assertListEqual(anims_at(4), [d2])
+        self.assertListEqual(anims_at(100), [d2])
+
+    def test_anim_node(self) -> None:
+        self.assertListEqual(AnimNode.to_list(None), [])
+
+        node = AnimNode.from_list(list(range(10000)))
+        branch = AnimNode(-1, node.prev)
+        self.assertListEqual(AnimNode.to_list(node), list(range(10000)))
+        self.assertListEqual(AnimNode.to_list(branch), [*range(9999), -1])
+
+        # 较长的序列也可以被 pickle
+        restored = pickle.loads(pickle.dumps(node))
+        self.assertListEqual(AnimNode.to_list(restored), list(range(10000)))
+
+    def test_append_shared(self) -> None:
+        testcase_self = self
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                item = Points(ORIGIN).show()
+                stack = self.item_appearances[item].stack
+                stack.detect_change_if_not(item)
+
+                # 手动构造相邻区段共用同一个序列的情况
+                node = stack.stacks[0]
+                stack.times[:] = [0, 1, 2]
+                stack.stacks[:] = [node, node, node]
+
+                self.prepare(DataUpdater(item, lambda data, p: None, at=0.5, duration=FOREVER))
+                self.forward(3)
+
+                # 添加后，原先共用序列的区段仍然共用同一个序列
+                testcase_self.assertListEqual(stack.times, [0, 0.5, 1, 2])
+                first, *rest = stack.stacks[1:]
+                testcase_self.assertIs(first.prev, node)
+                for other in rest:
+                    testcase_self.assertIs(other, first)
+
+        MyTimeline().build(quiet=True)
+
+    def test_dump_graph(self) -> None:
+        # 每个区段都是在前一个区段的基础上添加一个动画得到的，并且相邻区段有共用的情况
+        nodes = [None]
+        for i in range(1000):
+            nodes.append(AnimNode(i, nodes[-1]))
+        nodes = [node for node in nodes for _ in range(2)]
+
+        pairs, indices = AnimNode.dump_graph(nodes)
+        # 每个节点只出现一次，而不是每个区段各自展开一遍完整的序列
+        self.assertEqual(len(pairs), 1000)
+
+        restored = AnimNode.load_graph(*pickle.loads(pickle.dumps((pairs, indices))))
+        self.assertEqual(len(restored), len(nodes))
+        for node, restored_node in zip(nodes, restored):
+            self.assertListEqual(AnimNode.to_list(restored_node), AnimNode.to_list(node))
+        for i in range(2, len(nodes), 2):
+            self.assertIs(restored[i], restored[i + 1])
+            self.assertIs(restored[i].prev, restored[i - 1])
+
+    def test_compute_cache(self) -> None:
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                item = Points(ORIGIN).show()
+                self.stack = self.item_appearances[item].stack
+                self.forward(1)
+                self.play(item.anim.points.shift(RIGHT))
+                item.points.shift(UP)
+                self.forward(1)
+
+        tl = MyTimeline()
+        tl.build(quiet=True)
+        stack = tl.stack
+        stack.clear_cache()
+
+        def point_at(t: float, *, left: bool = False) -> list:
+            return stack.compute(t, True, get_at_left=left).points.get()[0].tolist()
+
+        compute_cache.reset_stats()
+        # 按时间顺序查询时只记录最近一次的结果
+        self.assertListEqual(point_at(0.5), [0, 0, 0])
+        self.assertListEqual(point_at(1.5), [0.5, 0, 0])
+        self.assertListEqual(point_at(2.5), [1, 1, 0])
+        self.assertListEqual(point_at(2.5), [1, 1, 0])
+        self.assertEqual(len(stack.cache), 0)
+        self.assertEqual(compute_cache.misses, 3)
+        self.assertEqual(compute_cache.hits, 1)
+
+        # 往回查询后，交替访问多个时间点，结果都保持正确
+        for _ in range(3):
+            self.assertListEqual(point_at(0.5), [0, 0, 0])
+            self.assertListEqual(point_at(1.5), [0.5, 0, 0])
+            self.assertListEqual(point_at(2.5), [1, 1, 0])
+        self.assertEqual(len(stack.cache), 3)
+        self.assertEqual(compute_cache.misses, 5)
+        self.assertEqual(compute_cache.hits, 8)
+
+        # get_at_left 不同时分别缓存
+        self.assertListEqual(point_at(2, left=True), [1, 0, 0])
+        self.assertListEqual(point_at(2), [1, 1, 0])
+        self.assertEqual(compute_cache.misses, 7)
+
+        # readonly=False 时返回的是副本
+        data = stack.compute(2.5, False)
+        data.points.shift(RIGHT)
+        self.assertListEqual(point_at(2.5), [1, 1, 0])
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from janim.anims.animation import TimeIntervals, TimeRange
+from janim.constants import FOREVER
+
+
+class TimeIntervalsTest(unittest.TestCase):
+    def test_get(self) -> None:
+        rng = random.Random(0)
+
+        ranges: list[list[TimeRange]] = []
+        for _ in range(500):
+            ranges_of_val = []
+            t = rng.uniform(0, 10)
+            for _ in range(rng.randint(0, 3)):
+                end = t + rng.choice([0, rng.uniform(0, 3)])
+                ranges_of_val.append(TimeRange(t, end))
+                t = end + rng.uniform(0, 2)
+            if rng.random() < 0.2:
+                ranges_of_val.append(TimeRange(t, FOREVER))
+            ranges.append(ranges_of_val)
+
+        intervals = TimeIntervals(range(len(ranges)), lambda i: ranges[i])
+
+        def expected(t: float) -> list[int]:
+            return [
+                i
+                for i, ranges_of_val in enumerate(ranges)
+                if any(t_range.contains(t) for t_range in ranges_of_val)
+            ]
+
+        # 按时间顺序查询，包括恰好位于区段边界的时间
+        times = sorted(
+            [i / 60 for i in range(60 * 20)]
+            + [t_range.at for ranges_of_val in ranges for t_range in ranges_of_val]
+        )
+        for t in times:
+            self.assertListEqual(intervals.get(t), expected(t), msg=f't={t}')
+
+        # 随机跳转
+        for _ in range(300):
+            t = rng.uniform(-1, 20)
+            self.assertListEqual(intervals.get(t), expected(t), msg=f't={t}')
+
+    def test_single_range(self) -> None:
+        ranges = {'a': TimeRange(1, 2), 'b': TimeRange(2, 3)}
+        intervals = TimeIntervals(ranges, ranges.get)
+
+        self.assertListEqual(intervals.get(0.5), [])
+        self.assertListEqual(intervals.get(1), ['a'])
+        self.assertListEqual(intervals.get(2), ['b'])
+        self.assertListEqual(intervals.get(3), [])
+        self.assertListEqual(intervals.get(1.5), ['a'])
@@ -1,15 +1,56 @@
 from __future__ import annotations
 
 import inspect
+import logging
+import pickle
 import unittest
 from typing import Self
 
-from janim.anims.timeline import Timeline
+import numpy as np
+
+from janim.anims.timeline import BuiltTimeline, ListedTimelines, Timeline
 from janim.components.component import CmptInfo, Component
-from janim.constants import LEFT, RIGHT
+from janim.constants import LEFT, ORIGIN, RIGHT, UP
 from janim.exception import NotAnimationError, TimelineLookupError
+from janim.items.audio import Audio
+from janim.items.geometry.arc import Circle
+from janim.items.geometry.polygon import Square
 from janim.items.item import Item
 from janim.items.points import Points
+from janim.logger import log
+
+
+def constant_audio(value: int) -> Audio:
+    audio = Audio()
+    audio.framerate = 100
+    audio.set_samples(np.full((100, 2), value, dtype=np.int16))
+    return audio
+
+
+# 定义在模块层级，使得可以在子进程中重新得到
+class _Section0(Timeline):
+    def construct(self) -> None:
+        Points(LEFT, RIGHT).show()
+        self.play_audio(constant_audio(10))
+        self.forward(1)
+
+
+class _Section1(Timeline):
+    def construct(self) -> None:
+        circle = Circle().show()
+        Square().show()
+        self.forward(0.5)
+        self.play(circle.anim.points.shift(RIGHT))
+        self.play_audio(constant_audio(-20))
+        self.forward(1.5)
+
+
+class _Sections(ListedTimelines):
+    includes = [_Section0, _Section1]
+
+
+class _ParallelSections(_Sections):
+    build_jobs = 2
 
 
 class TimelineTest(unittest.TestCase):
@@ -82,6 +123,55 @@ class TimelineTest(unittest.TestCase):
                 msg=f'check_data_at_time {id(item):X} {t} {val}'
             )
 
+    def test_detect_changes_of_marked_items(self) -> None:
+        testcase_self = self
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                apprs = self.item_appearances
+
+                def tested(items: dict[Item, None]) -> list[Item]:
+                    # 只检查测试中的物件，不包括时间轴自带的 camera 和 light_source
+                    return [
+                        item for item in items
+                        if item is not self.camera and item is not self.light_source
+                    ]
+
+                p1 = Points(LEFT).show()
+                p2 = Points(RIGHT).show()
+                testcase_self.assertEqual(tested(apprs.changed), [p1, p2])
+                testcase_self.assertEqual(tested(apprs.untracked), [])
+
+                self.forward(1)
+                testcase_self.assertEqual(tested(apprs.changed), [])
+
+                p1.points.shift(RIGHT)
+                testcase_self.assertEqual(tested(apprs.changed), [p1])
+
+                self.forward(1)
+                p2.add(Points(UP))
+                p2.points.set([UP])
+                testcase_self.assertEqual(tested(apprs.changed), [p2])
+
+                self.forward(1)
+                self.p1, self.p2 = p1, p2
+
+        tl = MyTimeline()
+        tl.build(quiet=True)
+
+        self.assertEqual(len(tl.item_appearances[tl.p1].stack.stacks), 2)
+        self.assertEqual(len(tl.item_appearances[tl.p2].stack.stacks), 2)
+
+        for item, t, point, children in [
+            (tl.p1, 0.5, LEFT, 0),
+            (tl.p1, 1.5, ORIGIN, 0),
+            (tl.p2, 1.5, RIGHT, 0),
+            (tl.p2, 2.5, UP, 1),
+        ]:
+            data = item.current(as_time=t)
+            self.assertListEqual(data.points.get().tolist(), [point.tolist()])
+            self.assertEqual(len(data.get_children()), children)
+
     def test_fmt_time(self) -> None:
         self.assertEqual(  '     21s      ', Timeline.fmt_time(21))
         self.assertEqual(  '     59s      ', Timeline.fmt_time(59))
@@ -99,6 +189,97 @@ class TimelineTest(unittest.TestCase):
 
         self.assertGreater(built.duration, 0)
 
+    def test_static_fingerprint(self) -> None:
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                p = Points(LEFT, RIGHT).show()
+                self.forward(1)
+                self.play(p.anim.points.shift(LEFT))
+                self.forward(1)
+                p.points.shift(RIGHT)
+                self.forward(1)
+
+        built = MyTimeline().build(quiet=True)
+
+        fp1 = built.static_fingerprint(0.2)
+        self.assertIsNotNone(fp1)
+        self.assertEqual(built.static_fingerprint(0.8), fp1)
+
+        # 动画过程中与时间有关
+        self.assertIsNone(built.static_fingerprint(1.5))
+
+        fp2 = built.static_fingerprint(2.2)
+        fp3 = built.static_fingerprint(3.2)
+        self.assertIsNotNone(fp2)
+        self.assertEqual(built.static_fingerprint(2.8), fp2)
+        self.assertNotEqual(fp2, fp1)
+        self.assertNotEqual(fp3, fp2)
+        self.assertEqual(built.static_fingerprint(built.duration), fp3)
+
+    def test_audio_samples(self) -> None:
+        class SubTimeline(Timeline):
+            def construct(self) -> None:
+                self.forward(0.5)
+                self.play_audio(constant_audio(-7))
+                self.forward(1)
+
+        class MyTimeline(Timeline):
+            def construct(self) -> None:
+                self.play_audio(constant_audio(30000))
+                self.play_audio(constant_audio(30000), delay=0.5)
+                self.forward(1)
+                SubTimeline().build(quiet=True).to_item().show()
+                self.forward(2)
+
+        built = MyTimeline().build(quiet=True)
+        samples = built.get_audio_samples_between(100, 0, 3)[:, 0]
+
+        # 叠加时截断到 int16 的范围，而不是溢出
+        np.testing.assert_array_equal(samples[:50], 30000)
+        np.testing.assert_array_equal(samples[50:100], 32767)
+        np.testing.assert_array_equal(samples[100:150], 30000)
+        # 子 Timeline 中的音频按照其所在的时间偏移
+        np.testing.assert_array_equal(samples[150:250], -7)
+        np.testing.assert_array_equal(samples[250:], 0)
+
+        # 像 AudioWriter 那样逐秒提取，结果相同
+        pieces = [built.get_audio_samples_between(100, t, t + 1) for t in range(3)]
+        np.testing.assert_array_equal(np.concatenate(pieces)[:, 0], samples)
+
+    def test_pickle_timeline(self) -> None:
+        built = _Section0().build(quiet=True)
+        timeline = pickle.loads(pickle.dumps(built.timeline))
+        rebuilt = BuiltTimeline(timeline)
+
+        self.assertEqual(rebuilt.duration, built.duration)
+        self.assertEqual(len(timeline.item_appearances), len(built.timeline.item_appearances))
+        np.testing.assert_array_equal(
+            rebuilt.get_audio_samples_between(100, 0, 1),
+            built.get_audio_samples_between(100, 0, 1),
+        )
+
+    def test_parallel_listed_timelines(self) -> None:
+        serial = _Sections().build(quiet=True)
+        with self.assertLogs(log, 'INFO') as cm:
+            parallel = _ParallelSections().build(quiet=True)
+
+        # 两个部分都是在子进程中构建的，而没有回退到在当前进程中构建
+        self.assertFalse([record for record in cm.records if record.levelno >= logging.WARNING])
+        self.assertEqual(
+            sum(
+                record.getMessage().strip().startswith('Built')
+                and record.getMessage().endswith('in a worker process')
+                for record in cm.records
+            ),
+            2,
+        )
+
+        self.assertEqual(parallel.duration, serial.duration)
+        np.testing.assert_array_equal(
+            parallel.get_audio_samples_between(100, 0, serial.duration),
+            serial.get_audio_samples_between(100, 0, serial.duration),
+        )
+
     def test_exceptions(test) -> None:
         test.assertIs(Timeline.get_context(raise_exc=False), None)
 
@@ -0,0 +1,82 @@
+import multiprocessing as mp
+import multiprocessing.connection
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import av
+
+from janim.anims.timeline import Timeline
+from janim.cli.execute import WriteOptions, write_in_jobs
+from janim.cli.options import FormatOptions, HardwareOptions, RangeOptions
+from janim.items.geometry.arc import Dot
+from janim.utils.config import Config, override_cli_config
+
+
+# 定义在模块层级，使得子进程可以重新构建
+class _JobTimelineA(Timeline):
+    CONFIG = Config(fps=10, pixel_width=64, pixel_height=36)
+
+    def construct(self) -> None:
+        self.play(Dot().anim.points.shift([1, 0, 0]), duration=1)
+
+
+class _JobTimelineB(Timeline):
+    CONFIG = Config(fps=10, pixel_width=64, pixel_height=36)
+
+    def construct(self) -> None:
+        self.play(Dot().anim.points.shift([0, 1, 0]), duration=0.5)
+
+
+def write_options(jobs: int) -> WriteOptions:
+    return WriteOptions(
+        FormatOptions(format='mp4', audio_format='mp3', proxy=None, proxy_fps=None),
+        (False, True, False, False),
+        RangeOptions(in_point=None, out_point=None),
+        HardwareOptions(
+            disable_pbo=False,
+            hwaccel=False,
+            disable_frame_reuse=False,
+            segment_cache=False,
+            gpu_yuv=False,
+            workers=1,
+            jobs=jobs,
+            perf=False,
+            perf_report=None,
+        ),
+        None,
+        multiple=True,
+    )
+
+
+class WriteInJobsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+
+    def test_write_in_jobs(self) -> None:
+        with override_cli_config(output_dir=self.dir.name):
+            ret = write_in_jobs([_JobTimelineA, _JobTimelineB], False, False, write_options(2))
+        self.assertTrue(ret)
+
+        # 包括结尾的一帧
+        for name, frames in (('_JobTimelineA', 11), ('_JobTimelineB', 6)):
+            with av.open(os.path.join(self.dir.name, f'{name}.mp4')) as container:
+                self.assertEqual(sum(1 for _ in container.decode(video=0)), frames)
+
+        self.assertListEqual(mp.active_children(), [])
+
+    def test_interrupted(self) -> None:
+        def interrupt(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        # 中断时结束仍在运行的子进程
+        with (
+            override_cli_config(output_dir=self.dir.name),
+            mock.patch.object(multiprocessing.connection, 'wait', interrupt),
+            self.assertRaises(KeyboardInterrupt),
+        ):
+            write_in_jobs([_JobTimelineA, _JobTimelineB], False, False, write_options(2))
+
+        self.assertListEqual(mp.active_children(), [])
@@ -2,6 +2,8 @@ import unittest
 from typing import Self
 
 from janim.components.component import CmptGroup, CmptInfo, Component
+from janim.components.data import Cmpt_Data
+from janim.components.points import Cmpt_Points
 from janim.exception import AsTypeError, CmptGroupLookupError
 from janim.items.item import Item
 from janim.items.group import Group
@@ -156,3 +158,15 @@ class ComponentTest(unittest.TestCase):
 
         with self.assertRaises(AttributeError):
             item3.cmpt.fn1
+
+    def test_tracks_changes(self) -> None:
+        class MyPoints[T](Cmpt_Points[T], impl=True): ...
+
+        class MyPoints2[T](Cmpt_Points[T], impl=True):
+            def not_changed(self, other) -> bool:
+                return False
+
+        self.assertTrue(MyPoints.tracks_changes)
+        # 重新实现了 not_changed，但没有声明 tracks_changes
+        self.assertFalse(MyPoints2.tracks_changes)
+        self.assertFalse(Cmpt_Data.tracks_changes)
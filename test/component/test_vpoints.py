@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+
+from janim.components.vpoints import Cmpt_VPoints
+from janim.constants import NAN_POINT
+from janim.utils.bezier import partial_quadratic_bezier_points
+from janim.utils.space_ops import get_norm
+
+
+def insert_n_curves_to_point_list_reference(n: int, points: np.ndarray) -> np.ndarray:
+    # 逐次分配插入、逐段分割曲线的实现，用于检验结果是否完全相同
+    bezier_tuples = list(Cmpt_VPoints.get_bezier_tuples_from_points(points))
+    norms = [
+        0 if np.isnan(tup[1][0]) else get_norm(tup[2] - tup[0])
+        for tup in bezier_tuples
+    ]
+    ipc = np.zeros(len(bezier_tuples), dtype=int)
+    for _ in range(n):
+        index = np.argmax(norms)
+        ipc[index] += 1
+        norms[index] *= ipc[index] / (ipc[index] + 1)
+
+    new_points = [points[0]]
+    for tup, n_inserts in zip(bezier_tuples, ipc):
+        alphas = np.linspace(0, 1, n_inserts + 2)
+        for a1, a2 in zip(alphas, alphas[1:]):
+            new_points.extend(partial_quadratic_bezier_points(tup, a1, a2)[1:])
+
+    return np.vstack(new_points)
+
+
+class VPointsTest(unittest.TestCase):
+    def test_insert_n_curves_to_point_list(self) -> None:
+        rng = np.random.default_rng(2)
+        points = rng.normal(size=(21, 3)).astype(np.float32)
+        # 含有子路径的分隔
+        points[9] = NAN_POINT
+        # 长度完全相同的曲线，插入的分配顺序需要与逐次 argmax 时相同
+        points[12:17] = [[0, 0, 0], [1, 1, 0], [2, 0, 0], [3, 1, 0], [4, 0, 0]]
+
+        for n in (0, 1, 3, 10, 57):
+            result = Cmpt_VPoints.insert_n_curves_to_point_list(n, points)
+            expected = insert_n_curves_to_point_list_reference(n, points)
+
+            self.assertEqual(result.shape, (len(points) + 2 * n, 3))
+            self.assertEqual(result.dtype, expected.dtype)
+            np.testing.assert_array_equal(result, expected)
+
+        result = Cmpt_VPoints.insert_n_curves_to_point_list(2, points[:1])
+        np.testing.assert_array_equal(result, np.repeat(points[:1], 5, 0))
+
+    def test_distribute_insertions(self) -> None:
+        self.assertListEqual(Cmpt_VPoints.distribute_insertions(5, [1, 1]).tolist(), [3, 2])
+        self.assertListEqual(Cmpt_VPoints.distribute_insertions(4, [3.5, 1, 0]).tolist(), [3, 1, 0])
+        self.assertListEqual(Cmpt_VPoints.distribute_insertions(3, [1, np.nan]).tolist(), [0, 3])
+        self.assertListEqual(Cmpt_VPoints.distribute_insertions(0, [1, 2]).tolist(), [0, 0])
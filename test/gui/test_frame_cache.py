@@ -0,0 +1,147 @@
+import unittest
+from types import SimpleNamespace
+
+from PySide6.QtCore import QCoreApplication, QObject
+
+from janim.gui.frame_cache import RENDER_AHEAD_SECONDS, FrameCache
+from janim.render.base import create_context_430_or_330
+
+
+class _FakeGLWidget(QObject):
+    def __init__(self, ctx, width: int, height: int):
+        super().__init__()
+        self.ctx = ctx
+        self.w = width
+        self.h = height
+        self.visible = False
+        self.inject_camera = None
+        self.profiler = None
+
+    def width(self) -> int:
+        return self.w
+
+    def height(self) -> int:
+        return self.h
+
+    def devicePixelRatio(self) -> float:
+        return 1.0
+
+    def isVisible(self) -> bool:
+        return self.visible
+
+    def makeCurrent(self) -> None:
+        pass
+
+
+def _fake_built(fps: int, duration: float):
+    return SimpleNamespace(cfg=SimpleNamespace(preview_fps=fps), duration=duration)
+
+
+class FrameCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+        cls.ctx = create_context_430_or_330(standalone=True)
+
+    def create(self, width: int = 4, height: int = 4, frames: int = 8) -> FrameCache:
+        glw = _FakeGLWidget(self.ctx, width, height)
+        cache = FrameCache(glw, budget=width * height * 4 * frames)
+        cache.set_built(_fake_built(30, 10))
+        self.addCleanup(cache.clear)
+        return cache
+
+    def test_to_progress(self) -> None:
+        cache = self.create()
+        self.assertEqual(cache.to_progress(0), 0)
+        self.assertEqual(cache.to_progress(1), 30)
+        # 浮点误差在容许范围内时，仍视为恰好位于某一帧
+        self.assertEqual(cache.to_progress(0.1), 3)
+        self.assertEqual(cache.to_progress(7 / 30), 7)
+        self.assertEqual(cache.to_progress(1 / 3 - 1e-9), 10)
+        # 不是恰好位于某一帧
+        self.assertIsNone(cache.to_progress(0.01))
+        self.assertIsNone(cache.to_progress(1 / 60))
+
+    def test_capacity(self) -> None:
+        cache = self.create(width=4, height=2, frames=5)
+        self.assertEqual(cache.capacity, 0)  # 还未得知尺寸
+
+        self.assertTrue(cache._check_size())
+        self.assertEqual(cache.size, (4, 2))
+        self.assertEqual(cache.frame_bytes, 4 * 2 * 4)
+        self.assertEqual(cache.capacity, 5)
+
+        # 预算连一帧都放不下时不可用
+        cache.budget = cache.frame_bytes - 1
+        self.assertEqual(cache.capacity, 0)
+        self.assertFalse(cache._check_size())
+
+    def test_allocate_lru(self) -> None:
+        cache = self.create(frames=3)
+        cache._check_size()
+
+        for progress in range(3):
+            self.assertIsNotNone(cache._allocate(progress))
+        self.assertListEqual(list(cache.frames), [0, 1, 2])
+
+        # 超出容量时淘汰最久未使用的帧
+        cache._allocate(3)
+        self.assertListEqual(list(cache.frames), [1, 2, 3])
+
+        # 使用过的帧会被移到末尾，不会被优先淘汰
+        cache.frames.move_to_end(1)
+        cache._allocate(4)
+        self.assertListEqual(list(cache.frames), [3, 1, 4])
+        self.assertLessEqual(len(cache.frames) * cache.frame_bytes, cache.budget)
+
+        # 尺寸改变时清空缓存
+        cache.glw.w = 8
+        cache._check_size()
+        self.assertEqual(len(cache.frames), 0)
+        self.assertEqual(cache.capacity, 1)
+
+    def test_next_missing(self) -> None:
+        cache = self.create(frames=1000)
+        ahead = round(RENDER_AHEAD_SECONDS * 30)
+
+        self.assertEqual(cache._next_missing(), 1)
+
+        cache.playhead = 10
+        cache.frames.update({11: None, 12: None})
+        cache.failed.add(13)
+        self.assertEqual(cache._next_missing(), 14)
+
+        # 播放位置之后的帧都已缓存
+        cache.frames.update({i: None for i in range(14, 10 + ahead + 1)})
+        self.assertIsNone(cache._next_missing())
+        cache.frames.clear()
+
+        # 不超出时间轴的结尾
+        cache.playhead = 300
+        self.assertIsNone(cache._next_missing())
+        cache.playhead = 299
+        self.assertEqual(cache._next_missing(), 300)
+
+        # 为播放位置之前的帧保留 1/4 的空间
+        cache.budget = cache.frame_bytes * 8
+        cache.playhead = 0
+        cache.frames.update({i: None for i in range(1, 7)})
+        self.assertIsNone(cache._next_missing())
+        cache.frames.clear()
+
+    def test_paused(self) -> None:
+        cache = self.create()
+        cache.glw.visible = True
+
+        cache.set_playhead(5)
+        self.assertTrue(cache.idle_timer.isActive())
+
+        # 播放时暂停预先渲染
+        cache.set_paused(True)
+        self.assertFalse(cache.idle_timer.isActive())
+        cache.set_playhead(6)
+        self.assertEqual(cache.playhead, 6)
+        self.assertFalse(cache.idle_timer.isActive())
+
+        cache.set_paused(False)
+        self.assertTrue(cache.idle_timer.isActive())
@@ -398,6 +398,54 @@ class PointsTest(unittest.TestCase):
             [UP, DOWN]
         )
 
+    def test_pointwise_transform(self) -> None:
+        def build() -> Group[Points]:
+            return Group(
+                *[
+                    Points(*(np.array([[i, i % 3, -i], [i * 0.5, 1, 2], [0, -i, 1]]) * 0.1))
+                    for i in range(10)
+                ],
+                Points(),
+            )
+
+        def transform(g: Group[Points]) -> None:
+            g.points.shift(UR)
+            g.points.rotate(30 * DEGREES, axis=OUT + RIGHT)
+            g.points.scale(1.5, about_edge=DL)
+            g.points.stretch(2, dim=1)
+            g.points.apply_matrix([[1, 0.5, 0], [0, 1, 0], [0, 0.2, 1]])
+            g.points.apply_point_fn(lambda p: p * 2 + UP)
+
+        g1 = build()
+        transform(g1)
+
+        # 逐个变换子物件，将位置参考点固定为整体变换时的参考点，得到的结果应当相同
+        g2 = build()
+        for item in g2:
+            item.points.shift(UR)
+        about = g2.points.box.center
+        for item in g2:
+            item.points.rotate(30 * DEGREES, axis=OUT + RIGHT, about_point=about)
+        about = g2.points.box.get(DL)
+        for item in g2:
+            item.points.scale(1.5, about_point=about)
+        about = g2.points.box.center
+        for item in g2:
+            item.points.stretch(2, dim=1, about_point=about)
+        for item in g2:
+            item.points.apply_matrix([[1, 0.5, 0], [0, 1, 0], [0, 0.2, 1]])
+        for item in g2:
+            item.points.apply_point_fn(lambda p: p * 2 + UP)
+
+        for item1, item2 in zip(g1, g2):
+            self.assertEqual(item1.points.count(), item2.points.count())
+            self.assertNparrayClose(item1.points.get(), item2.points.get())
+            self.assertFalse(item1.points.get().flags.writeable)
+
+        # 变换后边界框也随之更新
+        self.assertNparrayClose(g1.points.box.data, g2.points.box.data)
+        self.assertNparrayClose(g1[3].points.box.data, g2[3].points.box.data)
+
 
 class NamedGroupTest(unittest.TestCase):
     def test_named_group(self) -> None:
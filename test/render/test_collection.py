@@ -0,0 +1,120 @@
+import gc
+import random
+import unittest
+import weakref
+
+import numpy as np
+
+from janim.camera.camera import Camera
+from janim.items.geometry.arc import Dot
+from janim.render.base import BatchRenderer, RenderData, Renderer
+from janim.render.collection import MIN_BATCH_SIZE, RenderCollection
+from janim.utils.data import ContextSetter
+from janim.utils.space_ops import normalize
+
+
+class _FakeContext:
+    extra = None
+
+
+class RenderCollectionTest(unittest.TestCase):
+    def test_sort_indices(self) -> None:
+        rng = random.Random(0)
+
+        camera = Camera()
+        camera.points.rotate(0.3, axis=np.array([1, 0, 0]))
+        info = camera.points.info
+        render_data = RenderData(
+            ctx=None,
+            camera_info=info,
+            light_source_location=np.zeros(3),
+            anti_alias_radius=0,
+        )
+
+        dots = []
+        for _ in range(200):
+            dot = Dot(np.array([rng.randint(-3, 3), rng.randint(-3, 3), rng.randint(-3, 3)]))
+            dot.depth.set(rng.randint(-2, 2))
+            if rng.random() < 0.5:
+                dot.apply_distance_sort()
+            dots.append(dot)
+        renders = [(dot, None) for dot in dots]
+
+        camera_vec = normalize(-info.camera_axis)
+
+        # 与逐个计算 key 并排序的结果一致
+        def key(x):
+            ref = x[0].distance_sort_reference_point
+            distance = np.inf if ref is None else np.dot(camera_vec, ref - info.camera_location)
+            return (distance, x[0].depth)
+
+        expected = sorted(renders, key=key, reverse=True)
+
+        with ContextSetter(Renderer.data_ctx, render_data):
+            indices = RenderCollection.sort_indices(renders)
+            self.assertListEqual([renders[i] for i in indices], expected)
+
+            self.assertEqual(len(RenderCollection.sort_indices([])), 0)
+
+    def test_batch(self) -> None:
+        calls = []
+
+        class MyBatchRenderer(BatchRenderer):
+            @staticmethod
+            def get_key(item):
+                return item.key
+
+            def render(self, items) -> None:
+                calls.append(('batch', [item.name for item in items]))
+
+        class MyRenderer(Renderer):
+            batch_cls = MyBatchRenderer
+
+        class FakeItem:
+            renderer_cls = MyRenderer
+
+            def __init__(self, name: str, key):
+                self.name = name
+                self.key = key
+
+        def render(item) -> None:
+            calls.append(('single', item.name))
+
+        n = MIN_BATCH_SIZE
+        items = [
+            *[FakeItem(f'a{i}', 0) for i in range(n)],
+            FakeItem('b', None),
+            *[FakeItem(f'c{i}', 1) for i in range(n - 1)],
+            *[FakeItem(f'd{i}', 0) for i in range(n)],
+        ]
+        batchable = [True] * len(items)
+        # 不可合并的物件会将连续的物件分开
+        batchable[-1] = False
+
+        ctx = _FakeContext()
+        render_data = RenderData(
+            ctx=ctx,
+            camera_info=Camera().points.info,
+            light_source_location=np.zeros(3),
+            anti_alias_radius=0,
+        )
+        with ContextSetter(Renderer.data_ctx, render_data):
+            RenderCollection._render([(item, render) for item in items], batchable)
+
+        self.assertListEqual(
+            calls,
+            [
+                ('batch', [f'a{i}' for i in range(n)]),
+                ('single', 'b'),
+                *[('single', f'c{i}') for i in range(n - 1)],
+                *[('single', f'd{i}') for i in range(n - 1)],
+                ('single', f'd{n - 1}'),
+            ],
+        )
+
+        # BatchRenderer 的实例存放在 ctx 中，不会使 ctx 无法被回收
+        self.assertEqual(len(ctx.extra['janim_batch_renderers'][MyBatchRenderer]), 1)
+        ctx_ref = weakref.ref(ctx)
+        del ctx, render_data
+        gc.collect()
+        self.assertIsNone(ctx_ref())
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image
+
+from janim.render.encoder import AudioTrack, ImageSequenceEncoder, PyavVideoEncoder
+
+
+class PyavVideoEncoderTest(unittest.TestCase):
+    def test_audio_track(self) -> None:
+        import av
+
+        pw, ph, fps, framerate = 16, 8, 10, 8000
+        chunks = [(t, np.full((framerate, 2), 1000, dtype=np.int16)) for t in range(2)]
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'out.mp4')
+            encoder = PyavVideoEncoder()
+            encoder.open(path, pw, ph, fps, audio=AudioTrack(framerate, 2, chunks))
+            for _ in range(fps * 2):
+                encoder.write(bytes(pw * ph * 4))
+            encoder.finish()
+
+            with av.open(path) as container:
+                self.assertEqual(len(container.streams.video), 1)
+                self.assertEqual(len(container.streams.audio), 1)
+                self.assertAlmostEqual(container.duration / av.time_base, 2, delta=0.1)
+
+                samples = sum(frame.samples for frame in container.decode(audio=0))
+                self.assertAlmostEqual(samples, framerate * 2, delta=framerate * 0.1)
+
+
+class ImageSequenceEncoderTest(unittest.TestCase):
+    def test_png_sequence(self) -> None:
+        pw, ph = 8, 4
+        rng = np.random.default_rng(0)
+        images = [rng.integers(0, 256, (ph, pw, 4), dtype=np.uint8) for _ in range(3)]
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'out')
+            encoder = ImageSequenceEncoder('.png-seq')
+            encoder.open(path, pw, ph, 30)
+
+            # 通过缓冲提交，其中第二帧重复提交了一次
+            for image in images[:2]:
+                idx = encoder.ring.acquire()
+                encoder.ring.buffers[idx][:] = image
+                encoder.write_ring_buffer(idx)
+            encoder.ring.retain(idx)
+            encoder.write_ring_buffer(idx)
+
+            # 通过自下而上排列的 bytes 提交
+            encoder.write(images[2][::-1].tobytes())
+            encoder.finish()
+
+            self.assertEqual(
+                sorted(os.listdir(path)),
+                ['000000.png', '000001.png', '000002.png', '000003.png'],
+            )
+            for name, image in zip(sorted(os.listdir(path)), [*images[:2], *images[1:]]):
+                with Image.open(os.path.join(path, name)) as saved:
+                    np.testing.assert_array_equal(np.asarray(saved), image)
+
+            # 所有缓冲都已归还
+            self.assertEqual(encoder.ring.free_queue.qsize(), len(encoder.ring.buffers))
@@ -0,0 +1,208 @@
+import base64
+import multiprocessing as mp
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import av
+
+import janim.render.farm as farm
+from janim.anims.timeline import Timeline
+from janim.exception import RenderWorkerError
+from janim.items.geometry.arc import Dot
+from janim.render.farm import (
+    MAX_ATTEMPTS,
+    FarmCoordinator,
+    FarmSettings,
+    _FarmServer,
+    _start_server,
+    decode_source,
+    encode_source,
+    recv_message,
+    run_worker,
+    send_message,
+)
+from janim.render.parallel import TimelineSource
+from janim.render.writer import concat_videos
+from janim.utils.config import Config
+
+
+# 定义在模块层级，使得 worker 进程可以重新构建
+class _FarmTimeline(Timeline):
+    CONFIG = Config(fps=10, pixel_width=64, pixel_height=36)
+
+    def construct(self) -> None:
+        self.play(Dot().anim.points.shift([1, 0, 0]), duration=1)
+
+
+def encode_source_object(source: TimelineSource) -> str:
+    return base64.b64encode(pickle.dumps(source)).decode()
+
+
+class FakeWorker:
+    def __init__(self, port: int):
+        self.sock = socket.create_connection(('127.0.0.1', port))
+        self.rfile = self.sock.makefile('rb')
+
+    def request(self) -> dict:
+        send_message(self.sock, {'type': 'request'})
+        return recv_message(self.rfile)
+
+    def close(self) -> None:
+        self.rfile.close()
+        self.sock.close()
+
+
+class FarmTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = tempfile.TemporaryDirectory()
+        self.source = TimelineSource(
+            file=os.path.abspath(__file__),
+            name='Test',
+            configs={},
+            hide_subtitles=False,
+            external_typst=False,
+            lang='en',
+            loglevel=0,
+        )
+
+    def tearDown(self) -> None:
+        self.dir.cleanup()
+
+    def coordinator(
+        self, chunks: list[tuple[int, int]], source: TimelineSource | None = None, prefix: str = ''
+    ) -> FarmCoordinator:
+        part_paths = [
+            os.path.join(self.dir.name, f'{prefix}part{i}.mp4') for i in range(len(chunks))
+        ]
+        settings = FarmSettings('.mp4', True, False, False, True)
+        return FarmCoordinator(source or self.source, chunks, part_paths, settings)
+
+    def start(self, chunks: list[tuple[int, int]]) -> tuple[FarmCoordinator, _FarmServer, int]:
+        coordinator = self.coordinator(chunks)
+
+        server = _FarmServer(('127.0.0.1', 0), coordinator)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return coordinator, server, server.server_address[1]
+
+    def test_retry_dead_worker(self) -> None:
+        coordinator, server, port = self.start([(0, 10), (10, 20)])
+
+        # 领取区段后直接断开连接，区段会被重新分配
+        dead = FakeWorker(port)
+        job = dead.request()
+        self.assertEqual(job['type'], 'job')
+        self.assertEqual((job['start_frame'], job['end_frame']), (0, 10))
+        dead.close()
+
+        worker = FakeWorker(port)
+        received = []
+        for _ in range(2):
+            job = worker.request()
+            received.append(job['chunk'])
+            data = f'chunk{job["chunk"]}'.encode()
+            send_message(worker.sock, {'type': 'result', 'size': len(data)}, data)
+
+        self.assertEqual(sorted(received), [0, 1])
+        coordinator.wait()
+        for i, path in enumerate(coordinator.part_paths):
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), f'chunk{i}'.encode())
+
+        # 关闭服务时告知 worker 已经完成
+        send_message(worker.sock, {'type': 'request'})
+        server.close()
+        self.assertEqual(recv_message(worker.rfile)['type'], 'done')
+        worker.close()
+
+    def test_retry_unresponsive_worker(self) -> None:
+        coordinator, server, port = self.start([(0, 10)])
+
+        with mock.patch.object(farm, 'HEARTBEAT_TIMEOUT', 0.2):
+            # 领取区段后既不断开连接，也不发送任何消息，超时后区段会被重新分配
+            hung = FakeWorker(port)
+            self.assertEqual(hung.request()['chunk'], 0)
+
+            worker = FakeWorker(port)
+            self.assertEqual(worker.request()['chunk'], 0)
+            hung.close()
+
+            # 定时发送的 heartbeat 使得区段不会超时
+            for _ in range(3):
+                threading.Event().wait(0.1)
+                send_message(worker.sock, {'type': 'heartbeat'})
+            send_message(worker.sock, {'type': 'result', 'size': 2}, b'ok')
+
+        coordinator.wait()
+        self.assertEqual(coordinator.attempts, [2])
+        worker.close()
+
+    def test_too_many_failures(self) -> None:
+        coordinator, server, port = self.start([(0, 10)])
+
+        worker = FakeWorker(port)
+        for _ in range(MAX_ATTEMPTS):
+            job = worker.request()
+            self.assertEqual(job['chunk'], 0)
+            send_message(worker.sock, {'type': 'error', 'message': 'failed'})
+
+        with self.assertRaises(RenderWorkerError):
+            coordinator.wait()
+
+        send_message(worker.sock, {'type': 'request'})
+        server.close()
+        self.assertEqual(recv_message(worker.rfile)['type'], 'done')
+        worker.close()
+
+    def test_worker_processes(self) -> None:
+        source = TimelineSource.from_class(_FarmTimeline, False)
+        self.assertIsNotNone(source)
+
+        server = _start_server(('127.0.0.1', 0))
+        self.addCleanup(server.server_close)
+        port = server.server_address[1]
+
+        ctx = mp.get_context('spawn')
+        workers = [ctx.Process(target=run_worker, args=('127.0.0.1', port)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        self.addCleanup(lambda: [worker.kill() for worker in workers if worker.is_alive()])
+
+        # 依次输出两个“时间轴”，worker 在两者之间保持连接
+        for prefix in ('a_', 'b_'):
+            coordinator = self.coordinator([(0, 3), (3, 6), (6, 10)], source, prefix)
+            server.set_coordinator(coordinator)
+            coordinator.wait()
+            server.set_coordinator(None)
+
+            output = os.path.join(self.dir.name, f'{prefix}output.mp4')
+            concat_videos(coordinator.part_paths, output)
+            with av.open(output) as container:
+                self.assertEqual(sum(1 for _ in container.decode(video=0)), 10)
+
+            self.assertTrue(all(worker.is_alive() for worker in workers))
+
+        server.close()
+        for worker in workers:
+            worker.join(30)
+            self.assertEqual(worker.exitcode, 0)
+
+    def test_decode_source(self) -> None:
+        data = encode_source(self.source)
+
+        # 本地存在相同的文件时直接使用
+        self.assertEqual(decode_source(data).file, self.source.file)
+
+        # 否则将收到的代码写入临时目录
+        self.source.file = os.path.join(self.dir.name, 'missing.py')
+        data['source'] = encode_source_object(self.source)
+        source = decode_source(data)
+        self.assertNotEqual(source.file, self.source.file)
+        with open(source.file, 'rb') as f1, open(__file__, 'rb') as f2:
+            self.assertEqual(f1.read(), f2.read())
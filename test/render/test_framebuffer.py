@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from janim.render.base import create_context_430_or_330
+from janim.render.framebuffer import FrameBuffer
+
+
+class FrameBufferTest(unittest.TestCase):
+    def test_yuv420p(self) -> None:
+        ctx = create_context_430_or_330(standalone=True)
+        pw, ph = 16, 8
+
+        rng = np.random.default_rng(0)
+        image = rng.integers(0, 256, (ph, pw, 4), dtype=np.uint8)
+        image[..., 3] = 255
+
+        fbo = FrameBuffer(ctx, pw, ph, (0, 0, 0), False)
+        fbo._fbo.color_attachments[0].write(image.tobytes())
+
+        data = np.empty((ph * 3 // 2, pw), dtype=np.uint8)
+        with fbo.context():
+            with fbo.yuv420p_context() as yuv_fbo:
+                yuv_fbo.read_into(data, components=4)
+
+        # OpenGL 中的行是自下而上的，而 yuv420p 中的行是自上而下的
+        rgb = image[::-1, :, :3] / 255
+        luma = np.array([0.2126, 0.7152, 0.0722])
+
+        y = 16 + 219 * rgb @ luma
+        np.testing.assert_allclose(data[:ph], y, atol=0.51)
+
+        block = rgb.reshape(ph // 2, 2, pw // 2, 2, 3).mean(axis=(1, 3))
+        block_y = block @ luma
+        u = 128 + 224 * (block[..., 2] - block_y) / 1.8556
+        v = 128 + 224 * (block[..., 0] - block_y) / 1.5748
+
+        chroma = data[ph:].reshape(2, ph // 2, pw // 2)
+        np.testing.assert_allclose(chroma[0], u, atol=0.51)
+        np.testing.assert_allclose(chroma[1], v, atol=0.51)
+
+        ctx.release()
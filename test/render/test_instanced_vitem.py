@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from janim.anims.timeline import Timeline
+from janim.constants import BLUE, GREEN, RED, RIGHT, YELLOW
+from janim.items.geometry.polygon import Square
+from janim.items.vitem import InstancedVItem
+from janim.render.renderer.r_instanced_vitem import InstancedVItemRenderer
+from janim.utils.config import Config
+
+POSITIONS = [[x, y, 0] for x in np.linspace(-5, 5, 9) for y in np.linspace(-2.5, 2.5, 5)]
+
+
+def _instanced() -> InstancedVItem:
+    shape = Square(0.6, fill_alpha=0.5, color=YELLOW).points.rotate(0.3).r
+    return InstancedVItem(shape, *POSITIONS, color=[RED, GREEN, BLUE])
+
+
+class _InstancedTimeline(Timeline):
+    CONFIG = Config(pixel_width=320, pixel_height=180)
+
+    def construct(self) -> None:
+        _instanced().show()
+        self.forward()
+
+
+class _SeparateTimeline(Timeline):
+    CONFIG = Config(pixel_width=320, pixel_height=180)
+
+    def construct(self) -> None:
+        _instanced().to_items().show()
+        self.forward()
+
+
+class InstancedVItemTest(unittest.TestCase):
+    def test_to_items(self) -> None:
+        item = InstancedVItem(Square(1, color=YELLOW).points.shift(RIGHT).r, [0, 0, 0], [2, 1, 0])
+        item.color.set([RED, BLUE])
+
+        items = item.to_items()
+        self.assertEqual(len(items), 2)
+
+        # 形状的中心被放在各个位置上
+        np.testing.assert_allclose(items[0].points.box.center, [0, 0, 0], atol=1e-6)
+        np.testing.assert_allclose(items[1].points.box.center, [2, 1, 0], atol=1e-6)
+
+        # 描边颜色与每个实例的颜色相乘
+        yellow = item.shape.stroke.get()[0]
+        np.testing.assert_allclose(items[0].stroke.get()[0], yellow * item.color.get()[0])
+        np.testing.assert_allclose(items[1].stroke.get()[0], yellow * item.color.get()[1])
+
+    def test_align_for_interpolate(self) -> None:
+        item1 = InstancedVItem(Square(), [0, 0, 0])
+        item2 = InstancedVItem(Square(), [0, 0, 0], [1, 0, 0], [2, 0, 0])
+
+        aligned = InstancedVItem.align_for_interpolate(item1, item2)
+        self.assertEqual(aligned.data1.points.count(), 3)
+        self.assertEqual(aligned.data1.color.count(), 3)
+        self.assertEqual(aligned.data2.color.count(), 3)
+
+    def test_render(self) -> None:
+        # 不允许回退到逐个绘制，确保实际使用的是实例化绘制
+        with mock.patch.object(
+            InstancedVItemRenderer, 'render_separately', side_effect=AssertionError
+        ):
+            instanced = np.asarray(_InstancedTimeline().build(quiet=True).capture(0.5))
+
+        separate = np.asarray(_SeparateTimeline().build(quiet=True).capture(0.5))
+
+        self.assertGreater(instanced[..., 3].max(), 0)
+        np.testing.assert_allclose(instanced, separate, atol=2)
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from janim.render.encoder import PyavVideoEncoder
+from janim.render.parallel import split_frame_range
+from janim.render.writer import concat_videos
+
+
+class ParallelTest(unittest.TestCase):
+    def test_split_frame_range(self) -> None:
+        self.assertEqual(
+            split_frame_range(0, 10, 3),
+            [(0, 3), (3, 6), (6, 10)],
+        )
+        self.assertEqual(
+            split_frame_range(5, 13, 4),
+            [(5, 7), (7, 9), (9, 11), (11, 13)],
+        )
+        # 区段数量不会超过帧数
+        self.assertEqual(
+            split_frame_range(0, 2, 8),
+            [(0, 1), (1, 2)],
+        )
+        self.assertEqual(
+            split_frame_range(0, 7, 1),
+            [(0, 7)],
+        )
+
+    def test_concat_videos(self) -> None:
+        import av
+
+        pw, ph, fps = 16, 8, 10
+
+        with tempfile.TemporaryDirectory() as dir:
+            paths = [os.path.join(dir, f'part{i}.mp4') for i in range(2)]
+            for path, count in zip(paths, (5, 7)):
+                encoder = PyavVideoEncoder()
+                encoder.open(path, pw, ph, fps)
+                for i in range(count):
+                    encoder.write(bytes([i * 20]) * (pw * ph * 4))
+                encoder.finish()
+
+            result = os.path.join(dir, 'result.mp4')
+            concat_videos(paths, result)
+            self.assertFalse(any(os.path.exists(path) for path in paths))
+
+            with av.open(result) as container:
+                stream = container.streams.video[0]
+                packets = [packet for packet in container.demux(stream) if packet.pts is not None]
+
+                # 解码顺序的 dts 单调递增，按显示顺序排列后 pts 不重复，并且帧间隔一致
+                dts = [packet.dts for packet in packets]
+                self.assertListEqual(dts, sorted(dts))
+                self.assertEqual(len(set(dts)), len(dts))
+
+                pts = sorted(packet.pts for packet in packets)
+                times = [float(t * stream.time_base) for t in pts]
+                self.assertEqual(len(times), 12)
+                for i, t in enumerate(times):
+                    self.assertAlmostEqual(t - times[0], i / fps, delta=1e-3)
+
+            with av.open(result) as container:
+                self.assertEqual(sum(1 for _ in container.decode(video=0)), 12)
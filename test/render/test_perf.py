@@ -0,0 +1,51 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from threading import Thread
+
+from janim.render.perf import ExportPerf, PerfQueue
+
+
+class ExportPerfTest(unittest.TestCase):
+    def test_disabled(self) -> None:
+        perf = ExportPerf(enabled=False)
+        with perf.stage('render'):
+            pass
+        self.assertNotIsInstance(perf.queue(3, 'q'), PerfQueue)
+        self.assertEqual(perf.summary()['stages'], {})
+
+    def test_summary(self) -> None:
+        perf = ExportPerf()
+        for _ in range(4):
+            with perf.stage('render'):
+                pass
+
+        queue = perf.queue(1, 'q')
+        self.assertIsInstance(queue, PerfQueue)
+
+        def consume() -> None:
+            time.sleep(0.05)
+            queue.get()
+            queue.get()
+
+        thread = Thread(target=consume)
+        thread.start()
+        queue.put(1)
+        queue.put(2)  # 队列已满，阻塞到 consume 取出第一个
+        thread.join()
+
+        perf.finish(10, 2)
+        summary = perf.summary()
+
+        self.assertEqual(summary['fps'], 5)
+        self.assertEqual(summary['stages']['render']['count'], 4)
+        self.assertGreater(summary['queues']['q']['put_stall'], 0.02)
+        self.assertEqual(summary['queues']['q']['max_depth'], 1)
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, 'perf.json')
+            perf.dump(path)
+            with open(path, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), summary)
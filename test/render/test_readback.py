@@ -0,0 +1,49 @@
+import ctypes
+import unittest
+
+import numpy as np
+import OpenGL.GL as gl
+
+from janim.render.base import create_context_430_or_330
+from janim.render.framebuffer import FrameBuffer
+from janim.render.readback import PBO_MIN_DEPTH, PboRing
+
+
+class PboRingTest(unittest.TestCase):
+    def test_order(self) -> None:
+        ctx = create_context_430_or_330(standalone=True)
+        pw, ph = 8, 4
+        size = pw * ph * 4
+
+        fbo = FrameBuffer(ctx, pw, ph, (0, 0, 0), True)
+        results: list[bytes | None] = []
+
+        def on_read(ptr: int | None) -> None:
+            results.append(None if ptr is None else ctypes.string_at(ptr, size))
+
+        def read_pixels() -> None:
+            gl.glReadPixels(0, 0, pw, ph, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+
+        ring = PboRing(size, on_read, depth=PBO_MIN_DEPTH)
+        images = [np.full((ph, pw, 4), i * 20, dtype=np.uint8) for i in range(6)]
+
+        with fbo.context():
+            for i, image in enumerate(images):
+                fbo._fbo.color_attachments[0].write(image.tobytes())
+                ring.read(read_pixels)
+                if i % 2 == 0:
+                    ring.skip()
+                # 正在传输的 PBO 不会超过 depth
+                self.assertLessEqual(ring.in_flight, ring.depth)
+            ring.finish()
+
+        expected = []
+        for i, image in enumerate(images):
+            expected.append(image.tobytes())
+            if i % 2 == 0:
+                expected.append(None)
+        self.assertEqual(results, expected)
+
+        self.assertEqual(ring.stats.frames, len(images))
+        self.assertEqual(ring.in_flight, 0)
+        self.assertEqual(ring.free, [])
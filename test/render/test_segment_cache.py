@@ -0,0 +1,55 @@
+import unittest
+
+from janim.anims.timeline import Timeline
+from janim.constants import LEFT, RIGHT
+from janim.items.points import DotCloud
+from janim.render.segment_cache import Hasher, compute_segment_key, split_segments
+from janim.utils.config import Config
+
+
+def build(shift: float):
+    class MyTimeline(Timeline):
+        CONFIG = Config(fps=10)
+
+        def construct(self) -> None:
+            d = DotCloud(LEFT, RIGHT).show()
+            self.forward(2)
+            self.play(d.anim.points.shift(RIGHT * shift), duration=2)
+
+    return MyTimeline().build(quiet=True)
+
+
+class SegmentCacheTest(unittest.TestCase):
+    def test_split_segments(self) -> None:
+        built = build(1)
+        self.assertEqual(
+            split_segments(built, 0, 41),
+            [(0, 20), (20, 40), (40, 41)],
+        )
+        # 边界对齐到整段时间轴上
+        self.assertEqual(
+            split_segments(built, 5, 35),
+            [(5, 20), (20, 35)],
+        )
+
+    def test_segment_key(self) -> None:
+        built1 = build(1)
+        built2 = build(1)
+        built3 = build(2)
+
+        def keys(built):
+            return [
+                compute_segment_key(built, Hasher(), start, end)
+                for start, end in split_segments(built, 0, built.frame_count)
+            ]
+
+        keys1 = keys(built1)
+        self.assertNotIn(None, keys1)
+        # 不同次构建得到的相同内容，摘要相同
+        self.assertEqual(keys(built2), keys1)
+
+        # 只有动画发生变化的区段摘要不同
+        keys3 = keys(built3)
+        self.assertEqual(keys3[0], keys1[0])
+        self.assertNotEqual(keys3[1], keys1[1])
+        self.assertNotEqual(keys3[2], keys1[2])
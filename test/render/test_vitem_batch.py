@@ -0,0 +1,20 @@
+import unittest
+
+import numpy as np
+
+from janim.render.renderer.r_vitem_batch import VItemBatchRenderer
+
+
+class VItemBatchRendererTest(unittest.TestCase):
+    def test_pack(self) -> None:
+        a = np.array([[1, 1], [2, 2]], dtype=np.float32)
+        b = np.array([[3, 3]], dtype=np.float32)
+
+        offsets, unique = VItemBatchRenderer._pack([a, b, a, a, b], np.array([2, 2, 2, 3, 2]))
+
+        # 相同的数组并且长度相同时只保留一份
+        self.assertListEqual(offsets, [0, 2, 0, 4, 2])
+        self.assertEqual(len(unique), 3)
+        self.assertIs(unique[0], a)
+        np.testing.assert_array_equal(unique[1], [[3, 3], [3, 3]])
+        np.testing.assert_array_equal(unique[2], [[1, 1], [1.5, 1.5], [2, 2]])
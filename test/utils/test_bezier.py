@@ -0,0 +1,27 @@
+import unittest
+
+import numpy as np
+
+from janim.utils.bezier import (partial_quadratic_bezier_points,
+                                partial_quadratic_bezier_points_batch)
+
+
+class BezierTest(unittest.TestCase):
+    def test_partial_quadratic_bezier_points_batch(self) -> None:
+        rng = np.random.default_rng(1)
+        tuples = rng.normal(size=(8, 3, 3))
+        tuples[3, 1] = np.nan
+        a = np.array([0, 0, 0.2, 0.3, 0.5, 0.25, 1, 0.1])
+        b = np.array([1, 0.5, 0.7, 1, 0.75, 0.5, 1, 0.1])
+
+        for dtype in (np.float32, np.float64):
+            data = tuples.astype(dtype)
+            expected = np.array([
+                partial_quadratic_bezier_points(tup, a1, b1)
+                for tup, a1, b1 in zip(data, a, b)
+            ])
+            result = partial_quadratic_bezier_points_batch(data, a, b)
+
+            # 与逐个计算的结果完全一致，包括 NaN 的位置
+            self.assertEqual(result.dtype, expected.dtype)
+            np.testing.assert_array_equal(result, expected)
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from janim.anims.timeline import Timeline
+from janim.constants import LEFT, RIGHT
+from janim.items.coordinate.coordinate_systems import Axes
+from janim.items.geometry.arc import Circle
+from janim.items.points import DotCloud
+from janim.utils.build_cache import build_with_cache
+from janim.utils.config import override_cli_config
+from janim.utils.file_ops import find_file
+
+
+# 定义在模块层级，使得可以被 pickle
+class _CachedTimeline(Timeline):
+    asset_path = ''
+    construct_count = 0
+
+    def construct(self) -> None:
+        type(self).construct_count += 1
+        find_file(self.asset_path)
+        # VItem、DotCloud 以及 Axes 在构造时都会连接信号，这些连接也应当能够被 pickle
+        circle = Circle().show()
+        DotCloud(LEFT, RIGHT).show()
+        Axes().show()
+        self.forward(1)
+        self.play(circle.anim.points.reverse().shift(RIGHT))
+
+
+class _UncacheableTimeline(Timeline):
+    def construct(self) -> None:
+        self.func = lambda: None
+        self.forward(1)
+
+
+class BuildCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_build_with_cache(self) -> None:
+        asset_path = os.path.join(self.temp_dir.name, 'asset.txt')
+        with open(asset_path, 'wt') as f:
+            f.write('a')
+
+        _CachedTimeline.asset_path = asset_path
+        _CachedTimeline.construct_count = 0
+
+        with override_cli_config(temp_dir=self.temp_dir.name):
+            # 默认的 Config 中含有 Color，也应当能够被缓存
+            with self.assertNoLogs('janim', 'WARNING'):
+                built1 = build_with_cache(_CachedTimeline)
+                built2 = build_with_cache(_CachedTimeline)
+            self.assertEqual(_CachedTimeline.construct_count, 1)
+            self.assertEqual(built2.duration, built1.duration)
+            self.assertEqual(
+                len(built2.timeline.item_appearances), len(built1.timeline.item_appearances)
+            )
+
+            # 用到的资源文件发生变化后，缓存失效
+            with open(asset_path, 'wt') as f:
+                f.write('ab')
+            build_with_cache(_CachedTimeline)
+            self.assertEqual(_CachedTimeline.construct_count, 2)
+
+            # 不同的构建参数使用不同的缓存
+            build_with_cache(_CachedTimeline, hide_subtitles=True)
+            self.assertEqual(_CachedTimeline.construct_count, 3)
+
+    def test_uncacheable(self) -> None:
+        with override_cli_config(temp_dir=self.temp_dir.name):
+            with self.assertLogs('janim', 'WARNING'):
+                built = build_with_cache(_UncacheableTimeline)
+
+        self.assertGreater(built.duration, 0)
+        cache_dir = os.path.join(self.temp_dir.name, 'build_cache')
+        self.assertEqual(os.listdir(cache_dir), [])
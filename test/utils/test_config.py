@@ -0,0 +1,40 @@
+import copyreg
+import pickle
+import unittest
+
+from colour import Color
+
+from janim.utils.config import Config, cli_config, override_cli_config
+
+
+class ConfigTest(unittest.TestCase):
+    def test_proxy_size(self) -> None:
+        with Config(pixel_width=1920, pixel_height=1080, anti_alias_width=0.015):
+            proxy = Config.get.proxy_size(0.25)
+
+        self.assertEqual(proxy['pixel_width'], 480)
+        self.assertEqual(proxy['pixel_height'], 270)
+        self.assertAlmostEqual(proxy['anti_alias_width'], 0.06)
+
+        with Config(pixel_width=1920, pixel_height=1080):
+            # 像素尺寸取为偶数
+            proxy = Config.get.proxy_size(1 / 3)
+        self.assertEqual((proxy['pixel_width'], proxy['pixel_height']), (640, 360))
+
+    def test_override_cli_config(self) -> None:
+        self.assertIsNone(cli_config.fps)
+        with override_cli_config(fps=10, pixel_width=320):
+            self.assertEqual(Config.get.fps, 10)
+            self.assertEqual(Config.get.pixel_width, 320)
+        self.assertIsNone(cli_config.fps)
+        self.assertIsNone(cli_config.pixel_width)
+
+    def test_pickle_color(self) -> None:
+        config = Config(background_color=Color('#12ab34'))
+        loaded: Config = pickle.loads(pickle.dumps(config))
+        self.assertEqual(loaded.background_color, Color('#12ab34'))
+
+        # 只在 Config 中处理，不影响其它地方对 Color 的 pickle
+        loaded = pickle.loads(pickle.dumps(Config()))
+        self.assertIsNone(loaded.background_color)
+        self.assertNotIn(Color, copyreg.dispatch_table)
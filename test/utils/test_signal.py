@@ -1,9 +1,28 @@
+import pickle
 import unittest
 
 import janim.utils.refresh as refresh
 from janim.utils.signal import Signal
 
 
+# 定义在模块层级，使得可以被 pickle
+class _Sender:
+    @Signal
+    def changed(self) -> None:
+        _Sender.changed.emit(self)
+
+
+class _Receiver(refresh.Refreshable):
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    @refresh.register
+    def compute(self) -> int:
+        self.count += 1
+        return self.count
+
+
 class SignalTest(unittest.TestCase):
     def test_self_signal(self) -> None:
         class User(refresh.Refreshable):
@@ -173,3 +192,15 @@ class SignalTest(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             a.fn()
+
+    def test_pickle(self) -> None:
+        sender, receiver = _Sender(), _Receiver()
+        _Sender.changed.connect_refresh(sender, receiver, receiver.compute)
+
+        sender, receiver = pickle.loads(pickle.dumps((sender, receiver)))
+
+        self.assertEqual(receiver.compute(), 1)
+        self.assertEqual(receiver.compute(), 1)
+        # 恢复后的信号仍然连接到恢复后的对象
+        sender.changed()
+        self.assertEqual(receiver.compute(), 2)